@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+NumPy-vectorized batch battle generator.
+
+Same rules as generate_battles() in create_battles_json.py / generate_battles.py,
+but every random draw happens as an array operation over a whole chunk of base
+Pokémon at once:
+
+- opponents: a (bases x battles_per_pokemon) array of pool positions, redrawn
+  in bulk wherever the opponent shares the base's trainer or repeats an earlier
+  opponent of the same base; the few slots still unresolved after MAX_ROUNDS
+  fall back to OpponentIndex
+- winners: vectorized comparison of the `tot` array (random coin on ties), or
+  with pokemon_types (--resolution types) of tot x type-effectiveness
+  multiplier, looked up in bulk from the tables of type_chart.TypeMatchups
+- gyms and dates: integer arrays of gym positions and day offsets
+
+Documents (battles.json) or CSV rows (battle.csv) are only built at the very end,
+with day offsets mapped through a precomputed table of date strings.
+
+Output order matches the per-item generators (base Pokémon in input order, then
+battle slot), and for a given seed and the same inputs the output is identical
+from run to run. It is not the same sequence as the per-item `random` path.
+
+Usage (from the generators):
+    python create_battles_json.py 42 --engine numpy
+    python generate_battles.py 42 --engine numpy
+    python generate_battles.py 42 --engine numpy --resolution types
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+from datetime import date, datetime, timedelta
+from typing import Iterator
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+from opponent_index import OpponentIndex
+from type_chart import TypeMatchups
+
+
+DEFAULT_START_DAY = date(2025, 1, 1)
+DEFAULT_END_DAY = date(2025, 12, 31)
+
+# Bulk redraw rounds before unresolved slots go through OpponentIndex
+MAX_ROUNDS = 16
+
+# Base Pokémon processed per vectorized chunk
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def seed_to_int(seed: int | str | None) -> int | None:
+    """Turn a CLI seed (int or arbitrary string) into a NumPy-compatible integer."""
+    if seed is None or isinstance(seed, int):
+        return seed
+    try:
+        return int(seed)
+    except ValueError:
+        digest = hashlib.sha256(str(seed).encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big")
+
+
+class BattleBatch:
+    """One chunk of generated battles as parallel arrays of pool positions."""
+
+    __slots__ = ("base", "opponent", "winner", "loser", "gym", "day")
+
+    def __init__(self, base, opponent, winner, loser, gym, day) -> None:
+        self.base = base
+        self.opponent = opponent
+        self.winner = winner
+        self.loser = loser
+        self.gym = gym
+        self.day = day
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+
+class BatchBattleEngine:
+    """
+    Vectorized battle generator over the owned Pokémon.
+
+    pokemon_ids, pokemon_totals, gym_ids and ownership have the same shape as
+    the loaders in create_battles_json.py (string IDs) or generate_battles.py
+    (integer IDs); the original ID objects are written back out unchanged.
+    pokemon_types (pokemon ID -> type names, see type_chart.pokemon_type_names)
+    switches winner resolution from raw totals to type-weighted totals.
+    """
+
+    def __init__(
+        self,
+        pokemon_ids: list,
+        pokemon_totals: dict,
+        gym_ids: list,
+        ownership: dict,
+        seed: int | str | None = None,
+        battles_per_pokemon: int = 3,
+        start_day: date = DEFAULT_START_DAY,
+        end_day: date = DEFAULT_END_DAY,
+        pokemon_types: dict | None = None,
+    ) -> None:
+        if np is None:
+            raise RuntimeError("The batch battle engine requires numpy (pip install numpy)")
+
+        delta_days = (end_day - start_day).days
+        if delta_days < 0:
+            raise ValueError("Start date must be before end date")
+        if not gym_ids:
+            raise RuntimeError("Need at least 1 gym to host battles")
+
+        # Only consider Pokémon that are actually owned by some trainer
+        self.owned_ids = [pid for pid in pokemon_ids if ownership.get(pid) is not None]
+        if len(self.owned_ids) < 2:
+            raise RuntimeError("Need at least 2 Pokémon to form battles")
+
+        self.gym_ids = list(gym_ids)
+        self.battles_per_pokemon = battles_per_pokemon
+        self.start_day = start_day
+        self.num_days = delta_days + 1
+        self.rng = np.random.default_rng(seed_to_int(seed))
+
+        # Trainer IDs are replaced by dense integer codes for array comparisons
+        trainer_codes: dict = {}
+        self.trainer_ids: list = []
+        codes = []
+        for pid in self.owned_ids:
+            tid = ownership[pid]
+            code = trainer_codes.get(tid)
+            if code is None:
+                code = trainer_codes[tid] = len(self.trainer_ids)
+                self.trainer_ids.append(tid)
+            codes.append(code)
+
+        self.trainer_of = np.asarray(codes, dtype=np.int64)
+        self.tot = np.asarray(
+            [pokemon_totals.get(pid, 0) for pid in self.owned_ids], dtype=np.int64
+        )
+        self.matchups = None if pokemon_types is None else TypeMatchups(self.owned_ids, pokemon_types)
+
+        # Fallback for slots the bulk redraw could not resolve (tiny eligible sets)
+        self._fallback = OpponentIndex(range(len(self.owned_ids)), dict(enumerate(codes)))
+        self._fallback_rng = random.Random(int(self.rng.integers(2**63)))
+        # Counters for instrumentation: bulk redraw rounds run and slots redrawn
+        self.redraw_rounds = 0
+        self.redraws = 0
+
+    # ------------------------------------------------------------------
+    # Drawing
+    # ------------------------------------------------------------------
+
+    def _invalid_slots(self, base, opp):
+        """Boolean mask of opponent slots that break the battle rules."""
+        bad = self.trainer_of[opp] == self.trainer_of[base][:, None]
+        for j in range(1, opp.shape[1]):
+            for i in range(j):
+                bad[:, j] |= opp[:, j] == opp[:, i]
+        return bad
+
+    def draw_opponents(self, base):
+        """
+        Draw battles_per_pokemon distinct opponents for each base position.
+
+        Returns an int64 array of shape (len(base), battles_per_pokemon); slots
+        with no valid opponent are -1.
+        """
+        n = len(self.owned_ids)
+        opp = self.rng.integers(0, n, size=(len(base), self.battles_per_pokemon))
+
+        for _ in range(MAX_ROUNDS):
+            bad = self._invalid_slots(base, opp)
+            count = int(bad.sum())
+            if not count:
+                return opp
+            self.redraw_rounds += 1
+            self.redraws += count
+            opp[bad] = self.rng.integers(0, n, size=count)
+
+        bad = self._invalid_slots(base, opp)
+        for row in np.flatnonzero(bad.any(axis=1)).tolist():
+            used = {int(o) for o, b in zip(opp[row], bad[row]) if not b}
+            for j in np.flatnonzero(bad[row]).tolist():
+                pick = self._fallback.pick(int(base[row]), used, rng=self._fallback_rng)
+                opp[row, j] = -1 if pick is None else pick
+                if pick is not None:
+                    used.add(pick)
+        return opp
+
+    def counters(self) -> dict[str, int]:
+        """Opponent-drawing counters for instrument.py; picks/rejections are the fallback index's."""
+        return {
+            "opponent.redraw_rounds": self.redraw_rounds,
+            "opponent.redraws": self.redraws,
+            **self._fallback.counters(),
+        }
+
+    def generate(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[BattleBatch]:
+        """Yield BattleBatch chunks covering every owned Pokémon in input order."""
+        n = len(self.owned_ids)
+        k = self.battles_per_pokemon
+        for lo in range(0, n, chunk_size):
+            base = np.arange(lo, min(lo + chunk_size, n), dtype=np.int64)
+            opp = self.draw_opponents(base)
+
+            base_rep = np.repeat(base, k)
+            opp = opp.reshape(-1)
+            valid = opp >= 0
+            base_rep, opp = base_rep[valid], opp[valid]
+            size = len(base_rep)
+
+            base_score = self.tot[base_rep]
+            opp_score = self.tot[opp]
+            if self.matchups is not None:
+                base_score = base_score * self.matchups.multiplier(base_rep, opp)
+                opp_score = opp_score * self.matchups.multiplier(opp, base_rep)
+            coin = self.rng.integers(0, 2, size=size).astype(bool)
+            base_wins = (base_score > opp_score) | ((base_score == opp_score) & coin)
+
+            yield BattleBatch(
+                base=base_rep,
+                opponent=opp,
+                winner=np.where(base_wins, base_rep, opp),
+                loser=np.where(base_wins, opp, base_rep),
+                gym=self.rng.integers(0, len(self.gym_ids), size=size),
+                day=self.rng.integers(0, self.num_days, size=size),
+            )
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    def _day_strings(self, fmt: str) -> list[str]:
+        return [
+            (datetime.combine(self.start_day + timedelta(days=i), datetime.min.time())
+             .replace(hour=10)
+             .strftime(fmt))
+            for i in range(self.num_days)
+        ]
+
+    def iter_documents(
+        self,
+        batches: Iterator[BattleBatch] | None = None,
+        start_id: int = 1,
+    ) -> Iterator[dict]:
+        """Yield battles.json documents (same shape as create_battles_json)."""
+        dates = self._day_strings("%Y-%m-%dT%H:%M:%SZ")
+        ids = self.owned_ids
+        trainer_of = self.trainer_of.tolist()
+        trainers = self.trainer_ids
+        gyms = self.gym_ids
+        battle_id = start_id
+
+        for batch in self.generate() if batches is None else batches:
+            for w, l, g, d in zip(
+                batch.winner.tolist(), batch.loser.tolist(),
+                batch.gym.tolist(), batch.day.tolist(),
+            ):
+                yield {
+                    "_id": f"b{battle_id}",
+                    "date": dates[d],
+                    "gym_id": gyms[g],
+                    "participants": {
+                        "winner": {
+                            "trainer_id": trainers[trainer_of[w]],
+                            "pokemon_id": ids[w]
+                        },
+                        "loser": {
+                            "trainer_id": trainers[trainer_of[l]],
+                            "pokemon_id": ids[l]
+                        }
+                    }
+                }
+                battle_id += 1
+
+    def iter_csv_rows(
+        self,
+        batches: Iterator[BattleBatch] | None = None,
+        start_id: int = 1,
+    ) -> Iterator[dict]:
+        """Yield battle.csv rows (same columns as generate_battles.py)."""
+        dates = self._day_strings("%Y-%m-%d")
+        ids = self.owned_ids
+        trainer_of = self.trainer_of.tolist()
+        trainers = self.trainer_ids
+        gyms = self.gym_ids
+        battle_id = start_id
+
+        for batch in self.generate() if batches is None else batches:
+            for b, o, w, g, d in zip(
+                batch.base.tolist(), batch.opponent.tolist(), batch.winner.tolist(),
+                batch.gym.tolist(), batch.day.tolist(),
+            ):
+                yield {
+                    "battle_id": battle_id,
+                    "date": dates[d],
+                    "pok1_id": ids[b],
+                    "pok2_id": ids[o],
+                    "pokemon_winner_id": ids[w],
+                    "trainer_winner_id": trainers[trainer_of[w]],
+                    "gym_id": gyms[g],
+                }
+                battle_id += 1
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Maintain and read the trainer / Pokémon rating checkpoint (pokedata/ratings.py).
+
+- --rebuild json|csv: rate every battle of the dataset from scratch, in date order
+- --ndjson FILE ...:  apply new NDJSON battle batches on top of the checkpoint
+                      (battle IDs already applied are skipped)
+- otherwise:          just read the checkpoint
+
+The checkpoint is saved back after any update and the top trainers, top
+Pokémon and lowest-rated gym leaders are printed as JSON.
+
+Both generators number their battles from 1, so a batch meant to be appended
+is generated from the checkpoint's next_id (printed in the summary) on:
+
+    python create_battles_json.py 7 --format ndjson --start-id 3646 --output /tmp/batch.ndjson
+    python battle_ratings.py --ndjson /tmp/batch.ndjson
+
+Usage:
+    python battle_ratings.py --rebuild json --system glicko
+    python battle_ratings.py --ndjson ../dataset/json/battles_extra.ndjson
+    python battle_ratings.py --top 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from pokedata import CACHE_DIR, load_dataset
+from pokedata.ratings import DEFAULT_C, DEFAULT_K, SYSTEMS, Ratings
+
+DEFAULT_STORE = CACHE_DIR / "ratings.pickle"
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Streaming Elo / Glicko ratings")
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE)
+    parser.add_argument("--rebuild", choices=("json", "csv"), default=None)
+    parser.add_argument("--ndjson", type=Path, nargs="+", default=[])
+    parser.add_argument("--system", choices=SYSTEMS, default="glicko", help="rating system for --rebuild")
+    parser.add_argument("--k", type=float, default=DEFAULT_K, help="Elo K-factor")
+    parser.add_argument("--c", type=float, default=DEFAULT_C, help="Glicko RD growth per idle day")
+    parser.add_argument("--top", type=int, default=10)
+    return parser.parse_args(argv)
+
+
+def summary(ratings: Ratings, dataset, top: int) -> dict:
+    trainers = dict(zip(dataset.trainer["id"], dataset.trainer["name"]))
+    pokemon = dict(zip(dataset.pokemon["id"], dataset.pokemon["name"]))
+    gyms = dict(zip(dataset.gym["id"], dataset.gym["name"]))
+    leads = {tid: gid for tid, gid in zip(dataset.trainer["id"], dataset.trainer["leads"]) if gid}
+    glicko = ratings.system == "glicko"
+
+    def row(name_key: str, name, rating: float, rd: float, games: int, wins: int) -> dict:
+        out = {name_key: name, "rating": round(rating, 1)}
+        if glicko:
+            out["rd"] = round(rd, 1)
+        out.update({"games": games, "wins": wins})
+        return out
+
+    return {
+        "system": ratings.system,
+        "battles": ratings.battles,
+        "late": ratings.late,
+        "duplicates": ratings.duplicates,
+        "next_id": ratings.next_id,
+        "top_trainers": [row("trainer", trainers.get(i), *rest) for i, *rest in ratings.top_trainers(top)],
+        "top_pokemon": [row("pokemon_name", pokemon.get(i), *rest) for i, *rest in ratings.top_pokemon(top)],
+        "weakest_leaders": [
+            {"trainer": trainers.get(tid), "gym": gyms.get(gid), "rating": round(rating, 1), "games": games}
+            for tid, gid, rating, games in ratings.weakest_leaders(leads)
+        ],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    dataset = load_dataset(args.rebuild or "json", units=("pokemon", "trainer", "gym"))
+
+    if args.rebuild:
+        ratings = Ratings.for_dataset(dataset, system=args.system, k=args.k, c=args.c)
+        ratings.add_table(load_dataset(args.rebuild, units=("battle",)).battle)
+    elif args.store.exists():
+        ratings = Ratings.load(args.store)
+    else:
+        raise SystemExit(f"No checkpoint at {args.store}; create one with --rebuild json|csv")
+
+    for path in args.ndjson:
+        ratings.add_ndjson(path)
+
+    if args.rebuild or args.ndjson:
+        ratings.save(args.store)
+
+    json.dump(summary(ratings, dataset, args.top), sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Maintain and read the materialized battle statistics store (pokedata/stats.py).
+
+- --rebuild json|csv: start a fresh store from the battles in the dataset
+- --ndjson FILE ...:  apply new NDJSON battle batches on top of the store
+                      (battle IDs already applied are skipped)
+- otherwise:          just read the store
+
+The store is saved back after any update and a leaderboard summary is printed
+as JSON. create_battles_json.py --stats PATH rebuilds the same store from the
+battles it generates.
+
+Both generators number their battles from 1, so a batch meant to be appended
+is generated from the store's next_id (printed in the summary) on:
+
+    python create_battles_json.py 7 --format ndjson --start-id 3646 --output /tmp/batch.ndjson
+    python battle_stats.py --ndjson /tmp/batch.ndjson
+
+Usage:
+    python battle_stats.py --rebuild json
+    python battle_stats.py --ndjson ../dataset/json/battles_extra.ndjson
+    python battle_stats.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from pokedata import CACHE_DIR, load_dataset
+from pokedata.stats import BattleStats
+
+DEFAULT_STORE = CACHE_DIR / "battle_stats.pickle"
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Materialized battle statistics")
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE)
+    parser.add_argument("--rebuild", choices=("json", "csv"), default=None)
+    parser.add_argument("--ndjson", type=Path, nargs="+", default=[])
+    return parser.parse_args(argv)
+
+
+def summary(stats: BattleStats, dataset) -> dict:
+    trainers = dict(zip(dataset.trainer["id"], dataset.trainer["name"]))
+    pokemon = dict(zip(dataset.pokemon["id"], dataset.pokemon["name"]))
+    gyms = dict(zip(dataset.gym["id"], dataset.gym["name"]))
+    types = dict(zip(dataset.type["id"], dataset.type["name"]))
+    leads = {tid: gid for tid, gid in zip(dataset.trainer["id"], dataset.trainer["leads"]) if gid}
+
+    out: dict = {"battles": stats.battles, "duplicates": stats.duplicates, "next_id": stats.next_id}
+    top = stats.most_winning_trainer()
+    if top:
+        out["most_winning_trainer"] = {"trainer": trainers.get(top[0]), "wins": top[1]}
+    top = stats.most_winning_pokemon()
+    if top:
+        out["most_winning_pokemon"] = {"pokemon_name": pokemon.get(top[0]), "wins": top[1]}
+    top = stats.busiest_gym()
+    if top:
+        out["busiest_gym"] = {"gym": gyms.get(top[0]), "hosted": top[1]}
+    out["best_types"] = [
+        {"type": types.get(tid), "winRatio": round(ratio, 3), "wins": wins, "fights": fights}
+        for tid, ratio, wins, fights in stats.type_win_ratios()[:5]
+    ]
+    out["worst_leaders"] = [
+        {"trainer": trainers.get(tid), "gym": gyms.get(gid), "ratio": round(ratio, 3),
+         "wins": wins, "total": total}
+        for tid, gid, ratio, wins, total in stats.leader_win_ratios(leads)[:5]
+    ]
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    dataset = load_dataset(args.rebuild or "json", units=("pokemon", "trainer", "gym", "type"))
+
+    if args.rebuild:
+        stats = BattleStats.for_dataset(dataset)
+        stats.add_table(load_dataset(args.rebuild, units=("battle",)).battle)
+    elif args.store.exists():
+        stats = BattleStats.load(args.store)
+    else:
+        raise SystemExit(f"No store at {args.store}; create one with --rebuild json|csv")
+
+    for path in args.ndjson:
+        stats.add_ndjson(path)
+
+    if args.rebuild or args.ndjson:
+        stats.save(args.store)
+
+    json.dump(summary(stats, dataset), sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Maintain and query the date-sorted battle index (pokedata/timeline.py).
+
+- --rebuild json|csv: index every battle of the dataset from scratch
+- --ndjson FILE ...:  append new NDJSON battle batches to the saved index
+                      (battle IDs already indexed are skipped)
+- otherwise:          just read the saved index
+
+The index is saved back after any update. Without a query option the battles
+per month (overall and per gym) are printed as JSON; --from/--to restrict to a
+date range and --gym / --trainer count one gym's battles or one trainer's
+wins and battles in it.
+
+Both generators number their battles from 1, so a batch meant to be appended
+is generated from the index's next_id (printed in the summary) on:
+
+    python create_battles_json.py 7 --format ndjson --start-id 3646 --output /tmp/batch.ndjson
+    python battle_timeline.py --ndjson /tmp/batch.ndjson
+
+Usage:
+    python battle_timeline.py --rebuild json
+    python battle_timeline.py --from 2025-07-01 --to 2025-09-30 --trainer 2171
+    python battle_timeline.py --ndjson ../dataset/json/battles_extra.ndjson
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import date
+from pathlib import Path
+
+from pokedata import CACHE_DIR, load_dataset
+from pokedata.fileio import open_text
+from pokedata.timeline import BattleTimeline
+
+DEFAULT_STORE = CACHE_DIR / "battle_timeline.pickle"
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Date-sorted battle index")
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE)
+    parser.add_argument("--rebuild", choices=("json", "csv"), default=None)
+    parser.add_argument("--ndjson", type=Path, nargs="+", default=[])
+    parser.add_argument("--from", dest="lo", type=date.fromisoformat, default=date.min, metavar="YYYY-MM-DD")
+    parser.add_argument("--to", dest="hi", type=date.fromisoformat, default=date.max, metavar="YYYY-MM-DD")
+    parser.add_argument("--gym", type=int, action="append", default=[], help="gym ID (repeatable)")
+    parser.add_argument("--trainer", type=int, action="append", default=[], help="trainer ID (repeatable)")
+    return parser.parse_args(argv)
+
+
+def report(timeline: BattleTimeline, args: argparse.Namespace) -> dict:
+    out: dict = {
+        "battles": len(timeline),
+        "undated": timeline.undated,
+        "duplicates": timeline.duplicates,
+        "next_id": timeline.next_id,
+        "from": args.lo.isoformat(),
+        "to": args.hi.isoformat(),
+        "in_range": timeline.count(args.lo, args.hi),
+    }
+    if args.gym or args.trainer:
+        out["gyms"] = {gid: timeline.gym_battles(gid, args.lo, args.hi) for gid in args.gym}
+        out["trainers"] = {
+            tid: {"wins": timeline.trainer_wins(tid, args.lo, args.hi),
+                  "battles": timeline.trainer_battles(tid, args.lo, args.hi)}
+            for tid in args.trainer
+        }
+        return out
+
+    months = [(label, lo, hi) for label, lo, hi in timeline.months()
+              if hi >= args.lo.toordinal() and lo <= args.hi.toordinal()]
+    out["monthly"] = {label: timeline.count(lo, hi) for label, lo, hi in months}
+    out["monthly_by_gym"] = {
+        gid: {label: timeline.gym_battles(gid, lo, hi) for label, lo, hi in months}
+        for gid in sorted(timeline.gym_prefix)
+    }
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    if args.rebuild:
+        timeline = BattleTimeline.from_table(load_dataset(args.rebuild, units=("battle",)).battle)
+    elif args.store.exists():
+        timeline = BattleTimeline.load(args.store)
+    else:
+        raise SystemExit(f"No index at {args.store}; create one with --rebuild json|csv")
+
+    for path in args.ndjson:
+        with open_text(path) as f:
+            docs = (json.loads(line) for line in f if line.strip())
+            timeline.extend_documents(docs, first_row=len(timeline) + timeline.undated)
+
+    if args.rebuild or args.ndjson:
+        timeline.save(args.store)
+
+    json.dump(report(timeline, args), sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
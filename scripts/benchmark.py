@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Benchmark the loaders, generators and converters in scripts/ over scaled datasets.
+
+For every --scales factor a synthetic copy of the dataset is generated with
+generate_scaled_dataset.py (uniform ownership by default, like
+generate_trainer_owns_pokemon.py) and every case below runs in a fresh process
+(so peak RSS belongs to that case alone; on Linux it is the process's VmHWM,
+reset just before the case runs):
+
+- json.load_pokemon                    create_battles_json.load_pokemon
+- json.load_trainers_and_ownership     create_battles_json.load_trainers_and_ownership
+- json.generate_battles                create_battles_json.main (load + generate + write)
+- csv.generate_battles                 generate_battles.main
+- csv.generate_trainer_owns_pokemon    generate_trainer_owns_pokemon.main
+- csv.convert_gym_type                 convert_gym_type.main (on a gym.csv with type names)
+
+The scripts' module-level paths are pointed at the scaled dataset before their
+main() is called. Each result records wall time (best of --repeat), peak RSS
+and records/s, and is written to --output as JSON. With --baseline, results are
+compared against an earlier results file; a case slower than --threshold times
+its baseline is reported as a regression and the exit status is 1.
+
+Usage:
+    python benchmark.py --scales 1 10 100 --output bench.json
+    python benchmark.py --scales 1 10 100 --baseline bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_THRESHOLD = 1.25
+# Cases faster than this in the baseline are timer noise and never flagged
+MIN_COMPARABLE_S = 0.01
+
+
+# ---------------------------------------------------------------------------
+# CASES
+# ---------------------------------------------------------------------------
+# Each case takes (dataset dir, scratch dir, seed) and returns
+# (seconds spent in the measured call, records processed).
+
+def _count_rows(path: Path) -> int:
+    with path.open(newline="", encoding="utf-8") as f:
+        return sum(1 for _ in csv.reader(f)) - 1
+
+
+def case_load_pokemon(data: Path, out: Path, seed: str) -> tuple[float, int]:
+    import create_battles_json as cbj
+
+    start = time.perf_counter()
+    pokemon_ids, _totals = cbj.load_pokemon(data / "json" / "pokemon.json")
+    return time.perf_counter() - start, len(pokemon_ids)
+
+
+def case_load_trainers(data: Path, out: Path, seed: str) -> tuple[float, int]:
+    import create_battles_json as cbj
+
+    start = time.perf_counter()
+    trainer_ids, _ownership = cbj.load_trainers_and_ownership(data / "json" / "trainer.json")
+    return time.perf_counter() - start, len(trainer_ids)
+
+
+def case_json_battles(data: Path, out: Path, seed: str) -> tuple[float, int]:
+    import create_battles_json as cbj
+
+    cbj.POKEMON_JSON = data / "json" / "pokemon.json"
+    cbj.GYM_JSON = data / "json" / "gym.json"
+    cbj.TRAINER_JSON = data / "json" / "trainer.json"
+    cbj.TYPE_JSON = data / "json" / "type.json"
+    output = out / "battles.ndjson"
+    start = time.perf_counter()
+    cbj.main([seed, "--output", str(output), "--format", "ndjson"])
+    elapsed = time.perf_counter() - start
+    with output.open(encoding="utf-8") as f:
+        return elapsed, sum(1 for _ in f)
+
+
+def case_csv_battles(data: Path, out: Path, seed: str) -> tuple[float, int]:
+    import generate_battles as gb
+
+    gb.POKEMON_CSV = data / "csv" / "pokemon.csv"
+    gb.GYM_CSV = data / "csv" / "gym.csv"
+    gb.TRAINER_OWNS_POKEMON_CSV = data / "csv" / "trainer_owns_pokemon.csv"
+    gb.OUTPUT_CSV = out / "battle.csv"
+    start = time.perf_counter()
+    gb.main([seed])
+    return time.perf_counter() - start, _count_rows(gb.OUTPUT_CSV)
+
+
+def case_ownership(data: Path, out: Path, seed: str) -> tuple[float, int]:
+    import generate_trainer_owns_pokemon as gto
+
+    gto.POKEMON_CSV = data / "csv" / "pokemon.csv"
+    gto.TRAINER_CSV = data / "csv" / "trainer.csv"
+    output = out / "trainer_owns_pokemon.csv"
+    start = time.perf_counter()
+    gto.main([seed, "--output", str(output)])
+    return time.perf_counter() - start, _count_rows(output)
+
+
+def case_convert_gym_type(data: Path, out: Path, seed: str) -> tuple[float, int]:
+    import convert_gym_type as cgt
+
+    cgt.GYM_CSV = data / "csv" / "gym_named.csv"
+    cgt.TYPE_CSV = data / "csv" / "type.csv"
+    output = out / "gym_converted.csv"
+    start = time.perf_counter()
+    cgt.main(["--output", str(output)])
+    return time.perf_counter() - start, _count_rows(output)
+
+
+CASES: dict[str, Callable[[Path, Path, str], tuple[float, int]]] = {
+    "json.load_pokemon": case_load_pokemon,
+    "json.load_trainers_and_ownership": case_load_trainers,
+    "json.generate_battles": case_json_battles,
+    "csv.generate_battles": case_csv_battles,
+    "csv.generate_trainer_owns_pokemon": case_ownership,
+    "csv.convert_gym_type": case_convert_gym_type,
+}
+
+
+# ---------------------------------------------------------------------------
+# DATASETS
+# ---------------------------------------------------------------------------
+
+def write_named_gyms(data: Path, factor: int) -> None:
+    """
+    gym.csv now stores specialty_type_id; convert_gym_type.py expects the
+    original "Fire/Flying" names, so rebuild them from type.csv, factor times.
+    """
+    with (data / "csv" / "type.csv").open(newline="", encoding="utf-8") as f:
+        names = {row["id"].strip(): row["name"].strip() for row in csv.DictReader(f)}
+    with (data / "csv" / "gym.csv").open(newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fieldnames = ["specialty_type" if c == "specialty_type_id" else c for c in reader.fieldnames or []]
+        gyms = list(reader)
+    with (data / "csv" / "gym_named.csv").open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for copy in range(factor):
+            for row in gyms:
+                out = dict(row)
+                ids = (out.pop("specialty_type_id", "") or "").replace("/", ",").split(",")
+                out["specialty_type"] = "/".join(names.get(i.strip(), "") for i in ids if i.strip())
+                out["gym_id"] = str(int(row["gym_id"]) + copy * len(gyms))
+                writer.writerow(out)
+
+
+def build_dataset(root: Path, factor: int, exponent: float, seed: str) -> Path:
+    import generate_scaled_dataset
+
+    data = root / f"x{factor}"
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_scaled_dataset.main(
+            [seed, "--factor", str(factor), "--exponent", str(exponent), "--out", str(data)]
+        )
+    write_named_gyms(data, factor)
+    return data
+
+
+# ---------------------------------------------------------------------------
+# RUNNER
+# ---------------------------------------------------------------------------
+
+def _reset_peak_rss() -> bool:
+    """
+    Restart this process's RSS high-water mark from its current RSS (Linux).
+
+    ru_maxrss cannot be used on its own: a child starts from the high-water
+    mark of the parent it was forked from, and the parent has just built the
+    scaled dataset in-process.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_kb(reset: bool) -> int:
+    if reset:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _run_case(name: str, data: str, out: str, seed: str) -> tuple[float, int, int]:
+    """Child-process entry point: (seconds, records, peak RSS in KiB)."""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    reset = _reset_peak_rss()
+    with contextlib.redirect_stdout(io.StringIO()):
+        elapsed, records = CASES[name](Path(data), Path(out), seed)
+    return elapsed, records, _peak_rss_kb(reset)
+
+
+def run_case(name: str, data: Path, scratch: Path, seed: str, repeat: int) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    best, peak, records = float("inf"), 0, 0
+    for _ in range(repeat):
+        with ctx.Pool(1) as pool:
+            elapsed, records, rss = pool.apply(_run_case, (name, str(data), str(scratch), seed))
+        best, peak = min(best, elapsed), max(peak, rss)
+    return {
+        "case": name,
+        "records": records,
+        "wall_s": round(best, 4),
+        "peak_rss_kb": peak,
+        "records_per_s": round(records / best, 1) if best > 0 else None,
+    }
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> list[dict]:
+    """Annotate results with their baseline ratio; return the regressions."""
+    before = {(r["case"], r["scale"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        old = before.get((r["case"], r["scale"]))
+        if old is None or not old.get("wall_s"):
+            continue
+        r["baseline_wall_s"] = old["wall_s"]
+        r["ratio"] = round(r["wall_s"] / old["wall_s"], 3)
+        if r["ratio"] > threshold and old["wall_s"] >= MIN_COMPARABLE_S:
+            regressions.append(r)
+    return regressions
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark loaders, generators and converters")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    parser.add_argument(
+        "-c", "--case",
+        action="append",
+        choices=sorted(CASES),
+        help="case to run (repeatable; default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case (best wall time is kept)")
+    parser.add_argument("--seed", default="42")
+    parser.add_argument("--exponent", type=float, default=0.0, help="ownership skew of the scaled data")
+    parser.add_argument("--output", type=Path, default=None, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, default=None, help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    names = args.case or list(CASES)
+
+    results: list[dict] = []
+    with tempfile.TemporaryDirectory(prefix="pokemon-bench-") as tmp:
+        root = Path(tmp)
+        for scale in args.scales:
+            data = build_dataset(root, scale, args.exponent, args.seed)
+            scratch = root / f"out{scale}"
+            scratch.mkdir()
+            for name in names:
+                result = run_case(name, data, scratch, args.seed, args.repeat)
+                result["scale"] = scale
+                results.append(result)
+                print(
+                    f"  - x{scale:<5} {name:<36} {result['wall_s']:>9.3f}s "
+                    f"{result['records_per_s'] or 0:>12.0f} rec/s {result['peak_rss_kb']:>9} KiB",
+                    file=sys.stderr,
+                )
+
+    regressions: list[dict] = []
+    if args.baseline is not None:
+        with args.baseline.open(encoding="utf-8") as f:
+            regressions = compare(results, json.load(f)["results"], args.threshold)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "exponent": args.exponent,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.baseline is not None:
+        report["regressions"] = [(r["case"], r["scale"], r["ratio"]) for r in regressions]
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Build an embedded SQLite copy of the dataset and run the query pack in SQL.
+
+Every dataset/csv/*.csv table is bulk-loaded into one SQLite file, with the CSV
+file and column names as table and column names. The whole load is one
+transaction of executemany() calls (journal and fsync off while building, the
+file is written next to the target and renamed into place). Tables get primary
+keys, and secondary indexes are created after the rows are in: battle.gym_id,
+battle.pokemon_winner_id, battle.trainer_winner_id, both battle fighters and
+the ownership / type / evolution foreign keys. ANALYZE runs last so the planner
+sees real row counts.
+
+QUERIES holds SQL versions of the reports in dataset/mongodb_queries.js and
+dataset/cypher/pokemon_neo4j_queries.cypher (same numbering and output field
+names as pokedata/queries.py, ties broken by the lowest ID). The evolution
+queries walk pokemon_evolvesTo_pokemon with recursive CTEs.
+
+The database is rebuilt only when it is missing, older than one of the CSVs,
+or --rebuild is given.
+
+Usage:
+    python build_sqlite.py                          # build ../dataset/pokemon.sqlite
+    python build_sqlite.py -q 3 -q 10               # build if stale, run queries 3 and 10
+    python build_sqlite.py --all --bench --repeat 5 # time every query (ms)
+    python build_sqlite.py --emit-sql queries.sql   # schema + queries for the sqlite3 shell
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Iterator
+
+from pokedata.fileio import open_text, resolve
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROJROOT = SCRIPTS_DIR.parent
+CSV_DIR = PROJROOT / "dataset" / "csv"
+DEFAULT_DB = PROJROOT / "dataset" / "pokemon.sqlite"
+
+# ---------------------------------------------------------------------------
+# SCHEMA
+# ---------------------------------------------------------------------------
+
+# table (= csv stem) -> ([(column, SQL type)], primary key columns)
+TABLES: dict[str, tuple[list[tuple[str, str]], tuple[str, ...]]] = {
+    "pokemon": ([
+        ("id", "INTEGER"), ("number", "TEXT"), ("pokename", "TEXT"), ("total", "INTEGER"),
+        ("hp", "INTEGER"), ("attack", "INTEGER"), ("defense", "INTEGER"),
+        ("sp_atk", "INTEGER"), ("sp_def", "INTEGER"),
+    ], ("id",)),
+    "trainer": ([("trainerID", "INTEGER"), ("trainername", "TEXT")], ("trainerID",)),
+    "type": ([("id", "INTEGER"), ("name", "TEXT")], ("id",)),
+    "form": ([("id", "INTEGER"), ("form", "TEXT")], ("id",)),
+    "gym": ([
+        ("gym_id", "INTEGER"), ("gym_name", "TEXT"), ("region", "TEXT"),
+        ("specialty_type_id", "INTEGER"), ("location", "TEXT"), ("badge_name", "TEXT"),
+    ], ("gym_id",)),
+    "battle": ([
+        ("battle_id", "INTEGER"), ("date", "TEXT"), ("pok1_id", "INTEGER"), ("pok2_id", "INTEGER"),
+        ("pokemon_winner_id", "INTEGER"), ("trainer_winner_id", "INTEGER"), ("gym_id", "INTEGER"),
+    ], ("battle_id",)),
+    "trainer_owns_pokemon": ([("trainerID", "INTEGER"), ("pokename", "INTEGER")], ("trainerID", "pokename")),
+    "pokemon_evolvesTo_pokemon": ([("primitiveID", "INTEGER"), ("evolvedID", "INTEGER")],
+                                  ("primitiveID", "evolvedID")),
+    "pokemon_hasType_type": ([("pokemonID", "INTEGER"), ("typeID", "INTEGER")], ("pokemonID", "typeID")),
+    "pokemon_hasForm_form": ([("pokemonID", "INTEGER"), ("formID", "INTEGER")], ("pokemonID", "formID")),
+    "trainer_leads_gym": ([("trainer_id", "INTEGER"), ("gym_id", "INTEGER")], ("trainer_id", "gym_id")),
+}
+
+# (table, columns) -- the leading primary-key column is already indexed
+INDEXES: list[tuple[str, tuple[str, ...]]] = [
+    ("battle", ("gym_id",)),
+    ("battle", ("pokemon_winner_id",)),
+    ("battle", ("trainer_winner_id", "pokemon_winner_id")),
+    ("battle", ("pok1_id",)),
+    ("battle", ("pok2_id",)),
+    ("battle", ("date",)),
+    ("trainer_owns_pokemon", ("pokename",)),
+    ("pokemon_hasType_type", ("typeID",)),
+    ("pokemon_evolvesTo_pokemon", ("evolvedID",)),
+    ("pokemon_hasForm_form", ("formID",)),
+    ("trainer_leads_gym", ("gym_id",)),
+    ("gym", ("specialty_type_id",)),
+]
+
+# Both fighters of every battle, one row each (the FIGHTS_IN relationship)
+VIEWS = {
+    "battle_fighter": """
+        SELECT battle_id, gym_id, pok1_id AS pokemon_id, pokemon_winner_id = pok1_id AS won FROM battle
+        UNION ALL
+        SELECT battle_id, gym_id, pok2_id AS pokemon_id, pokemon_winner_id = pok2_id AS won FROM battle
+    """,
+}
+
+
+def schema_statements() -> list[str]:
+    statements = []
+    for table, (columns, key) in TABLES.items():
+        cols = ", ".join(f"{name} {kind}" for name, kind in columns)
+        rowid = " WITHOUT ROWID" if len(key) > 1 else ""
+        statements.append(f"CREATE TABLE {table} ({cols}, PRIMARY KEY ({', '.join(key)})){rowid}")
+    for name, body in VIEWS.items():
+        statements.append(f"CREATE VIEW {name} AS {' '.join(body.split())}")
+    return statements
+
+
+def index_statements() -> list[str]:
+    return [
+        f"CREATE INDEX idx_{table}_{'_'.join(columns)} ON {table} ({', '.join(columns)})"
+        for table, columns in INDEXES
+    ]
+
+
+# ---------------------------------------------------------------------------
+# LOAD
+# ---------------------------------------------------------------------------
+
+def _convert(value: str | None, kind: str):
+    """Strip the value (type.csv names carry trailing spaces); empty INTEGER -> NULL."""
+    value = (value or "").strip()
+    if kind != "INTEGER":
+        return value
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def iter_rows(table: str, csv_dir: Path = CSV_DIR) -> Iterator[tuple]:
+    columns, _key = TABLES[table]
+    with open_text(resolve(csv_dir / f"{table}.csv"), newline="") as f:
+        for row in csv.DictReader(f):
+            yield tuple(_convert(row.get(name), kind) for name, kind in columns)
+
+
+def build(db_path: Path, csv_dir: Path = CSV_DIR) -> dict[str, int]:
+    """(Re)build db_path from the CSVs; return row counts per table."""
+    tmp = db_path.with_name(db_path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    counts: dict[str, int] = {}
+    conn = sqlite3.connect(tmp, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("BEGIN")
+        for statement in schema_statements():
+            conn.execute(statement)
+        for table, (columns, _key) in TABLES.items():
+            placeholders = ", ".join("?" for _ in columns)
+            cur = conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", iter_rows(table, csv_dir))
+            counts[table] = cur.rowcount
+        # Indexes after the rows: one sort per index instead of per-row updates
+        for statement in index_statements():
+            conn.execute(statement)
+        conn.execute("COMMIT")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    os.replace(tmp, db_path)
+    return counts
+
+
+def is_stale(db_path: Path, csv_dir: Path = CSV_DIR) -> bool:
+    if not db_path.exists():
+        return True
+    built = db_path.stat().st_mtime_ns
+    return any(resolve(csv_dir / f"{table}.csv").stat().st_mtime_ns > built for table in TABLES)
+
+
+# ---------------------------------------------------------------------------
+# QUERY PACK
+# ---------------------------------------------------------------------------
+
+# Evolution chains: every Pokémon paired with the root of its chain
+_CHAINS = """
+    WITH RECURSIVE chain(root, pid) AS (
+        SELECT p.id, p.id FROM pokemon p
+        WHERE NOT EXISTS (SELECT 1 FROM pokemon_evolvesTo_pokemon e WHERE e.evolvedID = p.id)
+        UNION ALL
+        SELECT chain.root, e.evolvedID FROM chain
+        JOIN pokemon_evolvesTo_pokemon e ON e.primitiveID = chain.pid
+    )
+"""
+
+QUERIES: dict[int, tuple[str, str]] = {
+    1: ("For each trainer, their most successful Pokémon", """
+        WITH w AS (
+            SELECT trainer_winner_id AS tid, pokemon_winner_id AS pid, COUNT(*) AS wins
+            FROM battle GROUP BY trainer_winner_id, pokemon_winner_id
+        ), ranked AS (
+            SELECT tid, pid, wins, ROW_NUMBER() OVER (PARTITION BY tid ORDER BY wins DESC, pid) AS rn
+            FROM w
+        )
+        SELECT t.trainername AS trainer, p.pokename AS pokemon, ranked.wins AS wins
+        FROM ranked
+        JOIN trainer t ON t.trainerID = ranked.tid
+        JOIN pokemon p ON p.id = ranked.pid
+        WHERE rn = 1
+        ORDER BY trainer, t.trainerID
+    """),
+    2: ("For each trainer, the gym where they won the most battles", """
+        WITH w AS (
+            SELECT trainer_winner_id AS tid, gym_id AS gid, COUNT(*) AS wins
+            FROM battle GROUP BY trainer_winner_id, gym_id
+        ), ranked AS (
+            SELECT tid, gid, wins, ROW_NUMBER() OVER (PARTITION BY tid ORDER BY wins DESC, gid) AS rn
+            FROM w
+        )
+        SELECT t.trainername AS trainer, g.gym_name AS gym, ranked.wins AS wins
+        FROM ranked
+        JOIN trainer t ON t.trainerID = ranked.tid
+        JOIN gym g ON g.gym_id = ranked.gid
+        WHERE rn = 1
+        ORDER BY trainer, t.trainerID
+    """),
+    3: ("Most winning trainer", """
+        SELECT t.trainername AS trainer, COUNT(*) AS wins
+        FROM battle b JOIN trainer t ON t.trainerID = b.trainer_winner_id
+        GROUP BY b.trainer_winner_id
+        ORDER BY wins DESC, b.trainer_winner_id
+        LIMIT 1
+    """),
+    4: ("Most winning Pokémon", """
+        SELECT p.pokename AS pokemon_name, COUNT(*) AS wins
+        FROM battle b JOIN pokemon p ON p.id = b.pokemon_winner_id
+        GROUP BY b.pokemon_winner_id
+        ORDER BY wins DESC, b.pokemon_winner_id
+        LIMIT 1
+    """),
+    5: ("Most winning trainer + most winning Pokémon (UNION-style)", """
+        SELECT * FROM (
+            SELECT 'trainer' AS kind, t.trainername AS name, COUNT(*) AS wins
+            FROM battle b JOIN trainer t ON t.trainerID = b.trainer_winner_id
+            GROUP BY b.trainer_winner_id
+            ORDER BY wins DESC, b.trainer_winner_id
+            LIMIT 1
+        )
+        UNION ALL
+        SELECT * FROM (
+            SELECT 'pokemon' AS kind, p.pokename AS name, COUNT(*) AS wins
+            FROM battle b JOIN pokemon p ON p.id = b.pokemon_winner_id
+            GROUP BY b.pokemon_winner_id
+            ORDER BY wins DESC, b.pokemon_winner_id
+            LIMIT 1
+        )
+    """),
+    6: ("Wins for each Pokémon and its evolutions (sum over evolution chain)", _CHAINS + """
+        , wins AS (
+            SELECT pokemon_winner_id AS pid, COUNT(*) AS n FROM battle GROUP BY pokemon_winner_id
+        )
+        SELECT p.pokename AS rootPokemon, SUM(wins.n) AS wins_in_chain
+        FROM chain
+        JOIN wins ON wins.pid = chain.pid
+        JOIN pokemon p ON p.id = chain.root
+        GROUP BY chain.root
+        ORDER BY wins_in_chain DESC, rootPokemon
+    """),
+    7: ("Gym that hosted the highest number of battles", """
+        SELECT g.gym_name AS gym, COUNT(*) AS hosted
+        FROM battle b JOIN gym g ON g.gym_id = b.gym_id
+        GROUP BY b.gym_id
+        ORDER BY hosted DESC, b.gym_id
+        LIMIT 1
+    """),
+    8: ("For each gym, total number of distinct Pokémon that fought there", """
+        SELECT g.gym_name AS gym, COUNT(DISTINCT f.pokemon_id) AS fighters
+        FROM battle_fighter f JOIN gym g ON g.gym_id = f.gym_id
+        GROUP BY f.gym_id
+        ORDER BY fighters DESC, gym
+    """),
+    9: ("Pokémon that fought in the most different gyms", """
+        SELECT p.pokename AS pokemon, COUNT(DISTINCT f.gym_id) AS gymCount
+        FROM battle_fighter f JOIN pokemon p ON p.id = f.pokemon_id
+        GROUP BY f.pokemon_id
+        ORDER BY gymCount DESC, f.pokemon_id
+        LIMIT 10
+    """),
+    10: ("Pokémon type with the best winning ratio", """
+        WITH per_pokemon AS (
+            SELECT pokemon_id, SUM(won) AS wins, COUNT(*) AS fights
+            FROM battle_fighter GROUP BY pokemon_id
+        ), per_type AS (
+            SELECT ht.typeID AS tid, SUM(pp.wins) AS wins, SUM(pp.fights) AS fights
+            FROM per_pokemon pp JOIN pokemon_hasType_type ht ON ht.pokemonID = pp.pokemon_id
+            GROUP BY ht.typeID
+        )
+        SELECT ty.name AS type, ROUND(wins * 1.0 / fights, 3) AS winRatio, wins, fights
+        FROM per_type JOIN type ty ON ty.id = per_type.tid
+        WHERE fights > 0
+        ORDER BY wins * 1.0 / fights DESC, per_type.tid
+        LIMIT 5
+    """),
+    11: ("Number of Pokémon that are at maximum evolution", """
+        SELECT COUNT(*) AS numMaxEvolution
+        FROM pokemon p
+        WHERE NOT EXISTS (SELECT 1 FROM pokemon_evolvesTo_pokemon e WHERE e.primitiveID = p.id)
+    """),
+    12: ("Most powerful Pokémon (by total)", """
+        SELECT p.pokename AS name, p.total AS tot,
+               (SELECT MIN(f.form) FROM pokemon_hasForm_form hf JOIN form f ON f.id = hf.formID
+                WHERE hf.pokemonID = p.id) AS form
+        FROM pokemon p
+        ORDER BY p.total DESC, p.id
+        LIMIT 10
+    """),
+    13: ("Most powerful Pokémon for each type", """
+        WITH ranked AS (
+            SELECT ht.typeID AS tid, p.pokename AS pokemon, p.total AS total,
+                   ROW_NUMBER() OVER (PARTITION BY ht.typeID ORDER BY p.total DESC, p.id) AS rn
+            FROM pokemon_hasType_type ht JOIN pokemon p ON p.id = ht.pokemonID
+        )
+        SELECT ty.name AS type, ranked.pokemon AS pokemon, ranked.total AS total
+        FROM ranked JOIN type ty ON ty.id = ranked.tid
+        WHERE rn = 1
+        ORDER BY type
+    """),
+    14: ("Group all Pokémon of type Water", """
+        SELECT p.pokename AS pokemon
+        FROM type ty
+        JOIN pokemon_hasType_type ht ON ht.typeID = ty.id
+        JOIN pokemon p ON p.id = ht.pokemonID
+        WHERE ty.name = 'Water'
+        ORDER BY pokemon
+    """),
+    15: ("Highest improvement (Total) from base → max evolution", _CHAINS + """
+        SELECT base.pokename AS basePokemon, base.total AS baseTotal,
+               MAX(p.total) AS maxDescTotal, MAX(p.total) - base.total AS improvement
+        FROM chain
+        JOIN pokemon base ON base.id = chain.root
+        JOIN pokemon p ON p.id = chain.pid
+        GROUP BY chain.root
+        ORDER BY improvement DESC, chain.root
+        LIMIT 20
+    """),
+    16: ("Gyms and their type specialization", """
+        SELECT g.gym_name AS gym, t.name AS specializesIn
+        FROM gym g JOIN type t ON t.id = g.specialty_type_id
+        ORDER BY gym, specializesIn
+    """),
+}
+
+
+def run_query(conn: sqlite3.Connection, number: int) -> list[dict]:
+    cur = conn.execute(QUERIES[number][1])
+    names = [d[0] for d in cur.description]
+    return [dict(zip(names, row)) for row in cur]
+
+
+def emit_sql() -> str:
+    """Schema, indexes and the query pack as one script for the sqlite3 shell."""
+    lines = ["-- Generated by scripts/build_sqlite.py", ""]
+    lines += [s + ";" for s in schema_statements() + index_statements()]
+    for number, (title, sql) in QUERIES.items():
+        body = "\n".join(line[4:] if line.startswith("    ") else line for line in sql.strip("\n").splitlines())
+        lines += ["", f"-- {number}. {title}", body.strip() + ";"]
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="SQLite build of the dataset + SQL query pack")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--csv-dir", type=Path, default=CSV_DIR)
+    parser.add_argument("--rebuild", action="store_true", help="rebuild even if the database is up to date")
+    parser.add_argument(
+        "-q", "--query",
+        type=int,
+        action="append",
+        choices=sorted(QUERIES),
+        help="query number to run (repeatable)",
+    )
+    parser.add_argument("--all", action="store_true", help="run every query")
+    parser.add_argument("--bench", action="store_true", help="time the queries instead of printing results")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per query in --bench (best is kept)")
+    parser.add_argument("--emit-sql", type=Path, default=None, help="write schema + queries as a .sql script")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    if args.emit_sql is not None:
+        args.emit_sql.write_text(emit_sql(), encoding="utf-8")
+        print(f"Wrote SQL script -> {args.emit_sql}", file=sys.stderr)
+
+    if args.rebuild or is_stale(args.db, args.csv_dir):
+        start = time.perf_counter()
+        counts = build(args.db, args.csv_dir)
+        for table, n in counts.items():
+            print(f"  - {table}: {n} rows", file=sys.stderr)
+        print(f"Built {args.db} in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+    numbers = sorted(QUERIES) if args.all else (args.query or [])
+    if not numbers:
+        return 0
+
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    try:
+        if args.bench:
+            output: dict = {}
+            for number in numbers:
+                best = float("inf")
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    run_query(conn, number)
+                    best = min(best, time.perf_counter() - start)
+                output[number] = round(best * 1000, 3)
+        else:
+            output = {number: run_query(conn, number) for number in numbers}
+    finally:
+        conn.close()
+
+    json.dump(output, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,13 +5,25 @@ Convert specialty_type in gym.csv to its corresponding id from type.csv.
 - Reads dataset/csv/gym.csv and dataset/csv/type.csv
 - For each gym, replaces specialty_type with its id (from type.csv)
 - If specialty_type contains multiple types (separated by /), replaces with comma-separated ids
-- Writes output to dataset/csv/gym_converted.csv
+- Writes output to dataset/csv/gym_converted.csv (--output PATH to write
+  elsewhere, compressed when the name ends in .gz/.xz/.zst)
+- A gym.csv that already has specialty_type_id (the shipped one) is copied as-is
+- Set POKEMON_INSTRUMENT=report.json for a per-stage timing and memory report
+  (see instrument.py)
 """
 
+from __future__ import annotations
+
+import argparse
 import csv
+import sys
 from pathlib import Path
 
-ROOT = Path(__file__).resolve().parent
+import instrument
+from pokedata.fileio import open_text, resolve
+
+# This script is at: ROOT/scripts/convert_gym_type.py
+ROOT = Path(__file__).resolve().parent.parent
 CSV_DIR = ROOT / "dataset" / "csv"
 GYM_CSV = CSV_DIR / "gym.csv"
 TYPE_CSV = CSV_DIR / "type.csv"
@@ -21,7 +33,7 @@ OUTPUT_CSV = CSV_DIR / "gym_converted.csv"
 def load_type_map(type_csv: Path) -> dict[str, str]:
     """Return mapping from type name (case-insensitive, stripped) to id (as string)."""
     type_map = {}
-    with type_csv.open(newline="", encoding="utf-8") as f:
+    with open_text(resolve(type_csv), newline="") as f:
         reader = csv.DictReader(f)
         for row in reader:
             name = row["name"].strip().lower()
@@ -37,9 +49,32 @@ def convert_specialty_type(specialty: str, type_map: dict[str, str]) -> str:
     return ",".join([i for i in ids if i])
 
 
-def main():
-    type_map = load_type_map(TYPE_CSV)
-    with GYM_CSV.open(newline="", encoding="utf-8") as f_in, OUTPUT_CSV.open("w", newline="", encoding="utf-8") as f_out:
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert gym specialty types to type IDs")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=OUTPUT_CSV,
+        help=f"output file, compressed by a .gz/.xz/.zst extension (default: {OUTPUT_CSV})",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    with instrument.session("convert_gym_type") as inst:
+        _run(args, inst)
+    return 0
+
+
+def _run(args: argparse.Namespace, inst: instrument.Session) -> None:
+    with inst.stage("load") as st:
+        type_map = load_type_map(TYPE_CSV)
+        st.records = len(type_map)
+    # Gyms are converted and written row by row
+    with inst.stage("write") as st, \
+            open_text(resolve(GYM_CSV), newline="") as f_in, \
+            open_text(args.output, "w", newline="") as f_out:
         reader = csv.DictReader(f_in)
         fieldnames = list(reader.fieldnames) if reader.fieldnames else []
         # Replace specialty_type with specialty_type_id
@@ -48,14 +83,16 @@ def main():
             fieldnames[idx] = "specialty_type_id"
         writer = csv.DictWriter(f_out, fieldnames=fieldnames)
         writer.writeheader()
+        st.records = 0
         for row in reader:
-            specialty = row["specialty_type"]
-            specialty_id = convert_specialty_type(specialty, type_map)
-            row["specialty_type_id"] = specialty_id
-            del row["specialty_type"]
+            if "specialty_type" in row:
+                specialty = row.pop("specialty_type")
+                row["specialty_type_id"] = convert_specialty_type(specialty, type_map)
             writer.writerow(row)
-    print(f"Converted specialty_type to id for all gyms. Output: {OUTPUT_CSV}")
+            st.records += 1
+    inst.count("gyms", st.records)
+    print(f"Converted specialty_type to id for all gyms. Output: {args.output}")
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -2,6 +2,9 @@
 """
 Generate battles.json by creating 3 random battles for each owned Pokémon.
 
+Battles are streamed to disk as they are generated, either as a JSON array
+(default) or as NDJSON for mongoimport (--format ndjson or a .ndjson output).
+
 Rules (ported from the old CSV/Neo4j script):
 
 - For every Pokémon (from pokemon.json) that is owned by at least one trainer:
@@ -10,9 +13,11 @@ Rules (ported from the old CSV/Neo4j script):
 - Each of the 3 battles for a given base Pokémon must have a different opponent.
 - The opponent must NOT be owned by the same trainer as the base Pokémon.
 - Winner is the Pokémon with the higher 'tot' stat (from pokemon.json). If equal, choose randomly.
+  With --engine numpy --resolution types the total is first weighted by the
+  attacker's best type-effectiveness multiplier against the defender (type_chart.py).
 - Each battle is hosted by a random gym (from gym.json).
 - Each battle has:
-    - a unique incremental battle id: "b1", "b2", ...
+    - a unique incremental battle id: "b1", "b2", ... (from "b<N>" with --start-id N)
     - a random date between 2025-01-01 and 2025-12-31 (as ISO 8601 with time & Z).
 - Trainer ownership is deduced from trainer.json:
     "owns": ["290", "1052", ...]
@@ -20,15 +25,35 @@ Rules (ported from the old CSV/Neo4j script):
     - pokemon_id: pokemon._id (e.g. "2")
     - trainer_id: trainer._id (e.g. "17")
     - gym_id: gym._id (e.g. "3")
+- Opponents are sampled through OpponentIndex (opponent_index.py). For a given
+  seed and the same input files the output is identical from run to run:
+    python create_battles_json.py 42
+- Sharded mode (--workers N) generates fixed-size shards of base Pokémon in a
+  process pool, each seeded from the master seed and its shard index; the merged
+  output is byte-identical for any worker count (see parallel_battles.py).
+- --instrument PATH (or POKEMON_INSTRUMENT=PATH) writes a per-stage timing and
+  memory report; --pstats PATH adds a cProfile dump (see instrument.py). Its
+  opponent.picks / opponent.rejections counters are summed over the shards with
+  --workers; --engine numpy adds opponent.redraw_rounds / opponent.redraws and
+  counts picks of its fallback index only.
 """
 
 from __future__ import annotations
 
+import argparse
 import json
 import random
 import sys
 from pathlib import Path
 from datetime import date, timedelta, datetime
+from typing import Iterator
+
+import instrument
+from json_sink import FORMATS, write_documents
+from opponent_index import OpponentIndex
+from parallel_battles import DEFAULT_SHARD_SIZE, merge_counts, renumber, run_shards
+from pokedata.fileio import open_text, resolve
+from pokedata.jsonstream import iter_documents
 
 
 # ---------------------------------------------------------------------------
@@ -78,13 +103,11 @@ def load_pokemon(json_path: Path):
         pokemon_ids: list[str]         # Pokémon ids as strings (e.g. "1", "2", "290")
         totals: dict[str, int]         # id -> total stat (int)
     """
-    with json_path.open(encoding="utf-8") as f:
-        data = json.load(f)
-
     pokemon_ids: list[str] = []
     totals: dict[str, int] = {}
 
-    for entry in data:
+    # Streamed element by element; only _id and stats are kept from each entry
+    for entry in iter_documents(json_path, fields=("_id", "stats")):
         pid = entry.get("_id")
         stats = entry.get("stats", {})
         tot = stats.get("tot")
@@ -122,12 +145,9 @@ def load_gyms(json_path: Path):
     Returns:
         gym_ids: list[str]             # e.g. ["1", "2", "3", ...]
     """
-    with json_path.open(encoding="utf-8") as f:
-        data = json.load(f)
-
     gym_ids: list[str] = []
 
-    for entry in data:
+    for entry in iter_documents(json_path, fields=("_id",)):
         gid = entry.get("_id")
         if gid is None:
             continue
@@ -159,13 +179,11 @@ def load_trainers_and_ownership(json_path: Path):
         trainer_ids: list[str]                 # trainer ids as strings
         ownership: dict[str, str]              # pokemon_id -> trainer_id
     """
-    with json_path.open(encoding="utf-8") as f:
-        data = json.load(f)
-
     trainer_ids: list[str] = []
     ownership: dict[str, str] = {}
 
-    for entry in data:
+    # Streamed element by element: memory grows with the maps, not the file
+    for entry in iter_documents(json_path, fields=("_id", "owns")):
         tid = entry.get("_id")
         if tid is None:
             continue
@@ -191,7 +209,7 @@ def load_trainers_and_ownership(json_path: Path):
 def load_types(json_path: Path):
     """Currently unused; present as an extension hook."""
     try:
-        with json_path.open(encoding="utf-8") as f:
+        with open_text(resolve(json_path)) as f:
             return json.load(f)
     except FileNotFoundError:
         return []
@@ -211,6 +229,9 @@ def pick_random_opponent(
     not owned by the same trainer as exclude_id.
 
     If no suitable candidate exists, return None.
+
+    This rebuilds the candidate list on every call; use it for one-off picks only.
+    generate_battles() samples through OpponentIndex instead.
     """
     if len(all_ids) < 2:
         raise RuntimeError("Need at least 2 Pokémon to form battles")
@@ -234,12 +255,12 @@ def pick_random_opponent(
     return None
 
 
-def random_date(start: date, end: date) -> date:
+def random_date(start: date, end: date, rng=random) -> date:
     """Pick a random date between start and end (inclusive)."""
     delta_days = (end - start).days
     if delta_days < 0:
         raise ValueError("Start date must be before end date")
-    return start + timedelta(days=random.randint(0, delta_days))
+    return start + timedelta(days=rng.randint(0, delta_days))
 
 
 def date_to_iso_z(dt: date) -> str:
@@ -261,39 +282,43 @@ def generate_battles(
     pokemon_totals: dict[str, int],
     gym_ids: list[str],
     ownership: dict[str, str],
-) -> list[dict]:
+    rng=random,
+    base_ids: list[str] | None = None,
+    index: OpponentIndex | None = None,
+    start_id: int = 1,
+) -> Iterator[dict]:
     """
-    Generate battles as a list of Mongo-like documents.
+    Generate battles as Mongo-like documents, yielded one at a time.
 
     IDs used are exactly the _id values from your JSONs, no prefixing.
+    Opponents are drawn through an OpponentIndex, so for a given seed and the
+    same input files the output is identical from run to run.
+
+    base_ids restricts which owned Pokémon get battles (opponents still come from
+    every owned Pokémon); the sharded mode uses it with a per-shard rng and a
+    prebuilt index. Battle IDs run from b<start_id>.
     """
     start_day = date(2025, 1, 1)
     end_day = date(2025, 12, 31)
 
-    battle_id = 1
-    documents: list[dict] = []
+    battle_id = start_id
 
     # Only consider Pokémon that are actually owned by some trainer
     owned_pokemon_ids = [pid for pid in pokemon_ids if ownership.get(pid) is not None]
 
-    for base_id in owned_pokemon_ids:
+    # Built once: O(1) expected opponent picks instead of a list rebuild per pick
+    if index is None:
+        index = OpponentIndex(owned_pokemon_ids, ownership)
+
+    for base_id in owned_pokemon_ids if base_ids is None else base_ids:
         used_opponents: set[str] = set()
 
         for _ in range(3):
-            opp_id = pick_random_opponent(
-                owned_pokemon_ids, exclude_id=base_id, ownership=ownership
-            )
-
-            # Ensure unique opponent per base Pokémon
-            attempts = 0
-            while opp_id is not None and opp_id in used_opponents and attempts < 100:
-                opp_id = pick_random_opponent(
-                    owned_pokemon_ids, exclude_id=base_id, ownership=ownership
-                )
-                attempts += 1
+            # Different trainer and not yet used against this base Pokémon
+            opp_id = index.pick(base_id, used_opponents, rng=rng)
 
-            if opp_id is None or opp_id in used_opponents:
-                # No valid fresh opponent found for this base Pokémon under constraints
+            if opp_id is None:
+                # No valid fresh opponent exists for this base Pokémon under constraints
                 continue
 
             used_opponents.add(opp_id)
@@ -308,13 +333,13 @@ def generate_battles(
                 winner_id, loser_id = opp_id, base_id
             else:
                 # Equal stats: random winner
-                winner_id, loser_id = random.sample([base_id, opp_id], 2)
+                winner_id, loser_id = rng.sample([base_id, opp_id], 2)
 
             # Pick a random gym
-            gym_id = random.choice(gym_ids)
+            gym_id = rng.choice(gym_ids)
 
             # Random date
-            battle_day = random_date(start_day, end_day)
+            battle_day = random_date(start_day, end_day, rng)
             battle_date_iso = date_to_iso_z(battle_day)
 
             # Trainers from ownership mapping
@@ -343,47 +368,224 @@ def generate_battles(
                 }
             }
 
-            documents.append(battle_doc)
+            yield battle_doc
             battle_id += 1
 
-    return documents
+
+def generate_shard(shared: dict, base_ids: list[str], rng) -> tuple[list[dict], dict[str, int]]:
+    """Generate the battles of one shard of base Pokémon, with its opponent counters (see parallel_battles.py)."""
+    before = shared["index"].counters()
+    docs = list(generate_battles(**shared, rng=rng, base_ids=base_ids))
+    after = shared["index"].counters()
+    return docs, {key: after[key] - before[key] for key in after}
+
+
+def set_battle_id(doc: dict, battle_id: int) -> None:
+    doc["_id"] = f"b{battle_id}"
 
 
 # ---------------------------------------------------------------------------
 # MAIN
 # ---------------------------------------------------------------------------
 
-def main() -> int:
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate battles.json")
     # Optional seed for reproducibility:
     #   python create_battles_json.py 42
-    seed_arg = sys.argv[1] if len(sys.argv) > 1 else None
+    parser.add_argument("seed", nargs="?", default=None)
+    parser.add_argument(
+        "--engine",
+        choices=("python", "numpy"),
+        default="python",
+        help="per-battle Python loop (default) or the vectorized batch engine",
+    )
+    parser.add_argument(
+        "--resolution",
+        choices=("total", "types"),
+        default="total",
+        help="decide winners on total stat (default) or on total x type effectiveness (numpy engine only)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=OUTPUT_JSON,
+        help=f"output file (default: {OUTPUT_JSON})",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default=None,
+        help="json array (default) or ndjson for mongoimport; "
+             "guessed from a .ndjson/.jsonl extension",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="write the JSON array without indentation or spaces",
+    )
+    parser.add_argument(
+        "--start-id",
+        type=int,
+        default=1,
+        help="number the battles from this ID (default: 1); start past the IDs already "
+             "applied to a stats/ratings/timeline store to produce a batch it can append",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="sharded mode: generate shards in N processes "
+             "(output is identical for any N)",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=DEFAULT_SHARD_SIZE,
+        help=f"base Pokémon per shard in sharded mode (default: {DEFAULT_SHARD_SIZE})",
+    )
+    parser.add_argument(
+        "--cached",
+        action="store_true",
+        help="load inputs through pokedata (binary snapshot, re-parsed only when files change)",
+    )
+    parser.add_argument(
+        "--columnar",
+        type=Path,
+        default=None,
+        help="load inputs from a columnar store (export_columnar.py), mapping only the needed columns",
+    )
+    parser.add_argument(
+        "--stats",
+        type=Path,
+        default=None,
+        help="materialized battle stats store to rebuild from the generated battles "
+             "(see battle_stats.py); an existing store is replaced",
+    )
+    parser.add_argument(
+        "--instrument",
+        type=Path,
+        default=None,
+        help="write a per-stage timing/memory report (JSON) here",
+    )
+    parser.add_argument("--pstats", type=Path, default=None, help="write a cProfile dump here")
+    args = parser.parse_args(argv)
+    if args.cached and args.columnar is not None:
+        parser.error("--cached and --columnar are mutually exclusive")
+    if args.workers is not None and args.engine != "python":
+        parser.error("--workers is only supported with --engine python")
+    if args.resolution != "total" and args.engine != "numpy":
+        parser.error("--resolution types is only supported with --engine numpy")
+    if args.start_id < 1:
+        parser.error("--start-id must be at least 1")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    with instrument.session("create_battles_json", args.instrument, args.pstats) as inst:
+        return _run(args, inst)
+
+
+def _run(args: argparse.Namespace, inst: instrument.Session) -> int:
+    seed_arg = args.seed
     if seed_arg is not None:
         try:
             random.seed(int(seed_arg))
         except ValueError:
             random.seed(seed_arg)
 
-    # Load base data
-    pokemon_ids, pokemon_totals = load_pokemon(POKEMON_JSON)
-    gym_ids = load_gyms(GYM_JSON)
-    trainer_ids, ownership = load_trainers_and_ownership(TRAINER_JSON)
-    _types = load_types(TYPE_JSON)  # currently unused
+    # Load base data (from the pokedata snapshot cache with --cached)
+    with inst.stage("load") as st:
+        if args.columnar is not None:
+            from pokedata.columnar import BATTLE_COLUMNS, load_columnar
+
+            dataset = load_columnar(args.columnar, columns=BATTLE_COLUMNS)
+            pokemon_ids, pokemon_totals, gym_ids, ownership = dataset.battle_inputs(as_str=True)
+        elif args.cached:
+            from pokedata import load_dataset
+
+            dataset = load_dataset("json", units=("pokemon", "trainer", "gym"))
+            pokemon_ids, pokemon_totals, gym_ids, ownership = dataset.battle_inputs(as_str=True)
+        else:
+            pokemon_ids, pokemon_totals = load_pokemon(POKEMON_JSON)
+            gym_ids = load_gyms(GYM_JSON)
+            trainer_ids, ownership = load_trainers_and_ownership(TRAINER_JSON)
+            _types = load_types(TYPE_JSON)  # currently unused
+        st.records = len(pokemon_ids)
 
     # Generate battles
-    battle_docs = generate_battles(
-        pokemon_ids=pokemon_ids,
-        pokemon_totals=pokemon_totals,
-        gym_ids=gym_ids,
-        ownership=ownership,
-    )
-
-    # Ensure output directory exists
-    OUTPUT_JSON.parent.mkdir(parents=True, exist_ok=True)
-
-    with OUTPUT_JSON.open("w", encoding="utf-8") as f:
-        json.dump(battle_docs, f, indent=2, ensure_ascii=False)
-
-    print(f"Generated {len(battle_docs)} battles -> {OUTPUT_JSON}")
+    # Opponent-drawing counters for the report, read once generation is done
+    opponent_counts = None
+    if args.engine == "numpy":
+        from battle_engine import BatchBattleEngine
+
+        pokemon_types = None
+        if args.resolution == "types":
+            from pokedata import load_dataset
+            from type_chart import pokemon_type_names
+
+            pokemon_types = pokemon_type_names(load_dataset("json", units=("pokemon", "type")), as_str=True)
+        engine = BatchBattleEngine(
+            pokemon_ids, pokemon_totals, gym_ids, ownership, seed=seed_arg,
+            pokemon_types=pokemon_types,
+        )
+        opponent_counts = engine.counters
+        battle_docs = engine.iter_documents(start_id=args.start_id)
+    elif args.workers is not None:
+        # Per-shard seeds derive from the master seed; IDs renumbered on merge
+        owned_pokemon_ids = [pid for pid in pokemon_ids if ownership.get(pid) is not None]
+        shared = {
+            "pokemon_ids": owned_pokemon_ids,
+            "pokemon_totals": pokemon_totals,
+            "gym_ids": gym_ids,
+            "ownership": ownership,
+            "index": OpponentIndex(owned_pokemon_ids, ownership),
+        }
+        shards = run_shards(
+            generate_shard, shared, owned_pokemon_ids, seed_arg,
+            workers=args.workers, shard_size=args.shard_size,
+        )
+        shard_counts = {"opponent.picks": 0, "opponent.rejections": 0}
+        battle_docs = renumber(merge_counts(shards, shard_counts), set_battle_id, start_id=args.start_id)
+        opponent_counts = shard_counts.copy  # filled in as the shards are merged
+    else:
+        owned_pokemon_ids = [pid for pid in pokemon_ids if ownership.get(pid) is not None]
+        index = OpponentIndex(owned_pokemon_ids, ownership)
+        opponent_counts = index.counters
+        battle_docs = generate_battles(
+            pokemon_ids=pokemon_ids,
+            pokemon_totals=pokemon_totals,
+            gym_ids=gym_ids,
+            ownership=ownership,
+            index=index,
+            start_id=args.start_id,
+        )
+    battle_docs = inst.timed("generate", battle_docs)
+
+    # Keep the materialized win counters in step with the new battles. The
+    # output file is rewritten, so the store starts empty and mirrors it rather
+    # than adding these battles on top of the ones it already counts.
+    stats = None
+    if args.stats is not None:
+        from pokedata import load_dataset
+        from pokedata.stats import BattleStats
+
+        stats = BattleStats.for_dataset(load_dataset("json", units=("pokemon",)))
+        battle_docs = stats.observe(battle_docs)
+
+    # Stream documents to disk as they are generated (flat memory)
+    with inst.stage("write") as st:
+        count = write_documents(battle_docs, args.output, fmt=args.format,
+                                indent=None if args.compact else 2)
+        if stats is not None:
+            stats.save(args.stats)
+        st.records = count
+
+    for name, n in opponent_counts().items():
+        inst.count(name, n)
+    inst.count("battles", count)
+
+    print(f"Generated {count} battles -> {args.output}")
     return 0
 
 
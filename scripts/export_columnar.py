@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Export the dataset to the columnar store (pokedata/columnar.py).
+
+Every table is written as one typed file per column (.npy, or Parquet with
+--format parquet when pyarrow is installed) plus manifest.json. Consumers then
+memory-map only the columns they need, e.g. the battle generators:
+
+    python create_battles_json.py --columnar ../dataset/columnar 42
+
+Usage:
+    python export_columnar.py --source csv --out ../dataset/columnar
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from pokedata import load_dataset
+from pokedata.columnar import FORMATS, write_columnar
+from pokedata.dataset import DATASET_DIR
+
+DEFAULT_OUT_DIR = DATASET_DIR / "columnar"
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Columnar export of the dataset")
+    parser.add_argument("--source", choices=("json", "csv"), default="csv")
+    parser.add_argument("--data-dir", type=Path, default=None, help="dataset directory of --source")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT_DIR)
+    parser.add_argument("--format", choices=FORMATS, default="npy")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    dataset = load_dataset(args.source, data_dir=args.data_dir)
+    manifest = write_columnar(dataset, args.out, fmt=args.format)
+    for name, spec in manifest["tables"].items():
+        print(f"  - {name}: {spec['rows']} rows, {len(spec['columns'])} columns")
+    print(f"Wrote {args.format} columnar store -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Export the JSON dataset for MongoDB with real types, plus an index bootstrap script.
+
+pokemon.json stores every stat as a string ("tot": "318") and every _id / foreign
+key as a string, so the sorts and comparisons in dataset/mongodb_queries.js
+(queries 12, 13, 15) either coerce types or fall back to lexical order and
+cannot use an index. This script rewrites the five collections with:
+
+- ints for stats and numeric IDs (_id, types, evolves_to, owns, leads, gym type,
+  battle gym_id and participant IDs); battle _ids ("b1") stay strings
+- Extended JSON dates for battles.date: {"$date": "2025-10-02T10:00:00Z"}
+
+as NDJSON (default, one file per collection) or JSON arrays (--format json),
+streamed document by document. It also writes:
+
+- indexes.js: createIndex() calls for the fields the query pack groups, joins
+  and sorts on (run with mongosh after the import)
+- import.sh: the matching mongoimport commands
+
+Usage:
+    python export_mongo_typed.py --out ../dataset/mongo --db PokemonDB
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Iterator
+
+from json_sink import FORMATS, write_documents
+from pokedata.jsonstream import iter_documents
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROJROOT = SCRIPTS_DIR.parent
+JSON_DIR = PROJROOT / "dataset" / "json"
+DEFAULT_OUT_DIR = PROJROOT / "dataset" / "mongo"
+
+# collection name (as in mongodb_queries.js) -> source file
+COLLECTIONS = {
+    "Pokemon": "pokemon.json",
+    "Trainer": "trainer.json",
+    "Gym": "gym.json",
+    "Type": "type.json",
+    "Battle": "battles.json",
+}
+
+# (collection, keys, reason) -- keys in createIndex() order
+INDEXES: list[tuple[str, list[tuple[str, int]], str]] = [
+    ("Battle", [("participants.winner.trainer_id", 1), ("participants.winner.pokemon_id", 1)],
+     "q1 group by winner trainer + Pokémon"),
+    ("Battle", [("participants.winner.trainer_id", 1), ("gym_id", 1)],
+     "q2 group by winner trainer + gym; q3 group by winner trainer (prefix)"),
+    ("Battle", [("participants.winner.pokemon_id", 1)], "q4, q5, q6 group by winner Pokémon"),
+    ("Battle", [("participants.loser.pokemon_id", 1)], "q10 fights per Pokémon"),
+    ("Battle", [("gym_id", 1), ("date", 1)], "q7, q8 group by gym; time-range reports per gym"),
+    ("Battle", [("date", 1)], "time-range reports"),
+    ("Pokemon", [("stats.tot", -1)], "q12, q13 sort by total"),
+    ("Pokemon", [("types", 1), ("stats.tot", -1)], "q13 per-type max; q14 $lookup on types"),
+    ("Pokemon", [("evolves_to", 1)], "q11 max evolutions; q15 evolution $graphLookup"),
+    ("Trainer", [("name", 1)], "q1, q2 sort by trainer name"),
+    ("Gym", [("type", 1)], "q16 $lookup on gym type"),
+    ("Type", [("name", 1)], "q14 match by type name"),
+]
+
+
+def _int(value):
+    """Numeric strings -> int; None stays None; anything else is returned unchanged."""
+    if value is None:
+        return None
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return value
+
+
+def typed_pokemon(doc: dict) -> dict:
+    out = dict(doc)
+    out["_id"] = _int(doc.get("_id"))
+    out["stats"] = {k: _int(v) for k, v in (doc.get("stats") or {}).items()}
+    out["types"] = [_int(t) for t in doc.get("types") or ()]
+    out["evolves_to"] = _int(doc.get("evolves_to"))
+    return out
+
+
+def typed_trainer(doc: dict) -> dict:
+    out = dict(doc)
+    out["_id"] = _int(doc.get("_id"))
+    out["owns"] = [_int(p) for p in doc.get("owns") or ()]
+    out["leads"] = _int(doc.get("leads"))
+    return out
+
+
+def typed_gym(doc: dict) -> dict:
+    out = dict(doc)
+    out["_id"] = _int(doc.get("_id"))
+    out["type"] = _int(doc.get("type"))
+    return out
+
+
+def typed_type(doc: dict) -> dict:
+    out = dict(doc)
+    out["_id"] = _int(doc.get("_id"))
+    out["name"] = (doc.get("name") or "").strip()
+    return out
+
+
+def typed_battle(doc: dict) -> dict:
+    out = dict(doc)
+    if doc.get("date"):
+        out["date"] = {"$date": doc["date"]}
+    out["gym_id"] = _int(doc.get("gym_id"))
+    out["participants"] = {
+        side: {k: _int(v) for k, v in (p or {}).items()}
+        for side, p in (doc.get("participants") or {}).items()
+    }
+    return out
+
+
+CONVERTERS = {
+    "Pokemon": typed_pokemon,
+    "Trainer": typed_trainer,
+    "Gym": typed_gym,
+    "Type": typed_type,
+    "Battle": typed_battle,
+}
+
+
+def iter_typed(collection: str, json_dir: Path = JSON_DIR) -> Iterator[dict]:
+    convert = CONVERTERS[collection]
+    for doc in iter_documents(json_dir / COLLECTIONS[collection]):
+        yield convert(doc)
+
+
+def indexes_script() -> str:
+    lines = ["// Generated by scripts/export_mongo_typed.py -- run with: mongosh <db> indexes.js", ""]
+    for collection, keys, reason in INDEXES:
+        spec = ", ".join(f'"{field}": {direction}' for field, direction in keys)
+        lines.append(f"// {reason}")
+        lines.append(f"db.{collection}.createIndex({{ {spec} }});")
+    return "\n".join(lines) + "\n"
+
+
+def import_script(files: dict[str, str], db: str, fmt: str) -> str:
+    array_flag = " --jsonArray" if fmt == "json" else ""
+    lines = [
+        "#!/bin/sh",
+        "# Import the typed collections, then build the indexes.",
+        "cd \"$(dirname \"$0\")\"",
+    ]
+    for collection, name in files.items():
+        lines.append(f"mongoimport --db {db} --collection {collection} --drop --file {name}{array_flag}")
+    lines.append(f"mongosh {db} indexes.js")
+    return "\n".join(lines) + "\n"
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Typed Extended JSON export for MongoDB")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT_DIR)
+    parser.add_argument("--json-dir", type=Path, default=JSON_DIR)
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--db", default="PokemonDB")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    suffix = ".ndjson" if args.format == "ndjson" else ".json"
+
+    files: dict[str, str] = {}
+    for collection in COLLECTIONS:
+        name = collection + suffix
+        count = write_documents(iter_typed(collection, args.json_dir), args.out / name, fmt=args.format)
+        files[collection] = name
+        print(f"  - {collection}: {count} documents -> {args.out / name}")
+
+    (args.out / "indexes.js").write_text(indexes_script(), encoding="utf-8")
+    script = args.out / "import.sh"
+    script.write_text(import_script(files, args.db, args.format), encoding="utf-8")
+    script.chmod(0o755)
+    print(f"Wrote typed collections, indexes.js and import.sh -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
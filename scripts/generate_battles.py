@@ -8,9 +8,19 @@ Rules:
 - Each of the 3 battles must have a different opponent Pokémon.
 - The opponent must NOT be owned by the same trainer as pok1 (see dataset/csv/trainer_owns_pokemon.csv).
 - Winner is the Pokémon with the higher 'total' stat (from pokemon.csv). If equal, choose randomly.
+  With --engine numpy --resolution types the total is first weighted by the
+  attacker's best type-effectiveness multiplier against the defender (type_chart.py).
 - Each battle is hosted by a random gym; pick a gym_id from dataset/csv/gym.csv.
-- Each battle has a unique incremental battle_id and a random date between 2025-01-01 and 2025-12-31 (ISO YYYY-MM-DD).
+- Each battle has a unique incremental battle_id (from 1, or --start-id N) and a random date between 2025-01-01 and 2025-12-31 (ISO YYYY-MM-DD).
 - Also store the trainer_winner_id (owner of the winning Pokémon).
+- Opponents are sampled through OpponentIndex (opponent_index.py); for a given seed
+  and the same input CSVs the output is identical from run to run.
+- With --workers N, shards of base Pokémon are generated in a process pool with seeds
+  derived from the master seed and shard index; output is byte-identical for any N.
+- --instrument PATH (or POKEMON_INSTRUMENT=PATH) writes a per-stage timing and memory
+  report; --pstats PATH adds a cProfile dump (see instrument.py). Its opponent.picks /
+  opponent.rejections counters are summed over the shards with --workers; --engine numpy
+  adds opponent.redraw_rounds / opponent.redraws and counts picks of its fallback index only.
 
 Output:
 - Writes dataset/csv/battle.csv with columns: battle_id, date, pok1_id, pok2_id, pokemon_winner_id, trainer_winner_id, gym_id
@@ -18,14 +28,22 @@ Output:
 
 from __future__ import annotations
 
+import argparse
 import csv
 import random
 import sys
 from pathlib import Path
 from datetime import date, timedelta
+from typing import Iterator
 
+import instrument
+from opponent_index import OpponentIndex
+from parallel_battles import DEFAULT_SHARD_SIZE, merge_counts, renumber, run_shards
+from pokedata.fileio import open_text, resolve
 
-ROOT = Path(__file__).resolve().parent
+
+# This script is at: ROOT/scripts/generate_battles.py
+ROOT = Path(__file__).resolve().parent.parent
 DATASET_DIR = ROOT / "dataset"
 CSV_DIR = DATASET_DIR / "csv"
 
@@ -42,7 +60,7 @@ def load_pokemon_stats(csv_path: Path) -> tuple[list[int], dict[int, int]]:
     """
     ids: list[int] = []
     totals: dict[int, int] = {}
-    with csv_path.open(newline="", encoding="utf-8") as f:
+    with open_text(resolve(csv_path), newline="") as f:
         reader = csv.DictReader(f)
         # Normalize fieldnames to lowercase for robust access
         # but DictReader already uses header row; we'll access case-insensitively.
@@ -68,7 +86,7 @@ def load_pokemon_stats(csv_path: Path) -> tuple[list[int], dict[int, int]]:
 def load_gyms(csv_path: Path) -> list[int]:
     """Return list of gym_id values from gym.csv."""
     gym_ids: list[int] = []
-    with csv_path.open(newline="", encoding="utf-8") as f:
+    with open_text(resolve(csv_path), newline="") as f:
         reader = csv.DictReader(f)
         for row in reader:
             val = row.get("gym_id") or row.get("GYM_ID") or row.get("id")
@@ -90,7 +108,7 @@ def load_trainer_ownership(csv_path: Path) -> dict[int, int]:
     If multiple trainers own the same Pokémon id, the last one wins (arbitrary).
     """
     mapping: dict[int, int] = {}
-    with csv_path.open(newline="", encoding="utf-8") as f:
+    with open_text(resolve(csv_path), newline="") as f:
         reader = csv.DictReader(f)
         for row in reader:
             try:
@@ -110,6 +128,8 @@ def pick_random_opponent(
     """Pick a random Pokémon ID different from exclude_id and, if ownership is provided,
     not owned by the same trainer as exclude_id. If no suitable candidate exists,
     fall back to any other Pokémon ID different from exclude_id.
+
+    Rebuilds the candidate list per call; main() uses OpponentIndex instead.
     """
     if len(all_ids) < 2:
         raise RuntimeError("Need at least 2 Pokémon to form battles")
@@ -133,49 +153,117 @@ def pick_random_opponent(
     return None
 
 
-def random_date(start: date, end: date) -> date:
+def random_date(start: date, end: date, rng=random) -> date:
     """Pick a random date between start and end (inclusive)."""
     delta_days = (end - start).days
     if delta_days < 0:
         raise ValueError("Start date must be before end date")
-    return start + timedelta(days=random.randint(0, delta_days))
-
-
-def main() -> int:
-    # Optional: seed for reproducibility if provided
-    seed_env = sys.argv[1] if len(sys.argv) > 1 else None
-    if seed_env is not None:
-        try:
-            random.seed(int(seed_env))
-        except ValueError:
-            random.seed(seed_env)
-
-    # Load inputs
-    pokemon_ids, pokemon_totals = load_pokemon_stats(POKEMON_CSV)
-    gym_ids = load_gyms(GYM_CSV)
-    ownership = load_trainer_ownership(TRAINER_OWNS_POKEMON_CSV)
-    rows: list[dict[str, int | str]] = []
+    return start + timedelta(days=rng.randint(0, delta_days))
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate battle.csv")
+    parser.add_argument("seed", nargs="?", default=None)
+    parser.add_argument(
+        "--engine",
+        choices=("python", "numpy"),
+        default="python",
+        help="per-battle Python loop (default) or the vectorized batch engine",
+    )
+    parser.add_argument(
+        "--resolution",
+        choices=("total", "types"),
+        default="total",
+        help="decide winners on total stat (default) or on total x type effectiveness (numpy engine only)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=OUTPUT_CSV,
+        help=f"output file, compressed by a .gz/.xz/.zst extension (default: {OUTPUT_CSV})",
+    )
+    parser.add_argument(
+        "--start-id",
+        type=int,
+        default=1,
+        help="number the battles from this ID (default: 1); start past the IDs already "
+             "applied to a stats/ratings/timeline store to produce a batch it can append",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="sharded mode: generate shards in N processes (output is identical for any N)",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=DEFAULT_SHARD_SIZE,
+        help=f"base Pokémon per shard in sharded mode (default: {DEFAULT_SHARD_SIZE})",
+    )
+    parser.add_argument(
+        "--cached",
+        action="store_true",
+        help="load inputs through pokedata (binary snapshot, re-parsed only when files change)",
+    )
+    parser.add_argument(
+        "--columnar",
+        type=Path,
+        default=None,
+        help="load inputs from a columnar store (export_columnar.py), mapping only the needed columns",
+    )
+    parser.add_argument(
+        "--instrument",
+        type=Path,
+        default=None,
+        help="write a per-stage timing/memory report (JSON) here",
+    )
+    parser.add_argument("--pstats", type=Path, default=None, help="write a cProfile dump here")
+    args = parser.parse_args(argv)
+    if args.cached and args.columnar is not None:
+        parser.error("--cached and --columnar are mutually exclusive")
+    if args.workers is not None and args.engine != "python":
+        parser.error("--workers is only supported with --engine python")
+    if args.resolution != "total" and args.engine != "numpy":
+        parser.error("--resolution types is only supported with --engine numpy")
+    if args.start_id < 1:
+        parser.error("--start-id must be at least 1")
+    return args
+
+
+def generate_rows(
+    pokemon_ids: list[int],
+    pokemon_totals: dict[int, int],
+    gym_ids: list[int],
+    ownership: dict[int, int],
+    rng=random,
+    base_ids: list[int] | None = None,
+    index: OpponentIndex | None = None,
+    start_id: int = 1,
+) -> Iterator[dict[str, int | str]]:
+    """Yield battle.csv rows one battle at a time, drawing from `rng` (the `random` module by default).
+
+    base_ids restricts which owned Pokémon get battles; opponents still come from every owned Pokémon.
+    battle_id runs from start_id.
+    """
 
     # Iterate over every Pokémon from pokemon.csv and generate 3 battles each
     start_day = date(2025, 1, 1)
     end_day = date(2025, 12, 31)
-    battle_id = 1
+    battle_id = start_id
     # Consider only Pokémon that are actually owned by a trainer
     owned_pokemon_ids = [pid for pid in pokemon_ids if ownership.get(pid) is not None]
-    for base_id in owned_pokemon_ids:
+    # Precomputed once so each pick is O(1) expected (see opponent_index.py)
+    if index is None:
+        index = OpponentIndex(owned_pokemon_ids, ownership)
+    for base_id in owned_pokemon_ids if base_ids is None else base_ids:
         used_opponents: set[int] = set()
         
         for _ in range(3):
-            # Pick opponent that hasn't been used yet for this base_id
-            opp_id = pick_random_opponent(owned_pokemon_ids, exclude_id=base_id, ownership=ownership)
+            # Pick opponent of another trainer that hasn't been used yet for this base_id
+            opp_id = index.pick(base_id, used_opponents, rng=rng)
             
-            # Ensure opponent is different from previously picked opponents
-            attempts = 0
-            while opp_id is not None and opp_id in used_opponents and attempts < 100:
-                opp_id = pick_random_opponent(owned_pokemon_ids, exclude_id=base_id, ownership=ownership)
-                attempts += 1
-            
-            if opp_id is None or opp_id in used_opponents:
+            if opp_id is None:
                 # No valid unique opponent found under constraints; skip this battle
                 continue
             
@@ -189,27 +277,113 @@ def main() -> int:
             elif opp_total > base_total:
                 pokemon_winner_id = opp_id
             else:
-                pokemon_winner_id = random.choice([base_id, opp_id])
+                pokemon_winner_id = rng.choice([base_id, opp_id])
 
-            gym_id = random.choice(gym_ids)
-            battle_day = random_date(start_day, end_day).isoformat()
+            gym_id = rng.choice(gym_ids)
+            battle_day = random_date(start_day, end_day, rng).isoformat()
             trainer_winner_id = ownership.get(pokemon_winner_id, "")
 
-            rows.append(
-                {
-                    "battle_id": battle_id,
-                    "date": battle_day,
-                    "pok1_id": base_id,
-                    "pok2_id": opp_id,
-                    "pokemon_winner_id": pokemon_winner_id,
-                    "trainer_winner_id": trainer_winner_id,
-                    "gym_id": gym_id,
-                }
-            )
+            yield {
+                "battle_id": battle_id,
+                "date": battle_day,
+                "pok1_id": base_id,
+                "pok2_id": opp_id,
+                "pokemon_winner_id": pokemon_winner_id,
+                "trainer_winner_id": trainer_winner_id,
+                "gym_id": gym_id,
+            }
             battle_id += 1
 
+
+def generate_shard(shared: dict, base_ids: list[int], rng) -> tuple[list[dict[str, int | str]], dict[str, int]]:
+    """Generate the rows of one shard of base Pokémon, with its opponent counters (see parallel_battles.py)."""
+    before = shared["index"].counters()
+    rows = list(generate_rows(**shared, rng=rng, base_ids=base_ids))
+    after = shared["index"].counters()
+    return rows, {key: after[key] - before[key] for key in after}
+
+
+def set_battle_id(row: dict, battle_id: int) -> None:
+    row["battle_id"] = battle_id
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    with instrument.session("generate_battles", args.instrument, args.pstats) as inst:
+        return _run(args, inst)
+
+
+def _run(args: argparse.Namespace, inst: instrument.Session) -> int:
+    # Optional: seed for reproducibility if provided
+    seed_env = args.seed
+    if seed_env is not None:
+        try:
+            random.seed(int(seed_env))
+        except ValueError:
+            random.seed(seed_env)
+
+    # Load base data (from the pokedata snapshot cache with --cached)
+    with inst.stage("load") as st:
+        if args.columnar is not None:
+            from pokedata.columnar import BATTLE_COLUMNS, load_columnar
+
+            dataset = load_columnar(args.columnar, columns=BATTLE_COLUMNS)
+            pokemon_ids, pokemon_totals, gym_ids, ownership = dataset.battle_inputs()
+        elif args.cached:
+            from pokedata import load_dataset
+
+            dataset = load_dataset("csv", units=("pokemon", "trainer", "gym"))
+            pokemon_ids, pokemon_totals, gym_ids, ownership = dataset.battle_inputs()
+        else:
+            pokemon_ids, pokemon_totals = load_pokemon_stats(POKEMON_CSV)
+            gym_ids = load_gyms(GYM_CSV)
+            ownership = load_trainer_ownership(TRAINER_OWNS_POKEMON_CSV)
+        st.records = len(pokemon_ids)
+
+    # Opponent-drawing counters for the report, read once generation is done
+    opponent_counts = None
+    if args.engine == "numpy":
+        from battle_engine import BatchBattleEngine
+
+        pokemon_types = None
+        if args.resolution == "types":
+            from pokedata import load_dataset
+            from type_chart import pokemon_type_names
+
+            pokemon_types = pokemon_type_names(load_dataset("csv", units=("pokemon", "type")))
+        engine = BatchBattleEngine(
+            pokemon_ids, pokemon_totals, gym_ids, ownership, seed=seed_env,
+            pokemon_types=pokemon_types,
+        )
+        opponent_counts = engine.counters
+        rows = engine.iter_csv_rows(start_id=args.start_id)
+    elif args.workers is not None:
+        # Per-shard seeds derive from the master seed; IDs renumbered on merge
+        owned_pokemon_ids = [pid for pid in pokemon_ids if ownership.get(pid) is not None]
+        shared = {
+            "pokemon_ids": owned_pokemon_ids,
+            "pokemon_totals": pokemon_totals,
+            "gym_ids": gym_ids,
+            "ownership": ownership,
+            "index": OpponentIndex(owned_pokemon_ids, ownership),
+        }
+        shards = run_shards(
+            generate_shard, shared, owned_pokemon_ids, seed_env,
+            workers=args.workers, shard_size=args.shard_size,
+        )
+        shard_counts = {"opponent.picks": 0, "opponent.rejections": 0}
+        rows = renumber(merge_counts(shards, shard_counts), set_battle_id, start_id=args.start_id)
+        opponent_counts = shard_counts.copy  # filled in as the shards are merged
+    else:
+        owned_pokemon_ids = [pid for pid in pokemon_ids if ownership.get(pid) is not None]
+        index = OpponentIndex(owned_pokemon_ids, ownership)
+        opponent_counts = index.counters
+        rows = generate_rows(pokemon_ids, pokemon_totals, gym_ids, ownership, index=index,
+                             start_id=args.start_id)
+    rows = inst.timed("generate", rows)
+
     # Ensure output directory exists
-    OUTPUT_CSV.parent.mkdir(parents=True, exist_ok=True)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
 
     fieldnames = [
         "battle_id",
@@ -220,12 +394,21 @@ def main() -> int:
         "trainer_winner_id",
         "gym_id",
     ]
-    with OUTPUT_CSV.open("w", newline="", encoding="utf-8") as f:
+    with inst.stage("write") as st, open_text(args.output, "w", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
-        writer.writerows(rows)
-
-    print(f"Generated {len(rows)} battles -> {OUTPUT_CSV}")
+        # Rows are written as they are generated, never held in memory
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        st.records = count
+
+    for name, n in opponent_counts().items():
+        inst.count(name, n)
+    inst.count("battles", count)
+
+    print(f"Generated {count} battles -> {args.output}")
     return 0
 
 
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Generate a scaled-up copy of the dataset with skewed (Zipf) Pokémon ownership.
+
+generate_trainer_owns_pokemon.py assigns every Pokémon to a uniformly random
+trainer and buffers all rows before writing. Real load is skewed: a few trainers
+own a lot, most own a few. This script:
+
+- multiplies trainers and Pokémon instances by --factor (100, 1000, ...): copy c
+  of a base row gets ID base_id + c * max_base_id, so copies never collide and
+  every foreign key (types, evolutions, forms) is shifted consistently
+- gives the trainer of popularity rank r (1-based) a share of the N Pokémon
+  instances proportional to 1 / r**s (--exponent s; 0 means uniform), with the
+  rank order and the instance-to-trainer mapping randomized by seeded keyed
+  (Feistel) permutations, so nothing proportional to N or to the trainer count
+  is stored
+- streams trainer_owns_pokemon.csv and trainer.json "owns" arrays trainer by
+  trainer, holding only the current trainer's Pokémon in memory
+
+The output directory mirrors dataset/ (csv/ and json/ subdirectories, gym and
+type files copied unchanged), so it can be fed to the pokedata loaders and the
+battle generators. Only the first copy of each trainer keeps its LEADS gym.
+--compress gz|xz|zst writes every file compressed (pokemon.json.gz, ...), which
+the loaders pick up transparently; --compact writes the JSON without indentation.
+
+Usage:
+    python generate_scaled_dataset.py --factor 100 --exponent 1.1 --out /tmp/pokemon_x100 42
+    python generate_scaled_dataset.py --factor 1000 --compress zst --compact --out /tmp/pokemon_x1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import random
+import shutil
+import sys
+from pathlib import Path
+from typing import Iterator
+
+from json_sink import JsonArrayWriter
+from pokedata.fileio import COMPRESSED_SUFFIXES, open_binary, open_text, resolve
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROJROOT = SCRIPTS_DIR.parent
+DATASET_DIR = PROJROOT / "dataset"
+
+# Files copied unchanged into the scaled dataset
+COPIED_FILES = (
+    "csv/gym.csv", "csv/type.csv", "csv/form.csv", "csv/trainer_leads_gym.csv",
+    "json/gym.json", "json/type.json",
+)
+
+# csv file -> columns holding Pokémon IDs ("pokemon") or trainer IDs ("trainer")
+SCALED_CSVS = {
+    "pokemon.csv": {"id": "pokemon"},
+    "pokemon_hasType_type.csv": {"pokemonID": "pokemon"},
+    "pokemon_evolvesTo_pokemon.csv": {"primitiveID": "pokemon", "evolvedID": "pokemon"},
+    "pokemon_hasForm_form.csv": {"pokemonID": "pokemon"},
+    "trainer.csv": {"trainerID": "trainer"},
+}
+
+
+# ---------------------------------------------------------------------------
+# DISTRIBUTION
+# ---------------------------------------------------------------------------
+
+_MASK64 = (1 << 64) - 1
+
+
+class FeistelPermutation:
+    """
+    Keyed pseudo-random bijection of range(n), O(1) memory.
+
+    A balanced Feistel network over the smallest even bit width covering n
+    (so at most 4n values), keyed by ROUNDS round keys from rng; values that
+    land outside range(n) are encrypted again (cycle-walking) until they fall
+    inside, which takes under 4 steps on average. Unlike an affine map, runs
+    of consecutive inputs are scattered over the whole range.
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, n: int, rng: random.Random) -> None:
+        self.n = n
+        bits = max((n - 1).bit_length(), 2)
+        self.half = (bits + 1) // 2
+        self.mask = (1 << self.half) - 1
+        self.keys = [rng.getrandbits(64) for _ in range(self.ROUNDS)]
+
+    def _round(self, x: int, key: int) -> int:
+        # splitmix64-style finalizer: every output bit depends on every input bit
+        x = ((x ^ key) * 0x9E3779B97F4A7C15) & _MASK64
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        return (x ^ (x >> 31)) & self.mask
+
+    def _encrypt(self, x: int) -> int:
+        left, right = x >> self.half, x & self.mask
+        for key in self.keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self.half) | right
+
+    def _decrypt(self, x: int) -> int:
+        left, right = x >> self.half, x & self.mask
+        for key in reversed(self.keys):
+            left, right = right ^ self._round(left, key), left
+        return (left << self.half) | right
+
+    def __call__(self, i: int) -> int:
+        x = self._encrypt(i)
+        while x >= self.n:
+            x = self._encrypt(x)
+        return x
+
+    def inverse(self, j: int) -> int:
+        x = self._decrypt(j)
+        while x >= self.n:
+            x = self._decrypt(x)
+        return x
+
+
+class ZipfShares:
+    """
+    Split `total` items over `n` ranks proportionally to 1 / (rank + 1) ** exponent.
+
+    Each rank gets floor(total * w / W); the remainder goes one item each to the
+    top ranks. Shares are computed on demand (two O(n) passes, O(1) memory).
+    """
+
+    def __init__(self, n: int, total: int, exponent: float) -> None:
+        self.n, self.total, self.exponent = n, total, exponent
+        self.norm = math.fsum(self._weight(r) for r in range(n))
+        self.remainder = total - sum(self._floor_share(r) for r in range(n))
+
+    def _weight(self, rank: int) -> float:
+        return (rank + 1) ** -self.exponent
+
+    def _floor_share(self, rank: int) -> int:
+        return int(self.total * self._weight(rank) / self.norm)
+
+    def share(self, rank: int) -> int:
+        return self._floor_share(rank) + (1 if rank < self.remainder else 0)
+
+
+# ---------------------------------------------------------------------------
+# SCALING
+# ---------------------------------------------------------------------------
+
+def _read_csv(path: Path) -> tuple[list[str], list[dict]]:
+    with open_text(resolve(path), newline="") as f:
+        reader = csv.DictReader(f)
+        return list(reader.fieldnames or []), list(reader)
+
+
+def _shift(value: str, span: int, copy: int) -> str:
+    value = (value or "").strip()
+    return str(int(value) + copy * span) if value.isdigit() else value
+
+
+def scale_csv(src: Path, dst: Path, columns: dict[str, str], spans: dict[str, int], factor: int) -> int:
+    """Write `factor` shifted copies of src to dst; return rows written."""
+    fieldnames, rows = _read_csv(src)
+    n = 0
+    with open_text(dst, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for copy in range(factor):
+            for row in rows:
+                out = dict(row)
+                for column, space in columns.items():
+                    out[column] = _shift(row[column], spans[space], copy)
+                writer.writerow(out)
+                n += 1
+    return n
+
+
+def scale_pokemon_json(src: Path, dst: Path, span: int, factor: int, indent: int | None = 4) -> int:
+    with open_text(resolve(src)) as f:
+        base = json.load(f)
+    n = 0
+    with open_text(dst, "w") as f, JsonArrayWriter(f, indent=indent) as sink:
+        for copy in range(factor):
+            for doc in base:
+                out = dict(doc)
+                out["_id"] = _shift(doc["_id"], span, copy)
+                if doc.get("evolves_to"):
+                    out["evolves_to"] = _shift(doc["evolves_to"], span, copy)
+                sink.write(out)
+                n += 1
+    return n
+
+
+def iter_owners(
+    trainer_ids: list[int],
+    pokemon_ids: list[int],
+    factor: int,
+    exponent: float,
+    rng: random.Random,
+) -> Iterator[tuple[int, int, list[int]]]:
+    """
+    Yield (copy, base trainer index, [owned Pokémon instance IDs]) for every
+    scaled trainer in ID order.
+    """
+    p_span = max(pokemon_ids)
+    n_trainers = len(trainer_ids) * factor
+    n_pokemon = len(pokemon_ids) * factor
+
+    shares = ZipfShares(n_trainers, n_pokemon, exponent)
+    rank_of = FeistelPermutation(n_trainers, rng)    # trainer index -> popularity rank
+    instance_at = FeistelPermutation(n_pokemon, rng)  # slot -> Pokémon instance index
+
+    slot = 0
+    for t in range(n_trainers):
+        count = shares.share(rank_of(t))
+        owns = []
+        for k in range(slot, slot + count):
+            i = instance_at(k)
+            copy, base = divmod(i, len(pokemon_ids))
+            owns.append(pokemon_ids[base] + copy * p_span)
+        slot += count
+        copy, base = divmod(t, len(trainer_ids))
+        yield copy, base, owns
+
+    assert slot == n_pokemon
+
+
+def write_ownership(
+    base_trainers: list[dict],
+    pokemon_ids: list[int],
+    factor: int,
+    exponent: float,
+    rng: random.Random,
+    csv_path: Path,
+    json_path: Path,
+    indent: int | None = 4,
+) -> int:
+    """Stream trainer_owns_pokemon.csv and trainer.json together; return ownership rows."""
+    trainer_ids = [int(t["_id"]) for t in base_trainers]
+    t_span = max(trainer_ids)
+    rows = 0
+    with open_text(csv_path, "w", newline="") as f_csv, \
+            open_text(json_path, "w") as f_json, \
+            JsonArrayWriter(f_json, indent=indent) as sink:
+        writer = csv.writer(f_csv)
+        writer.writerow(["trainerID", "pokename"])
+        for copy, base, owns in iter_owners(trainer_ids, pokemon_ids, factor, exponent, rng):
+            tid = trainer_ids[base] + copy * t_span
+            for pid in owns:
+                writer.writerow([tid, pid])
+            rows += len(owns)
+            src = base_trainers[base]
+            sink.write({
+                "_id": str(tid),
+                "name": src.get("name"),
+                "owns": [str(pid) for pid in owns],
+                "leads": src.get("leads") if copy == 0 else None,
+            })
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Scaled dataset with Zipf-skewed ownership")
+    parser.add_argument("seed", nargs="?", default=None)
+    parser.add_argument("--factor", type=int, default=100)
+    parser.add_argument(
+        "--exponent",
+        type=float,
+        default=1.0,
+        help="Zipf exponent s: trainer of rank r owns ~1/r**s of the Pokémon (0 = uniform)",
+    )
+    parser.add_argument("--source", type=Path, default=DATASET_DIR, help="dataset directory to scale")
+    parser.add_argument("--out", type=Path, required=True)
+    parser.add_argument("--compress", choices=[s[1:] for s in COMPRESSED_SUFFIXES], default=None,
+                        help="write every file with this compression (.gz, .xz or .zst appended)")
+    parser.add_argument("--compact", action="store_true", help="write JSON without indentation")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.factor < 1:
+        raise SystemExit("--factor must be at least 1")
+    rng = random.Random(args.seed)
+
+    src_csv, src_json = args.source / "csv", args.source / "json"
+    out_csv, out_json = args.out / "csv", args.out / "json"
+    out_csv.mkdir(parents=True, exist_ok=True)
+    out_json.mkdir(parents=True, exist_ok=True)
+
+    suffix = f".{args.compress}" if args.compress else ""
+    indent = None if args.compact else 4
+
+    def out(path: Path) -> Path:
+        return path.with_name(path.name + suffix)
+
+    for name in COPIED_FILES:
+        # Streamed through the codecs, so sources and outputs may each be compressed
+        with open_binary(resolve(args.source / name)) as f_in, open_binary(out(args.out / name), "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out)
+
+    with open_text(resolve(src_json / "trainer.json")) as f:
+        base_trainers = [t for t in json.load(f) if str(t.get("_id", "")).strip().isdigit()]
+    _fields, pokemon_rows = _read_csv(src_csv / "pokemon.csv")
+    pokemon_ids = [int(r["id"]) for r in pokemon_rows if r.get("id", "").strip().isdigit()]
+    spans = {"pokemon": max(pokemon_ids), "trainer": max(int(t["_id"]) for t in base_trainers)}
+
+    for name, columns in SCALED_CSVS.items():
+        n = scale_csv(src_csv / name, out(out_csv / name), columns, spans, args.factor)
+        print(f"  - {name}: {n} rows")
+    n = scale_pokemon_json(src_json / "pokemon.json", out(out_json / "pokemon.json"), spans["pokemon"],
+                           args.factor, indent)
+    print(f"  - pokemon.json: {n} documents")
+
+    rows = write_ownership(
+        base_trainers, pokemon_ids, args.factor, args.exponent, rng,
+        out(out_csv / "trainer_owns_pokemon.csv"), out(out_json / "trainer.json"), indent,
+    )
+    print(f"Generated {rows} ownership records for {len(base_trainers) * args.factor} trainers -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,20 +10,27 @@ Rules:
 - Write dataset/csv/trainer_owns_pokemon.csv with columns: trainerID, pokename (where pokename=pokemon_id).
 
 Usage:
-    python3 generate_trainer_owns_pokemon.py [seed]
+    python3 generate_trainer_owns_pokemon.py [seed] [--output PATH]
     
-Optional seed argument for reproducible output.
+Optional seed argument for reproducible output. --output writes elsewhere,
+compressed when the name ends in .gz/.xz/.zst (see pokedata/fileio.py).
+Set POKEMON_INSTRUMENT=report.json (and/or POKEMON_INSTRUMENT_PSTATS=run.pstats)
+for a per-stage timing and memory report (see instrument.py).
 """
 
 from __future__ import annotations
 
+import argparse
 import csv
 import random
 import sys
 from pathlib import Path
 
+import instrument
+from pokedata.fileio import open_text, resolve
 
-ROOT = Path(__file__).resolve().parent
+# This script is at: ROOT/scripts/generate_trainer_owns_pokemon.py
+ROOT = Path(__file__).resolve().parent.parent
 DATASET_DIR = ROOT / "dataset"
 CSV_DIR = DATASET_DIR / "csv"
 
@@ -35,7 +42,7 @@ OUTPUT_CSV = CSV_DIR / "trainer_owns_pokemon.csv"
 def load_pokemon_ids(csv_path: Path) -> list[int]:
     """Load all unique Pokémon IDs from pokemon.csv (using 'id' column for uniqueness)."""
     ids_set: set[int] = set()
-    with csv_path.open(newline="", encoding="utf-8") as f:
+    with open_text(resolve(csv_path), newline="") as f:
         reader = csv.DictReader(f)
         for row in reader:
             try:
@@ -54,7 +61,7 @@ def load_pokemon_ids(csv_path: Path) -> list[int]:
 def load_trainer_ids(csv_path: Path) -> list[int]:
     """Load all unique trainer IDs from trainer.csv (using 'trainerID' column for uniqueness)."""
     ids_set: set[int] = set()
-    with csv_path.open(newline="", encoding="utf-8") as f:
+    with open_text(resolve(csv_path), newline="") as f:
         reader = csv.DictReader(f)
         for row in reader:
             try:
@@ -70,9 +77,27 @@ def load_trainer_ids(csv_path: Path) -> list[int]:
     return sorted(ids_set)
 
 
-def main() -> int:
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate trainer_owns_pokemon.csv")
+    parser.add_argument("seed", nargs="?", default=None)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=OUTPUT_CSV,
+        help=f"output file, compressed by a .gz/.xz/.zst extension (default: {OUTPUT_CSV})",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    with instrument.session("generate_trainer_owns_pokemon") as inst:
+        return _run(args, inst)
+
+
+def _run(args: argparse.Namespace, inst: instrument.Session) -> int:
     # Optional: seed for reproducibility if provided
-    seed_arg = sys.argv[1] if len(sys.argv) > 1 else None
+    seed_arg = args.seed
     if seed_arg is not None:
         try:
             random.seed(int(seed_arg))
@@ -80,33 +105,38 @@ def main() -> int:
             random.seed(seed_arg)
 
     # Load inputs
-    pokemon_ids = load_pokemon_ids(POKEMON_CSV)
-    trainer_ids = load_trainer_ids(TRAINER_CSV)
+    with inst.stage("load") as st:
+        pokemon_ids = load_pokemon_ids(POKEMON_CSV)
+        trainer_ids = load_trainer_ids(TRAINER_CSV)
+        st.records = len(pokemon_ids) + len(trainer_ids)
 
     if not trainer_ids:
         raise RuntimeError("No trainers available to assign Pokémon")
 
     # Assign each Pokémon to a random trainer
     # Note: Some trainers may end up with no Pokémon (random distribution)
-    rows: list[dict[str, int]] = []
-    for pid in pokemon_ids:
-        assigned_trainer = random.choice(trainer_ids)
-        rows.append({
-            "trainerID": assigned_trainer,
-            "pokename": pid,
-        })
+    with inst.stage("generate") as st:
+        rows: list[dict[str, int]] = []
+        for pid in pokemon_ids:
+            assigned_trainer = random.choice(trainer_ids)
+            rows.append({
+                "trainerID": assigned_trainer,
+                "pokename": pid,
+            })
+        st.records = len(rows)
 
     # Ensure output directory exists
-    OUTPUT_CSV.parent.mkdir(parents=True, exist_ok=True)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
 
     # Write output
     fieldnames = ["trainerID", "pokename"]
-    with OUTPUT_CSV.open("w", newline="", encoding="utf-8") as f:
+    with inst.stage("write") as st, open_text(args.output, "w", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
         writer.writerows(rows)
+        st.records = len(rows)
 
-    print(f"Generated {len(rows)} ownership records -> {OUTPUT_CSV}")
+    print(f"Generated {len(rows)} ownership records -> {args.output}")
     print(f"  - {len(pokemon_ids)} unique Pokémon")
     print(f"  - {len(trainer_ids)} unique trainers")
     print(f"  - Each Pokémon is owned by exactly 1 trainer")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Run the dataset/cypher/pokemon_neo4j_queries.cypher query pack without Neo4j.
+
+The relationship CSVs (trainer_owns_pokemon.csv, pokemon_evolvesTo_pokemon.csv,
+pokemon_hasType_type.csv, trainer_leads_gym.csv, battle.csv) are loaded into a
+compressed-sparse-row graph (pokedata/graph.py) and the 15 queries are
+evaluated on it (pokedata/graph_queries.py). Results are printed as JSON keyed
+by query number, with the Cypher RETURN aliases as field names.
+
+--path A B prints the shortest "beat" chain from trainer A to trainer B
+(A beat X, X beat Y, ..., beat B) instead.
+
+Benchmark mode times the graph build and every query on the dataset
+replicated 1x, 10x and 100x (pokedata/synthetic.py) and prints the best-of-N
+time in milliseconds.
+
+Usage:
+    python graph_pack.py                      # all queries, CSV data
+    python graph_pack.py -q 6 -q 10
+    python graph_pack.py --path 2171 4797
+    python graph_pack.py --bench --scales 1 10 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+
+from pokedata import load_dataset
+from pokedata.graph import Graph
+from pokedata.graph_queries import GRAPH_QUERIES
+from pokedata.synthetic import scale_dataset
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the Neo4j query pack on an in-memory CSR graph")
+    parser.add_argument("--source", choices=("csv", "json"), default="csv")
+    parser.add_argument(
+        "-q", "--query",
+        type=int,
+        action="append",
+        choices=sorted(GRAPH_QUERIES),
+        help="query number to run (repeatable; default: all)",
+    )
+    parser.add_argument("--path", type=int, nargs=2, metavar=("FROM", "TO"),
+                        help="shortest BEAT path between two trainer IDs")
+    parser.add_argument("--bench", action="store_true", help="time each query instead of printing results")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per query in --bench (best is kept)")
+    return parser.parse_args(argv)
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3)
+
+
+def benchmark(dataset, numbers: list[int], scales: list[int], repeat: int) -> dict:
+    """Return {scale: {"battles": n, "build": ms, "queries": {number: best ms}}}."""
+    results: dict = {}
+    for scale in scales:
+        scaled = scale_dataset(dataset, scale)
+        graph = Graph.from_dataset(scaled)
+        results[scale] = {
+            "battles": len(scaled.battle),
+            "build": _best_ms(lambda: Graph.from_dataset(scaled), repeat),
+            "queries": {n: _best_ms(lambda: GRAPH_QUERIES[n](graph, scaled), repeat) for n in numbers},
+        }
+    return results
+
+
+def beat_path(graph: Graph, dataset, source: int, target: int) -> dict:
+    path = graph.shortest_path("Trainer", "BEAT", source, target)
+    names = dict(zip(dataset.trainer["id"], dataset.trainer["name"]))
+    return {
+        "from": source,
+        "to": target,
+        "hops": None if path is None else len(path) - 1,
+        "path": None if path is None else [{"id": tid, "trainer": names.get(tid)} for tid in path],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    numbers = args.query or sorted(GRAPH_QUERIES)
+    dataset = load_dataset(args.source)
+
+    if args.bench:
+        output = benchmark(dataset, numbers, args.scales, args.repeat)
+    else:
+        graph = Graph.from_dataset(dataset)
+        if args.path:
+            output = beat_path(graph, dataset, *args.path)
+        else:
+            output = {number: GRAPH_QUERIES[number](graph, dataset) for number in numbers}
+
+    json.dump(output, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
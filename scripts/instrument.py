@@ -0,0 +1,193 @@
+"""
+Opt-in per-stage instrumentation for the dataset scripts.
+
+Off by default. It is switched on by a report path, given either as
+--instrument PATH on the scripts that take arguments or through the environment
+(which every script honours):
+
+    POKEMON_INSTRUMENT=report.json          JSON report
+    POKEMON_INSTRUMENT_PSTATS=run.pstats    cProfile dump of the whole run
+
+The report lists, per stage (load, generate, write, ...):
+
+- elapsed_s: wall time of the stage; self_s excludes the time spent in lazily
+  consumed nested stages (e.g. "generate" running inside "write" when battles
+  are streamed to disk)
+- peak_kb:   tracemalloc peak during the stage (tracemalloc runs only when a
+  report is requested, and slows Python down accordingly)
+- records:   records produced by the stage
+
+plus free-form counters (opponent picks, rejected draws, ...) and the total.
+
+Usage in a script:
+
+    with instrument.session("generate_battles", args.instrument) as inst:
+        with inst.stage("load") as st:
+            ...
+            st.records = len(pokemon_ids)
+        rows = inst.timed("generate", generate_rows(...))
+        with inst.stage("write") as st:
+            for row in rows: ...
+        inst.count("opponent.picks", index.picks)
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+ENV_REPORT = "POKEMON_INSTRUMENT"
+ENV_PSTATS = "POKEMON_INSTRUMENT_PSTATS"
+
+
+class Stage:
+    __slots__ = ("name", "elapsed_s", "child_s", "peak_kb", "records")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.elapsed_s = 0.0
+        self.child_s = 0.0
+        self.peak_kb: int | None = None
+        self.records: int | None = None
+
+    def as_dict(self) -> dict:
+        out = {
+            "name": self.name,
+            "elapsed_s": round(self.elapsed_s, 6),
+            "self_s": round(self.elapsed_s - self.child_s, 6),
+            "peak_kb": self.peak_kb,
+            "records": self.records,
+        }
+        if self.records and self.elapsed_s > 0:
+            out["records_per_s"] = round(self.records / self.elapsed_s, 1)
+        return out
+
+
+class Session:
+    """One instrumented run of a script; a no-op unless a report or pstats path is set."""
+
+    def __init__(self, script: str, report: Path | None = None, pstats: Path | None = None) -> None:
+        self.script = script
+        self.report = report
+        self.pstats = pstats
+        self.enabled = report is not None or pstats is not None
+        self.stages: list[Stage] = []
+        self.counters: dict[str, int] = {}
+        self._open: list[Stage] = []
+        self._profiler: cProfile.Profile | None = None
+        self._started = 0.0
+
+    # ------------------------------------------------------------------
+    # Session
+    # ------------------------------------------------------------------
+
+    def __enter__(self) -> "Session":
+        if self.report is not None and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.pstats is not None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        total = time.perf_counter() - self._started
+        if self._profiler is not None:
+            self._profiler.disable()
+            self.pstats.parent.mkdir(parents=True, exist_ok=True)
+            self._profiler.dump_stats(str(self.pstats))
+        if self.report is not None:
+            # Stages reset the tracemalloc peak; the run's peak is the largest seen
+            peak = max([tracemalloc.get_traced_memory()[1] // 1024]
+                       + [st.peak_kb for st in self.stages if st.peak_kb is not None])
+            tracemalloc.stop()
+            self.report.parent.mkdir(parents=True, exist_ok=True)
+            self.report.write_text(
+                json.dumps(self.as_dict(total, peak, failed=exc_type is not None), indent=2) + "\n",
+                encoding="utf-8",
+            )
+
+    def as_dict(self, total_s: float, peak_kb: int, failed: bool = False) -> dict:
+        return {
+            "script": self.script,
+            "total_s": round(total_s, 6),
+            "peak_kb": peak_kb,
+            "failed": failed,
+            "stages": [stage.as_dict() for stage in self.stages],
+            "counters": self.counters,
+        }
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Stage]:
+        """Time a block; set .records on the yielded Stage to report a count."""
+        st = Stage(name)
+        if not self.enabled:
+            yield st
+            return
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        self.stages.append(st)
+        self._open.append(st)
+        start = time.perf_counter()
+        try:
+            yield st
+        finally:
+            st.elapsed_s = time.perf_counter() - start
+            if tracing:
+                st.peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+            self._open.pop()
+
+    def timed(self, name: str, items: Iterable) -> Iterator:
+        """
+        Wrap a lazy iterable as a stage: only the time spent producing items is
+        counted, and it is subtracted from the self time of the enclosing stage.
+        """
+        if not self.enabled:
+            return iter(items)
+        return self._timed(name, items)
+
+    def _timed(self, name: str, items: Iterable) -> Iterator:
+        st = Stage(name)
+        st.records = 0
+        self.stages.append(st)
+        it = iter(items)
+        clock = time.perf_counter
+        while True:
+            start = clock()
+            try:
+                item = next(it)
+            except StopIteration:
+                self._charge(st, clock() - start)
+                return
+            self._charge(st, clock() - start)
+            st.records += 1
+            yield item
+
+    def _charge(self, st: Stage, seconds: float) -> None:
+        st.elapsed_s += seconds
+        if self._open:
+            self._open[-1].child_s += seconds
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+
+def session(script: str, report: Path | None = None, pstats: Path | None = None) -> Session:
+    """Build a Session, taking paths not given explicitly from the environment."""
+    if report is None and os.environ.get(ENV_REPORT):
+        report = Path(os.environ[ENV_REPORT])
+    if pstats is None and os.environ.get(ENV_PSTATS):
+        pstats = Path(os.environ[ENV_PSTATS])
+    return Session(script, report, pstats)
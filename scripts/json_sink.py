@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON writers with bounded memory.
+
+Documents are serialized and written one at a time as a generator yields them,
+so peak memory does not depend on how many documents are written.
+
+Two formats:
+
+- "json":   a single valid JSON array. With the default indent=2 the bytes are
+            identical to json.dump(list_of_docs, f, indent=2, ensure_ascii=False).
+- "ndjson": one compact document per line, as expected by
+            mongoimport --file battles.ndjson (no --jsonArray).
+
+Usage:
+    with JsonArrayWriter(f) as sink:
+        for doc in docs:
+            sink.write(doc)
+
+    count = write_documents(docs, path, fmt="ndjson")
+
+write_documents() compresses by extension (battles.json.gz, battles.ndjson.zst;
+see pokedata/fileio.py); indent=None writes the array without any whitespace.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import IO, Iterable
+
+from pokedata.fileio import open_text
+
+FORMATS = ("json", "ndjson")
+
+
+def format_for_path(path: Path, default: str = "json") -> str:
+    """Guess the output format from the file extension (.ndjson / .jsonl -> ndjson, also before .gz etc.)."""
+    suffixes = [s.lower() for s in path.suffixes]
+    if ".ndjson" in suffixes or ".jsonl" in suffixes:
+        return "ndjson"
+    return default
+
+
+class JsonArrayWriter:
+    """Write documents as the elements of one JSON array, streaming."""
+
+    def __init__(self, f: IO[str], indent: int | None = 2) -> None:
+        self.f = f
+        self.indent = indent
+        self.count = 0
+
+    def __enter__(self) -> "JsonArrayWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+
+    def write(self, doc) -> None:
+        if self.indent is None:
+            text = json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+            self.f.write(("[" if self.count == 0 else ",") + text)
+        else:
+            pad = " " * self.indent
+            text = json.dumps(doc, indent=self.indent, ensure_ascii=False)
+            text = text.replace("\n", "\n" + pad)
+            self.f.write(("[\n" if self.count == 0 else ",\n") + pad + text)
+        self.count += 1
+
+    def close(self) -> None:
+        if self.count == 0:
+            self.f.write("[]")
+        elif self.indent is None:
+            self.f.write("]")
+        else:
+            self.f.write("\n]")
+
+
+class NdjsonWriter:
+    """Write one compact JSON document per line, streaming."""
+
+    def __init__(self, f: IO[str]) -> None:
+        self.f = f
+        self.count = 0
+
+    def __enter__(self) -> "NdjsonWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+    def write(self, doc) -> None:
+        self.f.write(json.dumps(doc, ensure_ascii=False, separators=(",", ":")))
+        self.f.write("\n")
+        self.count += 1
+
+    def close(self) -> None:
+        pass
+
+
+def open_sink(f: IO[str], fmt: str = "json", indent: int | None = 2):
+    """Return the writer for `fmt` ("json" or "ndjson") over an open text file."""
+    if fmt == "json":
+        return JsonArrayWriter(f, indent=indent)
+    if fmt == "ndjson":
+        return NdjsonWriter(f)
+    raise ValueError(f"Unknown output format {fmt!r} (expected one of {FORMATS})")
+
+
+def write_documents(
+    docs: Iterable,
+    path: Path,
+    fmt: str | None = None,
+    indent: int | None = 2,
+) -> int:
+    """
+    Stream `docs` to `path` and return how many were written.
+
+    fmt defaults to format_for_path(path).
+    """
+    if fmt is None:
+        fmt = format_for_path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open_text(path, "w") as f:
+        with open_sink(f, fmt, indent=indent) as sink:
+            for doc in docs:
+                sink.write(doc)
+    return sink.count
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Async batched loader for the MongoDB collections.
+
+Replaces the manual Compass import (model/ReadMe.md). pokemon.json,
+trainer.json, gym.json, type.json and battles.json are streamed document by
+document (pokedata.jsonstream) into Pokemon, Trainer, Gym, Type and Battle,
+the collection names used by dataset/mongodb_queries.js:
+
+- documents go out in unordered insert_many batches of --batch-size; up to
+  --concurrency batches are in flight at once, shared by all collections,
+  so at most that many batches are held in memory
+- a batch that fails with a transient error (AutoReconnect and subclasses:
+  lost connection, network timeout, no primary) is retried up to --retries
+  times with exponential backoff. Every document has an _id, so a retry is
+  idempotent: duplicate-key errors on a retry are documents an interrupted
+  attempt already wrote and count as loaded
+- indexes (export_mongo_typed.INDEXES) are created after all collections are
+  loaded, not maintained during the load
+- documents per second is reported per collection
+
+Documents are loaded as they are in the JSON files (string IDs and stats, as
+the Compass import stored them and the query pack expects). --typed loads
+them with the conversions of export_mongo_typed.py instead, with real dates.
+
+The driver is optional: pymongo >= 4.9 (AsyncMongoClient) or motor.
+--memory loads into MemoryDatabase, an in-process stand-in with the same
+async collection API, which can add latency and inject transient failures to
+exercise batching, concurrency and retries without a mongod.
+
+Usage:
+    python mongo_loader.py --uri mongodb://localhost:27017 --db PokemonDB --drop
+    python mongo_loader.py --typed --batch-size 2000 --concurrency 8
+    python mongo_loader.py --memory --latency 0.005 --fail-rate 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from export_mongo_typed import COLLECTIONS, CONVERTERS, INDEXES
+from pokedata.jsonstream import iter_documents
+
+try:
+    from pymongo import AsyncMongoClient
+except ImportError:  # optional: pymongo < 4.9 or not installed
+    AsyncMongoClient = None
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+except ImportError:  # optional: the older async driver
+    AsyncIOMotorClient = None
+
+try:
+    from pymongo.errors import AutoReconnect, BulkWriteError
+except ImportError:
+    # Same shape as the pymongo errors, so MemoryDatabase raises what a driver would
+    class AutoReconnect(Exception):
+        pass
+
+    class BulkWriteError(Exception):
+        def __init__(self, results: dict) -> None:
+            super().__init__("batch op errors occurred")
+            self.details = results
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROJROOT = SCRIPTS_DIR.parent
+JSON_DIR = PROJROOT / "dataset" / "json"
+
+DEFAULT_URI = "mongodb://localhost:27017"
+DEFAULT_DB = "PokemonDB"
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 3
+DEFAULT_RETRY_DELAY = 0.2
+
+DUPLICATE_KEY = 11000
+
+
+# ---------------------------------------------------------------------------
+# IN-PROCESS STAND-IN
+# ---------------------------------------------------------------------------
+
+class InsertManyResult:
+    __slots__ = ("inserted_ids",)
+
+    def __init__(self, inserted_ids: list) -> None:
+        self.inserted_ids = inserted_ids
+
+
+class MemoryCollection:
+    """
+    The part of the async collection API the loader uses: insert_many,
+    create_index, drop. Documents are kept in a dict by _id.
+    """
+
+    def __init__(self, db: "MemoryDatabase", name: str) -> None:
+        self.db = db
+        self.name = name
+        self.documents: dict = {}
+        self.indexes: list[list[tuple[str, int]]] = []
+
+    async def insert_many(self, documents: Iterable[dict], ordered: bool = True) -> InsertManyResult:
+        documents = list(documents)
+        await self.db.delay(len(documents))
+        # A failed request may still have written part of the batch, as on a real server
+        cut = len(documents)
+        if self.db.fail_rate and self.db.rng.random() < self.db.fail_rate:
+            cut = self.db.rng.randint(0, len(documents))
+        inserted, errors = [], []
+        for i, doc in enumerate(documents[:cut]):
+            if doc["_id"] in self.documents:
+                errors.append({"index": i, "code": DUPLICATE_KEY, "errmsg": f"duplicate key {doc['_id']!r}"})
+                if ordered:
+                    break
+                continue
+            self.documents[doc["_id"]] = doc
+            inserted.append(doc["_id"])
+        if cut < len(documents):
+            raise AutoReconnect(f"connection closed after {cut} of {len(documents)} documents")
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(inserted)})
+        return InsertManyResult(inserted)
+
+    async def create_index(self, keys: list[tuple[str, int]], **kwargs) -> str:
+        await self.db.delay(len(self.documents) // 100)
+        self.indexes.append(list(keys))
+        return "_".join(f"{field}_{direction}" for field, direction in keys)
+
+    async def drop(self) -> None:
+        self.documents.clear()
+        self.indexes.clear()
+
+
+class MemoryDatabase:
+    """
+    In-process stand-in for an async database. latency is added per request
+    (plus per_doc per document); fail_rate is the chance that an insert_many
+    writes only part of its batch and then raises AutoReconnect.
+    """
+
+    def __init__(self, latency: float = 0.0, per_doc: float = 0.0, fail_rate: float = 0.0, seed=None) -> None:
+        self.latency = latency
+        self.per_doc = per_doc
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        self.collections: dict[str, MemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        if name not in self.collections:
+            self.collections[name] = MemoryCollection(self, name)
+        return self.collections[name]
+
+    async def delay(self, n: int) -> None:
+        await asyncio.sleep(self.latency + self.per_doc * n)
+
+
+# ---------------------------------------------------------------------------
+# DOCUMENTS
+# ---------------------------------------------------------------------------
+
+def _to_driver(doc: dict) -> dict:
+    # export_mongo_typed writes Extended JSON dates for mongoimport; drivers take datetimes
+    value = doc.get("date")
+    if isinstance(value, dict) and "$date" in value:
+        doc["date"] = datetime.fromisoformat(value["$date"].replace("Z", "+00:00"))
+    return doc
+
+
+def iter_collection(collection: str, json_dir: Path = JSON_DIR, typed: bool = False) -> Iterator[dict]:
+    """Stream the documents of one collection, converted with --typed."""
+    docs = iter_documents(json_dir / COLLECTIONS[collection])
+    if not typed:
+        return docs
+    convert = CONVERTERS[collection]
+    return (_to_driver(convert(doc)) for doc in docs)
+
+
+def batched(docs: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    batch: list[dict] = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ---------------------------------------------------------------------------
+# LOADING
+# ---------------------------------------------------------------------------
+
+class LoadStats:
+    __slots__ = ("collection", "documents", "batches", "retries", "duplicates", "seconds")
+
+    def __init__(self, collection: str) -> None:
+        self.collection = collection
+        self.documents = 0
+        self.batches = 0
+        self.retries = 0
+        self.duplicates = 0
+        self.seconds = 0.0
+
+    @property
+    def docs_per_s(self) -> float:
+        return self.documents / self.seconds if self.seconds > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "collection": self.collection,
+            "documents": self.documents,
+            "batches": self.batches,
+            "retries": self.retries,
+            "duplicates": self.duplicates,
+            "seconds": round(self.seconds, 3),
+            "docs_per_s": round(self.docs_per_s, 1),
+        }
+
+
+async def insert_batch(
+    collection,
+    batch: list[dict],
+    stats: LoadStats,
+    retries: int = DEFAULT_RETRIES,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+) -> None:
+    """One unordered insert_many, retried on transient errors."""
+    for attempt in range(retries + 1):
+        try:
+            result = await collection.insert_many(batch, ordered=False)
+            stats.documents += len(result.inserted_ids)
+            return
+        except AutoReconnect:
+            if attempt == retries:
+                raise
+            stats.retries += 1
+            await asyncio.sleep(retry_delay * 2 ** attempt)
+        except BulkWriteError as exc:
+            errors = exc.details.get("writeErrors", [])
+            if not errors or any(e.get("code") != DUPLICATE_KEY for e in errors):
+                raise
+            if attempt:
+                # Written by an earlier attempt that lost its connection
+                stats.documents += len(batch)
+            else:
+                stats.documents += exc.details.get("nInserted", len(batch) - len(errors))
+                stats.duplicates += len(errors)
+            return
+
+
+async def load_collection(
+    db,
+    collection: str,
+    docs: Iterable[dict],
+    slots: asyncio.Semaphore,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    retries: int = DEFAULT_RETRIES,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+) -> LoadStats:
+    """Insert docs into one collection; slots bounds the batches in flight."""
+    stats = LoadStats(collection)
+    target = db[collection]
+    pending: set[asyncio.Task] = set()
+    start = time.perf_counter()
+    try:
+        for batch in batched(docs, batch_size):
+            await slots.acquire()
+            task = asyncio.create_task(insert_batch(target, batch, stats, retries, retry_delay))
+            task.add_done_callback(lambda _: slots.release())
+            pending.add(task)
+            stats.batches += 1
+            # Fail fast: surface a batch that ran out of retries
+            for done in [t for t in pending if t.done()]:
+                pending.discard(done)
+                done.result()
+            # Let the event loop run the in-flight inserts between batches
+            await asyncio.sleep(0)
+        if pending:
+            await asyncio.gather(*pending)
+    except BaseException:
+        for task in pending:
+            task.cancel()
+        raise
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+async def create_indexes(db, collections: Iterable[str]) -> dict[str, float]:
+    """Build the query-pack indexes of the loaded collections; seconds per collection."""
+    wanted = set(collections)
+    seconds: dict[str, float] = {}
+    for collection, keys, _reason in INDEXES:
+        if collection not in wanted:
+            continue
+        start = time.perf_counter()
+        await db[collection].create_index(keys)
+        seconds[collection] = seconds.get(collection, 0.0) + time.perf_counter() - start
+    return seconds
+
+
+async def load(
+    db,
+    collections: Iterable[str] = tuple(COLLECTIONS),
+    json_dir: Path = JSON_DIR,
+    typed: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    retries: int = DEFAULT_RETRIES,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+    drop: bool = False,
+    indexes: bool = True,
+) -> dict:
+    """Load the collections concurrently, then build indexes; return the report."""
+    collections = list(collections)
+    if drop:
+        for collection in collections:
+            await db[collection].drop()
+    slots = asyncio.Semaphore(max(1, concurrency))
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        load_collection(
+            db, collection, iter_collection(collection, json_dir, typed), slots,
+            batch_size=batch_size, retries=retries, retry_delay=retry_delay,
+        )
+        for collection in collections
+    ))
+    loaded = time.perf_counter()
+    index_s = await create_indexes(db, collections) if indexes else {}
+    return {
+        "collections": [stats.as_dict() for stats in results],
+        "load_s": round(loaded - start, 3),
+        "index_s": {c: round(s, 3) for c, s in index_s.items()},
+    }
+
+
+def connect(uri: str):
+    """Open an async client with whichever driver is installed."""
+    if AsyncMongoClient is not None:
+        return AsyncMongoClient(uri)
+    if AsyncIOMotorClient is not None:
+        return AsyncIOMotorClient(uri)
+    raise RuntimeError(
+        "Loading into MongoDB needs pymongo>=4.9 or motor (pip install pymongo); "
+        "use --memory for the in-process stand-in"
+    )
+
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load the JSON dataset into MongoDB")
+    parser.add_argument("--uri", default=DEFAULT_URI)
+    parser.add_argument("--db", default=DEFAULT_DB)
+    parser.add_argument("--json-dir", type=Path, default=JSON_DIR)
+    parser.add_argument("--collections", nargs="+", choices=list(COLLECTIONS), default=list(COLLECTIONS))
+    parser.add_argument("--typed", action="store_true", help="load with export_mongo_typed conversions")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="insert_many batches in flight at once")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                        help="retries per batch on transient errors")
+    parser.add_argument("--retry-delay", type=float, default=DEFAULT_RETRY_DELAY,
+                        help="first backoff in seconds (doubled per retry)")
+    parser.add_argument("--drop", action="store_true", help="drop the collections first")
+    parser.add_argument("--no-indexes", action="store_true", help="skip index creation")
+    memory = parser.add_argument_group("in-process stand-in")
+    memory.add_argument("--memory", action="store_true", help="load into MemoryDatabase instead of MongoDB")
+    memory.add_argument("--latency", type=float, default=0.0, help="seconds added per request")
+    memory.add_argument("--fail-rate", type=float, default=0.0, help="chance an insert_many fails midway")
+    memory.add_argument("--seed", default=None, help="seed for --fail-rate")
+    args = parser.parse_args(argv)
+    if args.batch_size < 1 or args.concurrency < 1 or args.retries < 0:
+        parser.error("--batch-size and --concurrency must be >= 1, --retries >= 0")
+    return args
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    client = None
+    if args.memory:
+        db = MemoryDatabase(latency=args.latency, fail_rate=args.fail_rate, seed=args.seed)
+    else:
+        client = connect(args.uri)
+        db = client[args.db]
+    try:
+        return await load(
+            db, args.collections, args.json_dir, typed=args.typed,
+            batch_size=args.batch_size, concurrency=args.concurrency,
+            retries=args.retries, retry_delay=args.retry_delay,
+            drop=args.drop, indexes=not args.no_indexes,
+        )
+    finally:
+        if client is not None:
+            closed = client.close()
+            if inspect.isawaitable(closed):
+                await closed
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    try:
+        report = asyncio.run(_run(args))
+    except (AutoReconnect, BulkWriteError) as exc:
+        print(f"Load failed: {exc}", file=sys.stderr)
+        return 1
+    target = "memory" if args.memory else f"{args.uri}/{args.db}"
+    print(f"Loaded into {target} in {report['load_s']}s "
+          f"(batch size {args.batch_size}, {args.concurrency} in flight)")
+    for stats in report["collections"]:
+        extra = ""
+        if stats["retries"] or stats["duplicates"]:
+            extra = f", {stats['retries']} retries, {stats['duplicates']} duplicates"
+        print(f"  - {stats['collection']:<8} {stats['documents']:>7} docs in {stats['batches']:>4} batches, "
+              f"{stats['seconds']:.3f}s = {stats['docs_per_s']:.0f} docs/s{extra}")
+    if report["index_s"]:
+        print("Indexes: " + ", ".join(f"{c} {s}s" for c, s in report["index_s"].items()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Export the canonical CSVs as a Neo4j graph, without the giant literal CREATE scripts.
+
+dataset/cypher/pokemon.cypher and relations.cypher are single CREATE statements
+keyed by variable names, which Neo4j has to parse and plan as one huge query.
+This script reads dataset/csv/*.csv once, row by row, and writes either:
+
+- --mode admin (default): node and relationship CSVs with typed headers
+  (id:ID(Pokemon), total:int, date:date, :START_ID(Trainer), ...) plus an
+  import.sh running `neo4j-admin database import full` over them
+- --mode unwind: one load.cypher of uniqueness constraints followed by
+  parameterized batches (`:param rows => [...]` then `UNWIND $rows AS row ...`)
+  of --batch-size rows each, runnable with cypher-shell
+
+Either way load time grows linearly with the graph. The graph model follows
+dataset/cypher/pokemon_neo4j_queries.cypher and commands.cypher (property names
+are the CSV column names, e.g. Pokemon.pokename, Trainer.trainerID, Gym.gym_id).
+
+Usage:
+    python neo4j_export.py --out ../dataset/neo4j
+    python neo4j_export.py --mode unwind --batch-size 5000 --out ../dataset/neo4j
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import Iterator
+
+from pokedata.fileio import open_text, resolve
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROJROOT = SCRIPTS_DIR.parent
+CSV_DIR = PROJROOT / "dataset" / "csv"
+DEFAULT_OUT_DIR = PROJROOT / "dataset" / "neo4j"
+
+DEFAULT_BATCH_SIZE = 1000
+
+# ---------------------------------------------------------------------------
+# GRAPH MODEL
+# ---------------------------------------------------------------------------
+
+# label -> (source csv, key property, [(csv column, property, type)])
+# type is "int", "string" or "date"; the key property is always an int
+NODES: dict[str, tuple[str, str, list[tuple[str, str, str]]]] = {
+    "Pokemon": ("pokemon.csv", "id", [
+        ("id", "id", "int"), ("number", "number", "string"), ("pokename", "pokename", "string"),
+        ("total", "total", "int"), ("hp", "hp", "int"), ("attack", "attack", "int"),
+        ("defense", "defense", "int"), ("sp_atk", "sp_atk", "int"), ("sp_def", "sp_def", "int"),
+    ]),
+    "Trainer": ("trainer.csv", "trainerID", [
+        ("trainerID", "trainerID", "int"), ("trainername", "trainername", "string"),
+    ]),
+    "Gym": ("gym.csv", "gym_id", [
+        ("gym_id", "gym_id", "int"), ("gym_name", "gym_name", "string"),
+        ("region", "region", "string"), ("location", "location", "string"),
+        ("badge_name", "badge_name", "string"),
+    ]),
+    "Type": ("type.csv", "id", [("id", "id", "int"), ("name", "name", "string")]),
+    "Form": ("form.csv", "id", [("id", "id", "int"), ("form", "name", "string")]),
+    "Battle": ("battle.csv", "battle_id", [
+        ("battle_id", "battle_id", "int"), ("date", "date", "date"),
+        ("gym_id", "gym_id", "int"), ("trainer_winner_id", "trainer_winner_id", "int"),
+    ]),
+}
+
+# (relationship type, source csv, (start column, start label), (end column, end label))
+RELATIONSHIPS: list[tuple[str, str, tuple[str, str], tuple[str, str]]] = [
+    ("OWNS", "trainer_owns_pokemon.csv", ("trainerID", "Trainer"), ("pokename", "Pokemon")),
+    ("EVOLVES_TO", "pokemon_evolvesTo_pokemon.csv", ("primitiveID", "Pokemon"), ("evolvedID", "Pokemon")),
+    ("HAS_TYPE", "pokemon_hasType_type.csv", ("pokemonID", "Pokemon"), ("typeID", "Type")),
+    ("HAS_FORM", "pokemon_hasForm_form.csv", ("pokemonID", "Pokemon"), ("formID", "Form")),
+    ("LEADS", "trainer_leads_gym.csv", ("trainer_id", "Trainer"), ("gym_id", "Gym")),
+    ("SPECIALIZES_IN", "gym.csv", ("gym_id", "Gym"), ("specialty_type_id", "Type")),
+    ("HOSTS", "battle.csv", ("gym_id", "Gym"), ("battle_id", "Battle")),
+    ("WON", "battle.csv", ("pokemon_winner_id", "Pokemon"), ("battle_id", "Battle")),
+    ("WON", "battle.csv", ("trainer_winner_id", "Trainer"), ("battle_id", "Battle")),
+    ("FIGHTS_IN", "battle.csv", ("pok1_id", "Pokemon"), ("battle_id", "Battle")),
+    ("FIGHTS_IN", "battle.csv", ("pok2_id", "Pokemon"), ("battle_id", "Battle")),
+]
+
+
+def _int(value) -> int | None:
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _convert(value, kind: str):
+    if value is None or str(value).strip() == "":
+        return None
+    if kind == "int":
+        return _int(value)
+    return str(value).strip() if kind == "date" else value
+
+
+def _read(csv_dir: Path, name: str) -> Iterator[dict]:
+    with open_text(resolve(csv_dir / name), newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def iter_nodes(label: str, csv_dir: Path = CSV_DIR) -> Iterator[dict]:
+    """Yield {property: typed value} for every node of `label`; rows without a key are skipped."""
+    source, key, columns = NODES[label]
+    for row in _read(csv_dir, source):
+        props = {}
+        for column, prop, kind in columns:
+            value = _convert(row.get(column), kind)
+            if value is not None:
+                props[prop] = value
+        if props.get(key) is not None:
+            yield props
+
+
+def iter_relationships(index: int, csv_dir: Path = CSV_DIR) -> Iterator[tuple[int, int]]:
+    """Yield (start key, end key) for RELATIONSHIPS[index]; rows with a missing end are skipped."""
+    _rel_type, source, (start_col, _), (end_col, _) = RELATIONSHIPS[index]
+    for row in _read(csv_dir, source):
+        start, end = _int(row.get(start_col)), _int(row.get(end_col))
+        if start is not None and end is not None:
+            yield start, end
+
+
+def relationship_file_name(index: int) -> str:
+    rel_type, source, (start_col, _), (end_col, _) = RELATIONSHIPS[index]
+    return f"rels_{rel_type}_{Path(source).stem}_{start_col}.csv"
+
+
+# ---------------------------------------------------------------------------
+# neo4j-admin IMPORT
+# ---------------------------------------------------------------------------
+
+_HEADER_TYPES = {"int": ":int", "string": "", "date": ":date"}
+
+
+def write_admin_import(out_dir: Path, csv_dir: Path = CSV_DIR, database: str = "neo4j") -> dict[str, int]:
+    """Write node/relationship CSVs and import.sh; return row counts per file."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    counts: dict[str, int] = {}
+    args = ["neo4j-admin database import full", "  --id-type=integer"]
+
+    for label, (_source, key, columns) in NODES.items():
+        name = f"nodes_{label}.csv"
+        header = [
+            f"{prop}:ID({label})" if prop == key else prop + _HEADER_TYPES[kind]
+            for _column, prop, kind in columns
+        ]
+        props = [prop for _column, prop, _kind in columns]
+        with (out_dir / name).open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            n = 0
+            for node in iter_nodes(label, csv_dir):
+                writer.writerow([node.get(prop, "") for prop in props])
+                n += 1
+        counts[name] = n
+        args.append(f"  --nodes={label}={name}")
+
+    for i, (rel_type, _source, (_, start_label), (_, end_label)) in enumerate(RELATIONSHIPS):
+        name = relationship_file_name(i)
+        with (out_dir / name).open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow([f":START_ID({start_label})", f":END_ID({end_label})"])
+            n = 0
+            for start, end in iter_relationships(i, csv_dir):
+                writer.writerow([start, end])
+                n += 1
+        counts[name] = n
+        args.append(f"  --relationships={rel_type}={name}")
+
+    args.append(f"  {database}")
+    script = out_dir / "import.sh"
+    script.write_text(
+        "#!/bin/sh\n"
+        "# Run from this directory with the target database stopped.\n"
+        "cd \"$(dirname \"$0\")\"\n"
+        + " \\\n".join(args) + "\n",
+        encoding="utf-8",
+    )
+    script.chmod(0o755)
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# UNWIND $rows CYPHER
+# ---------------------------------------------------------------------------
+
+
+def cypher_literal(value) -> str:
+    """Render a Python value as a Cypher literal (strings use JSON escaping, which Cypher accepts)."""
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"`{k}`: {cypher_literal(v)}" for k, v in value.items()) + "}"
+    if isinstance(value, list):
+        return "[" + ", ".join(cypher_literal(v) for v in value) + "]"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    if isinstance(value, int):
+        return str(value)
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def constraint_statements() -> list[str]:
+    return [
+        f"CREATE CONSTRAINT {label.lower()}_{key} IF NOT EXISTS "
+        f"FOR (n:{label}) REQUIRE n.{key} IS UNIQUE;"
+        for label, (_source, key, _columns) in NODES.items()
+    ]
+
+
+def node_statement(label: str) -> str:
+    """Statement creating one batch of `label` nodes from $rows."""
+    dates = [prop for _c, prop, kind in NODES[label][2] if kind == "date"]
+    sets = "".join(f" SET n.{prop} = date(row.{prop})" for prop in dates)
+    return f"UNWIND $rows AS row CREATE (n:{label}) SET n = row{sets};"
+
+
+def relationship_statement(index: int) -> str:
+    """Statement creating one batch of RELATIONSHIPS[index] from $rows of {start, end}."""
+    rel_type, _source, (_, start_label), (_, end_label) = RELATIONSHIPS[index]
+    start_key, end_key = NODES[start_label][1], NODES[end_label][1]
+    return (
+        f"UNWIND $rows AS row "
+        f"MATCH (a:{start_label} {{{start_key}: row.start}}) "
+        f"MATCH (b:{end_label} {{{end_key}: row.end}}) "
+        f"CREATE (a)-[:{rel_type}]->(b);"
+    )
+
+
+def batched(rows, batch_size: int) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_unwind_script(out_dir: Path, batch_size: int, csv_dir: Path = CSV_DIR) -> int:
+    """Write load.cypher; return how many batches it contains."""
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    batches = 0
+    with (out_dir / "load.cypher").open("w", encoding="utf-8") as f:
+        f.write("// Generated by scripts/neo4j_export.py --mode unwind\n")
+        f.write("// Run with: cypher-shell -f load.cypher\n\n")
+        for statement in constraint_statements():
+            f.write(statement + "\n")
+        f.write("\n")
+
+        for label in NODES:
+            statement = node_statement(label)
+            for batch in batched(iter_nodes(label, csv_dir), batch_size):
+                f.write(f":param rows => {cypher_literal(batch)};\n{statement}\n")
+                batches += 1
+
+        for i in range(len(RELATIONSHIPS)):
+            statement = relationship_statement(i)
+            rows = ({"start": s, "end": e} for s, e in iter_relationships(i, csv_dir))
+            for batch in batched(rows, batch_size):
+                f.write(f":param rows => {cypher_literal(batch)};\n{statement}\n")
+                batches += 1
+    return batches
+
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export the dataset for Neo4j bulk loading")
+    parser.add_argument("--mode", choices=("admin", "unwind"), default="admin")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT_DIR)
+    parser.add_argument("--csv-dir", type=Path, default=CSV_DIR)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--database", default="neo4j")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.mode == "admin":
+        counts = write_admin_import(args.out, args.csv_dir, database=args.database)
+        print(f"Wrote {len(counts)} files ({sum(counts.values())} rows) -> {args.out}")
+        print(f"  - run {args.out / 'import.sh'} with the database stopped")
+    else:
+        batches = write_unwind_script(args.out, args.batch_size, args.csv_dir)
+        print(f"Wrote {batches} batches of up to {args.batch_size} rows -> {args.out / 'load.cypher'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Batched, transactional Neo4j loader driven by the canonical CSVs.
+
+Pasting pokemon.cypher and relations.cypher into the browser runs the whole
+graph as one transaction, which runs out of heap on larger datasets. This
+script loads the same graph model as neo4j_export.py (NODES, RELATIONSHIPS:
+pokemon, trainer, gym, type, form and battle nodes; OWNS, EVOLVES_TO,
+HAS_TYPE, HAS_FORM, LEADS, SPECIALIZES_IN, HOSTS, WON and FIGHTS_IN from
+trainer_owns_pokemon.csv, pokemon_evolvesTo_pokemon.csv, ... battle.csv)
+straight into a running database:
+
+1. the uniqueness constraints, which also index the node keys that the
+   relationship batches MATCH on
+2. nodes, then relationships, as parameterized `UNWIND $rows` statements of
+   --batch-size rows, each in its own write transaction
+   (session.execute_write, which retries transient errors such as deadlocks
+   between concurrent relationship batches)
+
+Batches are spread over a pool of --sessions sessions, one per worker thread,
+with at most twice that many batches read ahead. All nodes are committed
+before the first relationship batch starts. Progress is printed every
+--progress seconds, and rows/s per label and relationship at the end.
+
+The loader CREATEs, so it expects an empty database; --clear deletes the
+existing graph first (in batches). --dry-run reads and batches everything
+without a database, which is useful to check the input and the batch counts.
+
+Needs the neo4j driver (pip install neo4j) except with --dry-run.
+
+Usage:
+    python neo4j_loader.py --uri bolt://localhost:7687 --user neo4j --password secret --clear
+    python neo4j_loader.py --batch-size 5000 --sessions 4 --csv-dir ../dataset/scaled-x10/csv
+    python neo4j_loader.py --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Iterable
+
+from neo4j_export import (
+    CSV_DIR,
+    NODES,
+    RELATIONSHIPS,
+    batched,
+    constraint_statements,
+    iter_nodes,
+    iter_relationships,
+    node_statement,
+    relationship_statement,
+)
+
+try:
+    from neo4j import GraphDatabase
+except ImportError:  # optional: only needed to talk to a database
+    GraphDatabase = None
+
+DEFAULT_URI = "bolt://localhost:7687"
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_SESSIONS = 4
+DEFAULT_PROGRESS_S = 5.0
+
+CLEAR_STATEMENT = "MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS"
+
+
+# ---------------------------------------------------------------------------
+# SESSIONS
+# ---------------------------------------------------------------------------
+
+def _write_batch(tx, statement: str, rows: list) -> None:
+    tx.run(statement, rows=rows).consume()
+
+
+class SessionPool:
+    """One session per worker thread, opened on first use (sessions are not thread-safe)."""
+
+    def __init__(self, driver, database: str | None) -> None:
+        self.driver = driver
+        self.database = database
+        self._local = threading.local()
+        self._sessions: list = []
+        self._lock = threading.Lock()
+
+    def session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self.driver.session(database=self.database)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def write(self, statement: str, rows: list) -> None:
+        self.session().execute_write(_write_batch, statement, rows)
+
+    def run(self, statement: str) -> None:
+        """Auto-commit statement (schema changes, CALL { } IN TRANSACTIONS)."""
+        self.session().run(statement).consume()
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+
+
+class DryRunPool:
+    """Stands in for SessionPool with --dry-run: batches are built and dropped."""
+
+    def write(self, statement: str, rows: list) -> None:
+        pass
+
+    def run(self, statement: str) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+# ---------------------------------------------------------------------------
+# PROGRESS
+# ---------------------------------------------------------------------------
+
+class StepStats:
+    __slots__ = ("name", "rows", "batches", "started", "finished")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.rows = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+        self.finished = self.started
+
+    @property
+    def seconds(self) -> float:
+        return self.finished - self.started
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "rows": self.rows,
+            "batches": self.batches,
+            "seconds": round(self.seconds, 3),
+            "rows_per_s": round(self.rows / self.seconds, 1) if self.seconds > 0 else None,
+        }
+
+
+class Progress:
+    """Thread-safe committed-row counter, printed at most every interval seconds."""
+
+    def __init__(self, interval: float = DEFAULT_PROGRESS_S, out=sys.stderr) -> None:
+        self.interval = interval
+        self.out = out
+        self.rows = 0
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._last = self._start
+
+    def committed(self, step: StepStats, n: int) -> None:
+        with self._lock:
+            step.rows += n
+            step.finished = time.perf_counter()
+            self.rows += n
+            if self.interval > 0 and step.finished - self._last >= self.interval:
+                self._last = step.finished
+                elapsed = step.finished - self._start
+                print(f"  ... {self.rows} rows committed in {elapsed:.1f}s "
+                      f"({self.rows / elapsed:.0f} rows/s), now {step.name}", file=self.out)
+
+
+# ---------------------------------------------------------------------------
+# LOADING
+# ---------------------------------------------------------------------------
+
+def run_phase(
+    pool,
+    executor: ThreadPoolExecutor,
+    steps: list[tuple[str, str, Iterable]],
+    batch_size: int,
+    read_ahead: int,
+    progress: Progress,
+) -> list[StepStats]:
+    """
+    Submit every batch of steps [(name, statement, rows)] and wait until all are
+    committed. At most read_ahead batches are queued or running at once.
+    """
+    slots = threading.BoundedSemaphore(read_ahead)
+    pending: set[Future] = set()
+    results: list[StepStats] = []
+
+    def submit(step: StepStats, statement: str, batch: list) -> Future:
+        def task() -> None:
+            try:
+                pool.write(statement, batch)
+                progress.committed(step, len(batch))
+            finally:
+                slots.release()
+        return executor.submit(task)
+
+    try:
+        for name, statement, rows in steps:
+            step = StepStats(name)
+            results.append(step)
+            for batch in batched(rows, batch_size):
+                slots.acquire()
+                pending.add(submit(step, statement, batch))
+                step.batches += 1
+                # Fail fast on a batch that could not be committed. One snapshot of the
+                # finished futures: each is dropped from pending only after its result
+                # has been checked.
+                for future in [f for f in pending if f.done()]:
+                    pending.discard(future)
+                    future.result()
+        done, _ = wait(pending, return_when=FIRST_EXCEPTION)
+        for future in done:
+            future.result()
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        raise
+    return results
+
+
+def node_steps(csv_dir: Path) -> list[tuple[str, str, Iterable]]:
+    return [
+        (label, node_statement(label).rstrip(";"), iter_nodes(label, csv_dir))
+        for label in NODES
+    ]
+
+
+def relationship_steps(csv_dir: Path) -> list[tuple[str, str, Iterable]]:
+    steps = []
+    for i, (rel_type, source, (start_col, _), _end) in enumerate(RELATIONSHIPS):
+        rows = ({"start": s, "end": e} for s, e in iter_relationships(i, csv_dir))
+        steps.append((f"{rel_type} ({source}:{start_col})", relationship_statement(i).rstrip(";"), rows))
+    return steps
+
+
+def load_graph(
+    pool,
+    csv_dir: Path = CSV_DIR,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sessions: int = DEFAULT_SESSIONS,
+    clear: bool = False,
+    progress: Progress | None = None,
+) -> dict:
+    """Constraints, then nodes, then relationships; return the per-step report."""
+    if batch_size < 1 or sessions < 1:
+        raise ValueError("batch_size and sessions must be at least 1")
+    progress = progress or Progress()
+    report: dict = {}
+    start = time.perf_counter()
+
+    if clear:
+        pool.run(CLEAR_STATEMENT)
+        report["clear_s"] = round(time.perf_counter() - start, 3)
+
+    t = time.perf_counter()
+    for statement in constraint_statements():
+        pool.run(statement.rstrip(";"))
+    report["constraints_s"] = round(time.perf_counter() - t, 3)
+
+    with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix="neo4j-load") as executor:
+        read_ahead = 2 * sessions
+        nodes = run_phase(pool, executor, node_steps(csv_dir), batch_size, read_ahead, progress)
+        rels = run_phase(pool, executor, relationship_steps(csv_dir), batch_size, read_ahead, progress)
+
+    report["nodes"] = [step.as_dict() for step in nodes]
+    report["relationships"] = [step.as_dict() for step in rels]
+    report["total_s"] = round(time.perf_counter() - start, 3)
+    report["rows"] = progress.rows
+    return report
+
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load the CSV dataset into Neo4j in batched transactions")
+    parser.add_argument("--uri", default=DEFAULT_URI)
+    parser.add_argument("--user", default="neo4j")
+    parser.add_argument("--password", default=os.environ.get("NEO4J_PASSWORD"),
+                        help="default: $NEO4J_PASSWORD")
+    parser.add_argument("--database", default=None, help="default: the server's default database")
+    parser.add_argument("--csv-dir", type=Path, default=CSV_DIR)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="rows per transaction")
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS, help="concurrent sessions")
+    parser.add_argument("--clear", action="store_true", help="delete every node and relationship first")
+    parser.add_argument("--progress", type=float, default=DEFAULT_PROGRESS_S,
+                        help="seconds between progress lines (0 disables them)")
+    parser.add_argument("--dry-run", action="store_true", help="read and batch the CSVs without a database")
+    args = parser.parse_args(argv)
+    if args.batch_size < 1 or args.sessions < 1:
+        parser.error("--batch-size and --sessions must be at least 1")
+    return args
+
+
+def _print_report(report: dict) -> None:
+    for section in ("nodes", "relationships"):
+        for step in report[section]:
+            rate = f"{step['rows_per_s']:.0f} rows/s" if step["rows_per_s"] else "-"
+            print(f"  - {step['name']:<56} {step['rows']:>7} rows in {step['batches']:>4} batches, "
+                  f"{step['seconds']:.3f}s = {rate}")
+    print(f"Loaded {report['rows']} rows in {report['total_s']}s "
+          f"(constraints {report['constraints_s']}s)")
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    progress = Progress(args.progress)
+
+    if args.dry_run:
+        report = load_graph(DryRunPool(), args.csv_dir, args.batch_size, args.sessions, progress=progress)
+        _print_report(report)
+        return 0
+
+    if GraphDatabase is None:
+        raise RuntimeError("Loading into Neo4j needs the neo4j driver (pip install neo4j); see --dry-run")
+    if args.password is None:
+        raise RuntimeError("No password: pass --password or set NEO4J_PASSWORD")
+    with GraphDatabase.driver(args.uri, auth=(args.user, args.password),
+                              max_connection_pool_size=max(args.sessions, 1) + 1) as driver:
+        driver.verify_connectivity()
+        pool = SessionPool(driver, args.database)
+        try:
+            report = load_graph(pool, args.csv_dir, args.batch_size, args.sessions,
+                                clear=args.clear, progress=progress)
+        finally:
+            pool.close()
+    _print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Opponent-sampling index shared by the battle generators.
+
+The old pick_random_opponent() rebuilt the full candidate list on every call,
+which made battle generation quadratic in the number of owned Pokémon.
+OpponentIndex precomputes, once:
+
+- pool: every owned Pokémon ID, in the order given
+- owned_by: trainer ID -> set of Pokémon IDs owned by that trainer
+
+and then samples an opponent in expected O(1) by rejection: draw a random
+position in the pool and reject it if it belongs to the base Pokémon's trainer
+or was already used as an opponent for that base. When the eligible set is a
+small fraction of the pool (rejection would loop many times) it falls back to
+an explicit scan for that one pick.
+
+Battle rules are unchanged:
+- the opponent is owned by a different trainer than the base Pokémon
+- each base Pokémon gets a distinct opponent for each of its battles
+
+Determinism: the index only consumes randomness through the `rng` it is given
+(the `random` module by default), so for a given seed and the same input files
+the generated battles are identical from run to run. The sequence differs from
+the pre-index generators, which drew from a rebuilt candidate list instead of
+the full pool.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Hashable, Iterable, Mapping
+
+# Rejection sampling is used while at least 1/REJECTION_RATIO of the pool is
+# eligible; below that a one-off candidate scan is cheaper on average.
+REJECTION_RATIO = 8
+
+
+class OpponentIndex:
+    """Precomputed pool of owned Pokémon plus per-trainer exclusion sets."""
+
+    def __init__(
+        self,
+        owned_ids: Iterable[Hashable],
+        ownership: Mapping[Hashable, Hashable],
+    ) -> None:
+        self.pool: list = list(owned_ids)
+        self.ownership = ownership
+        self.members: set = set(self.pool)
+        self.owned_by: dict = {}
+        for pid in self.pool:
+            self.owned_by.setdefault(ownership[pid], set()).add(pid)
+
+        # Counters for instrumentation: picks served and rejected draws
+        self.picks = 0
+        self.rejections = 0
+
+    def __len__(self) -> int:
+        return len(self.pool)
+
+    def counters(self) -> dict[str, int]:
+        """Counters for instrument.py."""
+        return {"opponent.picks": self.picks, "opponent.rejections": self.rejections}
+
+    def excluded_for(self, base_id: Hashable) -> set:
+        """Return the Pokémon IDs that can never be opponents of base_id."""
+        trainer = self.ownership.get(base_id)
+        if trainer is None:
+            return {base_id}
+        return self.owned_by.get(trainer, {base_id})
+
+    def pick(
+        self,
+        base_id: Hashable,
+        used: set | frozenset = frozenset(),
+        rng=random,
+    ):
+        """
+        Pick an opponent for base_id that is owned by another trainer and not in `used`.
+
+        Returns None if no such opponent exists.
+        """
+        if len(self.pool) < 2:
+            raise RuntimeError("Need at least 2 Pokémon to form battles")
+
+        self.picks += 1
+        excluded = self.excluded_for(base_id)
+        n_excluded = len(excluded)
+        if base_id in excluded and base_id not in self.members:
+            # Only the {base_id} fallback can hold an ID outside the pool
+            n_excluded -= 1
+        n_used = sum(1 for pid in used if pid in self.members and pid not in excluded)
+        eligible = len(self.pool) - n_excluded - n_used
+        if eligible <= 0:
+            return None
+
+        pool = self.pool
+        if eligible * REJECTION_RATIO >= len(pool):
+            while True:
+                pid = pool[rng.randrange(len(pool))]
+                if pid not in excluded and pid not in used:
+                    return pid
+                self.rejections += 1
+
+        candidates = [pid for pid in pool if pid not in excluded and pid not in used]
+        return rng.choice(candidates)
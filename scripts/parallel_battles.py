@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Multi-process sharded battle generation.
+
+The owned Pokémon list is cut into fixed-size shards of base Pokémon. Each shard
+is generated in a process pool with its own random.Random seeded from the
+master seed and the shard index (derive_seed), and shards are merged back in
+shard order with battle IDs renumbered to stay globally contiguous (b1, b2, ...).
+
+Shard boundaries and per-shard seeds depend only on the data, the master seed
+and --shard-size, never on the worker count, so the merged output is
+byte-identical for --workers 1, 2, 8, ...
+
+Usage (from the generators):
+    python create_battles_json.py 42 --workers 8
+    python generate_battles.py 42 --workers 8 --shard-size 5000
+"""
+
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import random
+import secrets
+from collections import deque
+from typing import Callable, Iterator
+
+DEFAULT_SHARD_SIZE = 2048
+
+# Shards submitted ahead of the one being merged, per worker
+PREFETCH_PER_WORKER = 2
+
+# Per-process state set once by the pool initializer
+_WORKER_STATE: dict = {}
+
+
+def derive_seed(master_seed: int | str, shard_index: int) -> int:
+    """Derive a stable 64-bit seed for one shard from the master seed."""
+    digest = hashlib.sha256(f"{master_seed}:{shard_index}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def _init_worker(shard_fn: Callable, shared, base_ids: list) -> None:
+    _WORKER_STATE["shard_fn"] = shard_fn
+    _WORKER_STATE["shared"] = shared
+    _WORKER_STATE["base_ids"] = base_ids
+
+
+def _run_shard(task: tuple[int, int, int, int]) -> list:
+    _shard_index, seed, lo, hi = task
+    shard_fn = _WORKER_STATE["shard_fn"]
+    base_ids = _WORKER_STATE["base_ids"]
+    return shard_fn(_WORKER_STATE["shared"], base_ids[lo:hi], random.Random(seed))
+
+
+def run_shards(
+    shard_fn: Callable,
+    shared,
+    base_ids: list,
+    master_seed: int | str | None,
+    workers: int,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+) -> Iterator[list]:
+    """
+    Yield the result of shard_fn(shared, shard_base_ids, rng) for every shard, in shard order.
+
+    shard_fn must be a module-level function (it is pickled to the workers).
+    At most workers * PREFETCH_PER_WORKER shard results are buffered at once.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if shard_size < 1:
+        raise ValueError("shard_size must be at least 1")
+    if master_seed is None:
+        master_seed = secrets.randbits(64)
+
+    tasks = [
+        (i, derive_seed(master_seed, i), lo, min(lo + shard_size, len(base_ids)))
+        for i, lo in enumerate(range(0, len(base_ids), shard_size))
+    ]
+
+    if workers == 1:
+        _init_worker(shard_fn, shared, base_ids)
+        for task in tasks:
+            yield _run_shard(task)
+        return
+
+    with multiprocessing.Pool(
+        workers, initializer=_init_worker, initargs=(shard_fn, shared, base_ids)
+    ) as pool:
+        pending: deque = deque()
+        todo = iter(tasks)
+        for task in todo:
+            pending.append(pool.apply_async(_run_shard, (task,)))
+            if len(pending) >= workers * PREFETCH_PER_WORKER:
+                break
+        while pending:
+            result = pending.popleft().get()
+            task = next(todo, None)
+            if task is not None:
+                pending.append(pool.apply_async(_run_shard, (task,)))
+            yield result
+
+
+def merge_counts(shards: Iterator[tuple[list, dict]], counters: dict[str, int]) -> Iterator[list]:
+    """
+    Unpack (records, counts) shard results, adding each shard's counts into counters.
+
+    Workers hold their own copy of the shared state, so per-shard counters (such
+    as OpponentIndex picks) only add up when each shard reports its own.
+    """
+    for records, counts in shards:
+        for name, n in counts.items():
+            counters[name] = counters.get(name, 0) + n
+        yield records
+
+
+def renumber(shards: Iterator[list], set_id: Callable[[object, int], None], start_id: int = 1) -> Iterator:
+    """Flatten shard results and assign globally contiguous battle IDs."""
+    battle_id = start_id
+    for records in shards:
+        for record in records:
+            set_id(record, battle_id)
+            yield record
+            battle_id += 1
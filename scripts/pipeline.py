@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Incremental build of the derived dataset files.
+
+The derived files come from a chain of scripts: gym types -> ownership ->
+battles (CSV and JSON) -> Neo4j / SQLite / columnar exports. This runner
+declares each stage's script, arguments, input files and output files. The
+dependency graph follows from that: a stage depends on whichever stage writes
+one of its inputs.
+
+A stage is skipped when nothing it depends on has changed. Its key is a
+SHA-256 over the content of its inputs, its script and the local modules the
+script imports, its arguments and (for the generators) the seed. A stage runs
+again when that key differs from the last successful run recorded in
+dataset/.cache/pipeline.json, or when one of its outputs is missing or was
+changed since that run. Because keys hash content, not mtimes:
+
+- editing one field of gym.csv rebuilds gym_converted.csv, battle.csv and the
+  exports that read them, and leaves ownership and the JSON battles alone
+- a stage that rewrites an output with identical content (same seed, same
+  inputs) does not trigger its dependents
+
+File hashes are cached by (size, mtime) in the state file, so unchanged files
+are not re-read. Stages run as subprocesses. Up to --jobs of them run at once
+as soon as the stages they depend on are done, so the CSV chain and the JSON
+battles are built concurrently.
+
+Usage:
+    python pipeline.py 42                    # build everything that is stale
+    python pipeline.py 42 --dry-run          # list what would run
+    python pipeline.py 42 --only battles_csv # one stage (plus stale upstream stages)
+    python pipeline.py 42 --force            # rebuild everything
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from pokedata.fileio import resolve
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROJROOT = SCRIPTS_DIR.parent
+DATA_DIR = PROJROOT / "dataset"
+STATE_FILE = DATA_DIR / ".cache" / "pipeline.json"
+
+STATE_VERSION = 1
+HASH_BLOCK = 1 << 20
+
+
+class Stage:
+    """
+    One script run. Paths are relative to the dataset directory; code paths to
+    scripts/. "{seed}" in args is replaced by the seed (and dropped without one).
+    """
+
+    __slots__ = ("name", "script", "args", "inputs", "outputs", "code")
+
+    def __init__(
+        self,
+        name: str,
+        script: str,
+        args: tuple[str, ...] = (),
+        inputs: tuple[str, ...] = (),
+        outputs: tuple[str, ...] = (),
+        code: tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self.script = script
+        self.args = args
+        self.inputs = inputs
+        self.outputs = outputs
+        self.code = (script,) + code
+
+    @property
+    def seeded(self) -> bool:
+        return "{seed}" in self.args
+
+    def command(self, seed: str | None) -> list[str]:
+        args = [a for a in self.args if a != "{seed}" or seed is not None]
+        args = [a.replace("{seed}", seed or "").replace("{data}", str(DATA_DIR)) for a in args]
+        return [sys.executable, str(SCRIPTS_DIR / self.script), *args]
+
+
+# ---------------------------------------------------------------------------
+# STAGES
+# ---------------------------------------------------------------------------
+
+_GRAPH_CSVS = (
+    "csv/pokemon.csv", "csv/trainer.csv", "csv/gym.csv", "csv/type.csv", "csv/form.csv",
+    "csv/battle.csv", "csv/trainer_owns_pokemon.csv", "csv/pokemon_evolvesTo_pokemon.csv",
+    "csv/pokemon_hasType_type.csv", "csv/pokemon_hasForm_form.csv", "csv/trainer_leads_gym.csv",
+)
+
+STAGES: list[Stage] = [
+    Stage(
+        "gym_types", "convert_gym_type.py",
+        inputs=("csv/gym.csv", "csv/type.csv"),
+        outputs=("csv/gym_converted.csv",),
+        code=("instrument.py", "pokedata/fileio.py"),
+    ),
+    Stage(
+        "ownership", "generate_trainer_owns_pokemon.py", ("{seed}",),
+        inputs=("csv/pokemon.csv", "csv/trainer.csv"),
+        outputs=("csv/trainer_owns_pokemon.csv",),
+        code=("instrument.py", "pokedata/fileio.py"),
+    ),
+    Stage(
+        "battles_csv", "generate_battles.py", ("{seed}",),
+        inputs=("csv/pokemon.csv", "csv/gym.csv", "csv/trainer_owns_pokemon.csv"),
+        outputs=("csv/battle.csv",),
+        code=("instrument.py", "opponent_index.py", "parallel_battles.py", "pokedata/fileio.py"),
+    ),
+    Stage(
+        "battles_json", "create_battles_json.py", ("{seed}",),
+        inputs=("json/pokemon.json", "json/gym.json", "json/trainer.json"),
+        outputs=("json/battles.json",),
+        code=("instrument.py", "json_sink.py", "opponent_index.py", "parallel_battles.py",
+              "pokedata/fileio.py", "pokedata/jsonstream.py"),
+    ),
+    Stage(
+        "neo4j", "neo4j_export.py", ("--out", "{data}/neo4j"),
+        inputs=_GRAPH_CSVS,
+        outputs=("neo4j",),
+        code=("pokedata/fileio.py",),
+    ),
+    Stage(
+        "sqlite", "build_sqlite.py", ("--rebuild", "--db", "{data}/pokemon.sqlite"),
+        inputs=_GRAPH_CSVS,
+        outputs=("pokemon.sqlite",),
+        code=("pokedata/fileio.py",),
+    ),
+    Stage(
+        "columnar", "export_columnar.py", ("--out", "{data}/columnar"),
+        inputs=_GRAPH_CSVS,
+        outputs=("columnar",),
+        code=("pokedata",),
+    ),
+]
+
+
+def upstream(stages: list[Stage]) -> dict[str, set[str]]:
+    """stage name -> names of the stages writing one of its inputs."""
+    writers: dict[str, str] = {}
+    for stage in stages:
+        for path in stage.outputs:
+            if path in writers:
+                raise ValueError(f"{path} is written by both {writers[path]} and {stage.name}")
+            writers[path] = stage.name
+    deps = {
+        stage.name: {writers[p] for p in stage.inputs if p in writers} - {stage.name}
+        for stage in stages
+    }
+    # Reject cycles (Kahn's algorithm must consume every stage)
+    remaining = {name: set(d) for name, d in deps.items()}
+    while remaining:
+        ready = [name for name, d in remaining.items() if not d]
+        if not ready:
+            raise ValueError(f"Dependency cycle between stages {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for d in remaining.values():
+            d.difference_update(ready)
+    return deps
+
+
+# ---------------------------------------------------------------------------
+# HASHING
+# ---------------------------------------------------------------------------
+
+class Hasher:
+    """Content hashes of files and directories, cached by (size, mtime_ns)."""
+
+    def __init__(self, cache: dict[str, list]) -> None:
+        self.cache = cache
+
+    def file(self, path: Path) -> str:
+        st = path.stat()
+        key = str(path)
+        cached = self.cache.get(key)
+        if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        h = hashlib.sha256()
+        with path.open("rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        self.cache[key] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def path(self, path: Path) -> str | None:
+        """Hash of a file, or of a directory's relative names + file hashes; None if missing."""
+        if path.is_file():
+            return self.file(path)
+        if not path.is_dir():
+            return None
+        h = hashlib.sha256()
+        for child in sorted(path.rglob("*")):
+            if child.is_file() and "__pycache__" not in child.parts:
+                h.update(f"{child.relative_to(path).as_posix()}\0{self.file(child)}\n".encode("utf-8"))
+        return h.hexdigest()
+
+
+def stage_key(stage: Stage, seed: str | None, hasher: Hasher) -> str:
+    """Hash of everything a stage's outputs depend on."""
+    manifest = {
+        "args": list(stage.args),
+        "seed": seed if stage.seeded else None,
+        "code": {c: hasher.path(SCRIPTS_DIR / c) for c in stage.code},
+        # Scripts fall back to a compressed copy (gym.csv.gz, ...) of a missing input
+        "inputs": {p: hasher.path(resolve(DATA_DIR / p)) for p in stage.inputs},
+    }
+    return hashlib.sha256(json.dumps(manifest, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def output_hashes(stage: Stage, hasher: Hasher) -> dict[str, str | None]:
+    return {p: hasher.path(DATA_DIR / p) for p in stage.outputs}
+
+
+# ---------------------------------------------------------------------------
+# STATE
+# ---------------------------------------------------------------------------
+
+def load_state(path: Path) -> dict:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"version": STATE_VERSION, "files": {}, "stages": {}}
+    if state.get("version") != STATE_VERSION:
+        return {"version": STATE_VERSION, "files": {}, "stages": {}}
+    return state
+
+
+def save_state(path: Path, state: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def is_fresh(stage: Stage, key: str, state: dict, hasher: Hasher) -> bool:
+    """The last recorded run used this key and its outputs are still what it wrote."""
+    record = state["stages"].get(stage.name)
+    if record is None or record.get("key") != key:
+        return False
+    current = output_hashes(stage, hasher)
+    return None not in current.values() and current == record.get("outputs")
+
+
+# ---------------------------------------------------------------------------
+# RUNNING
+# ---------------------------------------------------------------------------
+
+def select(stages: list[Stage], deps: dict[str, set[str]], only: list[str] | None) -> list[Stage]:
+    """The stages named in only plus everything upstream of them (all stages without only)."""
+    if not only:
+        return stages
+    names = {s.name for s in stages}
+    unknown = [n for n in only if n not in names]
+    if unknown:
+        raise ValueError(f"Unknown stage(s) {unknown}; known: {sorted(names)}")
+    wanted, todo = set(), list(only)
+    while todo:
+        name = todo.pop()
+        if name not in wanted:
+            wanted.add(name)
+            todo.extend(deps[name])
+    return [s for s in stages if s.name in wanted]
+
+
+def plan(stages: list[Stage], deps: dict, seed: str | None, state: dict, force: bool) -> list[str]:
+    """
+    Names of the stages a run would execute. A stage whose upstream reruns is
+    counted as stale, since its inputs cannot be hashed before they are rebuilt.
+    """
+    hasher = Hasher(state["files"])
+    stale: list[str] = []
+    for stage in stages:
+        if force or deps[stage.name] & set(stale) or not is_fresh(
+            stage, stage_key(stage, seed, hasher), state, hasher
+        ):
+            stale.append(stage.name)
+    return stale
+
+
+def _run_stage(stage: Stage, seed: str | None, state: dict, hasher: Hasher, force: bool) -> dict:
+    """Run one stage unless it is fresh; return its result record."""
+    key = stage_key(stage, seed, hasher)
+    if not force and is_fresh(stage, key, state, hasher):
+        return {"status": "skipped"}
+    start = time.perf_counter()
+    proc = subprocess.run(
+        stage.command(seed), cwd=SCRIPTS_DIR, capture_output=True, text=True, encoding="utf-8",
+    )
+    elapsed = round(time.perf_counter() - start, 3)
+    if proc.returncode != 0:
+        return {"status": "failed", "seconds": elapsed, "returncode": proc.returncode,
+                "stderr": proc.stderr[-4000:]}
+    outputs = output_hashes(stage, hasher)
+    missing = [p for p, digest in outputs.items() if digest is None]
+    if missing:
+        return {"status": "failed", "seconds": elapsed, "returncode": 0,
+                "stderr": f"declared outputs not written: {missing}"}
+    return {"status": "ran", "seconds": elapsed, "key": key, "outputs": outputs}
+
+
+def run(
+    stages: list[Stage],
+    deps: dict[str, set[str]],
+    seed: str | None,
+    state: dict,
+    jobs: int = 2,
+    force: bool = False,
+) -> dict[str, dict]:
+    """Run stages in dependency order, up to jobs at once; return name -> result."""
+    hasher = Hasher(state["files"])
+    selected = {s.name for s in stages}
+    pending = {s.name: s for s in stages}
+    results: dict[str, dict] = {}
+    running: dict = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                needs = deps[name] & selected
+                if any(results.get(d, {}).get("status") in ("failed", "blocked") for d in needs):
+                    results[name] = {"status": "blocked"}
+                    del pending[name]
+                elif all(d in results for d in needs):
+                    del pending[name]
+                    running[pool.submit(_run_stage, stage, seed, state, hasher, force)] = name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                result = future.result()
+                results[name] = result
+                if result["status"] == "ran":
+                    state["stages"][name] = {"key": result["key"], "outputs": result["outputs"]}
+                    print(f"  ran      {name} ({result['seconds']}s)")
+                elif result["status"] == "skipped":
+                    print(f"  skipped  {name} (up to date)")
+                else:
+                    state["stages"].pop(name, None)
+                    print(f"  FAILED   {name} (exit {result['returncode']})\n{result['stderr']}",
+                          file=sys.stderr)
+    for name, result in results.items():
+        if result["status"] == "blocked":
+            print(f"  blocked  {name} (an upstream stage failed)", file=sys.stderr)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild the derived dataset files that are out of date")
+    parser.add_argument("seed", nargs="?", default=None, help="seed passed to the generators")
+    parser.add_argument("--only", nargs="+", default=None, metavar="STAGE",
+                        help="build these stages (and any stale stage upstream of them)")
+    parser.add_argument("--jobs", type=int, default=2, help="stages run at once (default: 2)")
+    parser.add_argument("--force", action="store_true", help="run every selected stage")
+    parser.add_argument("--dry-run", action="store_true", help="list the stages that would run")
+    parser.add_argument("--list", action="store_true", help="print the stage graph and exit")
+    parser.add_argument("--state", type=Path, default=STATE_FILE)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    deps = upstream(STAGES)
+
+    if args.list:
+        for stage in STAGES:
+            after = ", ".join(sorted(deps[stage.name])) or "-"
+            print(f"{stage.name:<13} after: {after:<22} writes: {', '.join(stage.outputs)}")
+        return 0
+
+    stages = select(STAGES, deps, args.only)
+    state = load_state(args.state)
+
+    if args.dry_run:
+        stale = plan(stages, deps, args.seed, state, args.force)
+        for stage in stages:
+            print(f"  {'run ' if stage.name in stale else 'skip'}  {stage.name}")
+        save_state(args.state, state)
+        return 0
+
+    start = time.perf_counter()
+    results = run(stages, deps, args.seed, state, jobs=args.jobs, force=args.force)
+    save_state(args.state, state)
+
+    counts = {status: sum(r["status"] == status for r in results.values())
+              for status in ("ran", "skipped", "failed", "blocked")}
+    print(f"{counts['ran']} ran, {counts['skipped']} up to date, "
+          f"{counts['failed'] + counts['blocked']} failed in {time.perf_counter() - start:.2f}s")
+    return 1 if counts["failed"] or counts["blocked"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
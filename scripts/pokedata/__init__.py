@@ -0,0 +1,26 @@
+"""
+Shared loader for the Pokémon dataset.
+
+One typed, column-oriented model (integer IDs, integer stats) built from either
+the JSON or the CSV files, cached as binary snapshots keyed by the source
+files' mtime and hash.
+"""
+
+from .columns import INT, TEXT, Table
+from .dataset import CACHE_DIR, TABLES, Dataset, load_dataset, load_unit
+from .parsers import SCHEMAS, UNITS, to_day, to_int
+
+__all__ = [
+    "CACHE_DIR",
+    "INT",
+    "SCHEMAS",
+    "TABLES",
+    "TEXT",
+    "UNITS",
+    "Dataset",
+    "Table",
+    "load_dataset",
+    "load_unit",
+    "to_day",
+    "to_int",
+]
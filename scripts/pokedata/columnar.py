@@ -0,0 +1,268 @@
+"""
+Columnar on-disk store with projection pushdown.
+
+Each table column is stored as one contiguous typed file, plus a manifest.json
+describing tables, row counts and column files:
+
+- npy (default, stdlib only): INT columns are little-endian int32 .npy files;
+  TEXT columns are a UTF-8 blob (.utf8) plus an int64 .npy of n + 1 byte
+  offsets. The files are plain NumPy arrays (numpy.load(..., mmap_mode="r")
+  reads them) but are written and memory-mapped here without NumPy.
+- parquet (needs pyarrow): one .parquet file per table; reads pass the
+  requested columns down to pyarrow, so only those column chunks are read.
+
+    from pokedata import load_dataset
+    from pokedata.columnar import load_columnar, write_columnar
+
+    write_columnar(load_dataset("csv"), "dataset/columnar")
+    ds = load_columnar("dataset/columnar", columns=BATTLE_COLUMNS)
+
+Loaded INT columns are read-only memoryviews over the mapped files (no parse,
+no copy; pages are read on first touch) and TEXT columns decode on access.
+They support len(), indexing and iteration like the in-memory columns, but
+tables loaded this way cannot be appended to.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+from .columns import Table
+from .dataset import TABLES, Dataset
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only the parquet format needs it
+    pa = pq = None
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+FORMATS = ("npy", "parquet")
+
+# The only columns the battle generators read (Dataset.battle_inputs)
+BATTLE_COLUMNS = {
+    "pokemon": ("id", "total"),
+    "gym": ("id",),
+    "ownership": ("pokemon_id", "trainer_id"),
+}
+
+_NPY_MAGIC = b"\x93NUMPY"
+_DESCR = {"i": "<i4", "q": "<i8"}
+
+
+# ---------------------------------------------------------------------------
+# .npy files
+# ---------------------------------------------------------------------------
+
+def _write_npy(path: Path, values: array) -> None:
+    """Write a 1-D array('i') or array('q') as a version 1.0 .npy file."""
+    header = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (
+        _DESCR[values.typecode], len(values),
+    )
+    # magic (6) + version (2) + header length (2) + header, padded to 64 bytes
+    pad = 64 - (10 + len(header) + 1) % 64
+    header = header + " " * pad + "\n"
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    with path.open("wb") as f:
+        f.write(_NPY_MAGIC + b"\x01\x00" + struct.pack("<H", len(header)))
+        f.write(header.encode("latin1"))
+        f.write(values.tobytes())
+
+
+def _map_npy(path: Path, typecode: str) -> Sequence[int]:
+    """Memory-map a 1-D .npy file of the given type as a read-only sequence."""
+    with path.open("rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mm[:6] != _NPY_MAGIC:
+        raise ValueError(f"{path} is not a .npy file")
+    if mm[6] == 1:
+        header_len, start = struct.unpack("<H", mm[8:10])[0], 10
+    else:
+        header_len, start = struct.unpack("<I", mm[8:12])[0], 12
+    header = ast.literal_eval(mm[start:start + header_len].decode("latin1"))
+    if header["descr"] != _DESCR[typecode] or header["fortran_order"] or len(header["shape"]) != 1:
+        raise ValueError(f"{path}: expected a 1-D {_DESCR[typecode]} array, got {header}")
+    data = memoryview(mm)[start + header_len:]
+    if sys.byteorder != "little":
+        values = array(typecode, data.tobytes())
+        values.byteswap()
+        return values
+    return data.cast(typecode)
+
+
+class TextColumn(Sequence[str]):
+    """Read-only text column: UTF-8 blob + offsets, decoded per access."""
+
+    __slots__ = ("_offsets", "_blob")
+
+    def __init__(self, offsets: Sequence[int], blob) -> None:
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]]).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        offsets, blob = self._offsets, self._blob
+        for i in range(len(self)):
+            yield bytes(blob[offsets[i]:offsets[i + 1]]).decode("utf-8")
+
+
+def _map_blob(path: Path):
+    if path.stat().st_size == 0:
+        return b""
+    with path.open("rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+def _write_table_npy(table: Table, out_dir: Path) -> dict:
+    columns = {}
+    for column, code in table.schema.items():
+        stem = f"{table.name}.{column}"
+        values = table[column]
+        if code:
+            _write_npy(out_dir / f"{stem}.npy", array("i", values))
+            columns[column] = {"type": "int", "files": [f"{stem}.npy"]}
+            continue
+        offsets = array("q", [0])
+        with (out_dir / f"{stem}.utf8").open("wb") as f:
+            for text in values:
+                data = (text or "").encode("utf-8")
+                f.write(data)
+                offsets.append(offsets[-1] + len(data))
+        _write_npy(out_dir / f"{stem}.offsets.npy", offsets)
+        columns[column] = {"type": "text", "files": [f"{stem}.utf8", f"{stem}.offsets.npy"]}
+    return columns
+
+
+def _write_table_parquet(table: Table, out_dir: Path) -> dict:
+    fields, arrays = [], []
+    for column, code in table.schema.items():
+        fields.append(pa.field(column, pa.int32() if code else pa.string()))
+        arrays.append(list(table[column]))
+    name = f"{table.name}.parquet"
+    pq.write_table(pa.table(arrays, schema=pa.schema(fields)), out_dir / name)
+    return {
+        column: {"type": "int" if code else "text", "files": [name]}
+        for column, code in table.schema.items()
+    }
+
+
+def write_columnar(ds: Dataset, out_dir: Path | str, fmt: str = "npy") -> dict:
+    """Write every loaded table of ds to out_dir; return the manifest."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r} (expected one of {FORMATS})")
+    if fmt == "parquet" and pq is None:
+        raise RuntimeError("The parquet format needs pyarrow (pip install pyarrow)")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    write = _write_table_parquet if fmt == "parquet" else _write_table_npy
+    manifest = {"version": FORMAT_VERSION, "format": fmt, "source": ds.source, "tables": {}}
+    for name in TABLES:
+        table = getattr(ds, name)
+        if table is None:
+            continue
+        manifest["tables"][name] = {"rows": len(table), "columns": write(table, out_dir)}
+
+    # Manifest last: a directory without one is an incomplete export
+    (out_dir / MANIFEST).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return manifest
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+class ColumnarStore:
+    """A columnar export on disk; tables are loaded with only the requested columns."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        manifest_path = self.path / MANIFEST
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"No {MANIFEST} in {self.path}; export with write_columnar()")
+        self.manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if self.manifest.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar format version {self.manifest.get('version')}")
+        self.format = self.manifest["format"]
+        if self.format == "parquet" and pq is None:
+            raise RuntimeError("This store is in parquet format, which needs pyarrow")
+
+    def tables(self) -> list[str]:
+        return list(self.manifest["tables"])
+
+    def columns(self, table: str) -> list[str]:
+        return list(self.manifest["tables"][table]["columns"])
+
+    def table(self, name: str, columns: Iterable[str] | None = None) -> Table:
+        spec = self.manifest["tables"][name]["columns"]
+        wanted = list(spec) if columns is None else list(columns)
+        missing = [c for c in wanted if c not in spec]
+        if missing:
+            raise KeyError(f"Table {name!r} has no column(s) {missing}")
+        schema = {c: ("i" if spec[c]["type"] == "int" else None) for c in wanted}
+        if self.format == "parquet":
+            return Table(name, schema, self._read_parquet(name, wanted, schema))
+        return Table(name, schema, {c: self._map_column(spec[c]) for c in wanted})
+
+    def _map_column(self, spec: dict) -> Sequence:
+        files = [self.path / f for f in spec["files"]]
+        if spec["type"] == "int":
+            return _map_npy(files[0], "i")
+        return TextColumn(_map_npy(files[1], "q"), _map_blob(files[0]))
+
+    def _read_parquet(self, name: str, wanted: list[str], schema: dict) -> dict:
+        data = pq.read_table(self.path / f"{name}.parquet", columns=wanted, memory_map=True)
+        return {
+            c: array("i", data.column(c).to_pylist()) if schema[c] else data.column(c).to_pylist()
+            for c in wanted
+        }
+
+    def dataset(
+        self,
+        tables: Iterable[str] | None = None,
+        columns: dict[str, Iterable[str]] | None = None,
+    ) -> Dataset:
+        """
+        Load a Dataset. columns maps table -> the columns to load (all if a table
+        is not listed); tables defaults to the keys of columns, else every table.
+        """
+        columns = columns or {}
+        names = list(tables) if tables is not None else (list(columns) or self.tables())
+        return Dataset(
+            f"columnar:{self.manifest['source']}",
+            {name: self.table(name, columns.get(name)) for name in names},
+        )
+
+
+def load_columnar(
+    path: Path | str,
+    tables: Iterable[str] | None = None,
+    columns: dict[str, Iterable[str]] | None = None,
+) -> Dataset:
+    """Shortcut for ColumnarStore(path).dataset(tables, columns)."""
+    return ColumnarStore(path).dataset(tables, columns)
@@ -0,0 +1,69 @@
+"""
+Column-oriented tables backed by array.array.
+
+Numeric columns are array('i') (4 bytes per value, no per-row Python objects);
+text columns are plain lists of str. Integer columns use 0 for "missing", since
+every ID in the dataset starts at 1.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Iterator
+
+INT = "i"
+TEXT = None
+
+
+class Table:
+    """A named table with a fixed schema: column name -> INT or TEXT."""
+
+    __slots__ = ("name", "schema", "columns", "_indexes")
+
+    def __init__(self, name: str, schema: dict[str, str | None], columns: dict | None = None) -> None:
+        self.name = name
+        self.schema = dict(schema)
+        if columns is None:
+            columns = {col: array(code) if code else [] for col, code in self.schema.items()}
+        self.columns = columns
+        self._indexes: dict = {}
+
+    def __getstate__(self):
+        return self.name, self.schema, self.columns
+
+    def __setstate__(self, state) -> None:
+        self.name, self.schema, self.columns = state
+        self._indexes = {}
+
+    def __len__(self) -> int:
+        first = next(iter(self.columns.values()), ())
+        return len(first)
+
+    def __getitem__(self, column: str):
+        return self.columns[column]
+
+    def __repr__(self) -> str:
+        return f"<Table {self.name} rows={len(self)} columns={list(self.schema)}>"
+
+    def append(self, *values) -> None:
+        """Append one row, values in schema order."""
+        for column, value in zip(self.columns.values(), values):
+            column.append(value)
+        self._indexes.clear()
+
+    def row(self, i: int) -> tuple:
+        return tuple(column[i] for column in self.columns.values())
+
+    def rows(self) -> Iterator[tuple]:
+        return zip(*self.columns.values())
+
+    def index(self, column: str = "id") -> dict:
+        """Return (and cache) a mapping value -> row number; last row wins on duplicates."""
+        idx = self._indexes.get(column)
+        if idx is None:
+            idx = self._indexes[column] = {v: i for i, v in enumerate(self.columns[column])}
+        return idx
+
+    def lookup(self, key, column: str, by: str = "id"):
+        """Return `column` of the row whose `by` column equals key (KeyError if absent)."""
+        return self.columns[column][self.index(by)[key]]
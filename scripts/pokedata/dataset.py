@@ -0,0 +1,119 @@
+"""
+The shared in-memory dataset model and its cached loader.
+
+    from pokedata import load_dataset
+
+    ds = load_dataset("json", units=("pokemon", "trainer", "gym"))
+    pokemon_ids, totals, gym_ids, ownership = ds.battle_inputs()
+
+Every unit (see parsers.UNITS) is cached as a binary snapshot under
+dataset/.cache/, so only units whose source files changed are re-parsed.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable
+
+from .columns import Table
+from .fileio import resolve
+from .parsers import UNITS
+from .snapshot import fingerprint_sources, read_snapshot, write_snapshot
+
+# This package is at: PROJROOT/scripts/pokedata/
+PROJROOT = Path(__file__).resolve().parent.parent.parent
+DATASET_DIR = PROJROOT / "dataset"
+DATA_DIRS = {"json": DATASET_DIR / "json", "csv": DATASET_DIR / "csv"}
+CACHE_DIR = DATASET_DIR / ".cache"
+
+TABLES = (
+    "pokemon", "pokemon_type", "evolution", "trainer", "ownership", "gym", "type", "battle",
+)
+
+
+class Dataset:
+    """Typed, column-oriented view of the Pokémon dataset; unloaded tables are None."""
+
+    __slots__ = ("source",) + TABLES
+
+    def __init__(self, source: str, tables: dict[str, Table]) -> None:
+        self.source = source
+        for name in TABLES:
+            setattr(self, name, tables.get(name))
+
+    def __repr__(self) -> str:
+        loaded = {name: len(getattr(self, name)) for name in TABLES if getattr(self, name) is not None}
+        return f"<Dataset {self.source} {loaded}>"
+
+    def owner_map(self) -> dict[int, int]:
+        """pokemon_id -> trainer_id; if several trainers list the same Pokémon, last one wins."""
+        own = self.ownership
+        return dict(zip(own["pokemon_id"], own["trainer_id"]))
+
+    def battle_inputs(self, as_str: bool = False):
+        """
+        Return (pokemon_ids, totals, gym_ids, ownership) as the battle generators expect.
+
+        as_str=True gives the string IDs used by create_battles_json.
+        """
+        pokemon_ids = list(self.pokemon["id"])
+        totals = dict(zip(self.pokemon["id"], self.pokemon["total"]))
+        gym_ids = list(self.gym["id"])
+        ownership = self.owner_map()
+        if as_str:
+            pokemon_ids = [str(pid) for pid in pokemon_ids]
+            totals = {str(pid): tot for pid, tot in totals.items()}
+            gym_ids = [str(gid) for gid in gym_ids]
+            ownership = {str(pid): str(tid) for pid, tid in ownership.items()}
+        return pokemon_ids, totals, gym_ids, ownership
+
+
+def load_unit(
+    source: str,
+    unit: str,
+    data_dir: Path,
+    cache: bool = True,
+    cache_dir: Path = CACHE_DIR,
+) -> dict[str, Table]:
+    """Load one unit's tables, from its snapshot when the source files are unchanged."""
+    file_names, parser = UNITS[source][unit]
+    sources = {name: resolve(data_dir / name) for name in file_names}
+    snapshot_path = cache_dir / f"{source}-{unit}.snapshot"
+
+    if cache:
+        tables = read_snapshot(snapshot_path, sources)
+        if tables is not None:
+            return tables
+
+    fingerprints = fingerprint_sources(sources) if cache else None
+    tables = parser(data_dir)
+    if cache:
+        write_snapshot(snapshot_path, fingerprints, tables)
+    return tables
+
+
+def load_dataset(
+    source: str = "json",
+    units: Iterable[str] | None = None,
+    data_dir: Path | None = None,
+    cache: bool = True,
+    cache_dir: Path | None = None,
+) -> Dataset:
+    """
+    Load the dataset from the "json" or "csv" files.
+
+    units limits which units are loaded (default: all of pokemon, trainer, gym,
+    type, battle). A data_dir other than the default gets its own cache
+    directory next to it.
+    """
+    if source not in UNITS:
+        raise ValueError(f"Unknown source {source!r} (expected one of {sorted(UNITS)})")
+    if data_dir is None:
+        data_dir = DATA_DIRS[source]
+    if cache_dir is None:
+        cache_dir = CACHE_DIR if data_dir == DATA_DIRS[source] else data_dir / ".cache"
+
+    tables: dict[str, Table] = {}
+    for unit in UNITS[source] if units is None else units:
+        tables.update(load_unit(source, unit, data_dir, cache=cache, cache_dir=cache_dir))
+    return Dataset(source, tables)
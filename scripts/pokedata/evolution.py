@@ -0,0 +1,160 @@
+"""
+Precomputed evolution-chain index.
+
+Built once, in time linear in the number of Pokémon plus evolves_to links, it
+maps every Pokémon to:
+
+- root:      the first form of its chain (nobody evolves into it)
+- depth:     0 for the root, 1 for its evolution, ...
+- members:   every Pokémon of the chain (keyed by root)
+- terminals: the forms of the chain that do not evolve further (keyed by root)
+
+It backs queries 6, 11 and 15 of mongodb_queries.js (chain-level sums, maximum
+evolutions, base -> max improvement) and supports the "remove a middle
+evolution" command of commands.cypher section 3 as an incremental update.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Callable, Iterable
+
+from .dataset import Dataset
+
+
+class EvolutionIndex:
+    """Evolution forest over the Pokémon IDs (each Pokémon has at most one parent)."""
+
+    __slots__ = ("parent", "children", "root", "depth", "members", "terminals")
+
+    def __init__(self, pokemon_ids: Iterable[int], edges: Iterable[tuple[int, int]]) -> None:
+        self.parent: dict[int, int] = {}
+        self.children: dict[int, list[int]] = {}
+        nodes = list(pokemon_ids)
+        for src, dst in edges:
+            self.parent[dst] = src
+            self.children.setdefault(src, []).append(dst)
+
+        known = set(nodes)
+        for src, dst in self.parent.items():
+            for pid in (src, dst):
+                if pid not in known:
+                    known.add(pid)
+                    nodes.append(pid)
+
+        self.root: dict[int, int] = {}
+        self.depth: dict[int, int] = {}
+        self.members: dict[int, set[int]] = {}
+        self.terminals: dict[int, set[int]] = {}
+
+        # BFS from every root; each node and edge is visited once
+        for start in nodes:
+            if start in self.parent:
+                continue
+            self._walk(start, start, 0)
+
+        # Nodes on a cycle have no root; make each its own single-member chain
+        for pid in nodes:
+            if pid not in self.root:
+                self.root[pid] = pid
+                self.depth[pid] = 0
+                self.members[pid] = {pid}
+                self.terminals[pid] = {pid}
+
+    @classmethod
+    def from_dataset(cls, ds: Dataset) -> "EvolutionIndex":
+        ev = ds.evolution
+        return cls(ds.pokemon["id"], zip(ev["from_id"], ev["to_id"]))
+
+    def _walk(self, start: int, root: int, depth: int) -> None:
+        members = self.members.setdefault(root, set())
+        terminals = self.terminals.setdefault(root, set())
+        queue = deque([(start, depth)])
+        while queue:
+            pid, d = queue.popleft()
+            self.root[pid] = root
+            self.depth[pid] = d
+            members.add(pid)
+            kids = self.children.get(pid)
+            if kids:
+                queue.extend((kid, d + 1) for kid in kids)
+            else:
+                terminals.add(pid)
+
+    def __contains__(self, pid: int) -> bool:
+        return pid in self.root
+
+    def __len__(self) -> int:
+        return len(self.root)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def roots(self) -> list[int]:
+        return list(self.members)
+
+    def chain(self, pid: int) -> set[int]:
+        """Every Pokémon in pid's chain."""
+        return self.members[self.root[pid]]
+
+    def terminal_forms(self, pid: int) -> set[int]:
+        """The forms of pid's chain that do not evolve further."""
+        return self.terminals[self.root[pid]]
+
+    def is_max_evolution(self, pid: int) -> bool:
+        return not self.children.get(pid)
+
+    def count_max_evolution(self) -> int:
+        return sum(1 for pid in self.root if not self.children.get(pid))
+
+    def aggregate(self, values: dict[int, int], combine: Callable = sum) -> dict[int, int]:
+        """Combine per-Pokémon values over each chain: {root: combine(values of members)}."""
+        grouped: dict[int, list[int]] = {}
+        for pid, value in values.items():
+            root = self.root.get(pid)
+            if root is not None:
+                grouped.setdefault(root, []).append(value)
+        return {root: combine(vals) for root, vals in grouped.items()}
+
+    def sum_by_chain(self, values: dict[int, int]) -> dict[int, int]:
+        return self.aggregate(values, sum)
+
+    def max_by_chain(self, values: dict[int, int]) -> dict[int, int]:
+        return self.aggregate(values, max)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def remove_middle(self, mid: int) -> bool:
+        """
+        Remove a middle evolution and link its parent to its evolutions.
+
+        Mirrors commands.cypher section 3. Only mid's descendants are touched
+        (their depth drops by one). Returns False, changing nothing, if mid is
+        not a middle evolution (no parent or no evolution).
+        """
+        base = self.parent.get(mid)
+        kids = self.children.get(mid)
+        if base is None or not kids:
+            return False
+
+        siblings = self.children[base]
+        siblings.remove(mid)
+        for kid in kids:
+            self.parent[kid] = base
+            siblings.append(kid)
+        del self.parent[mid]
+        del self.children[mid]
+
+        stack = list(kids)
+        while stack:
+            pid = stack.pop()
+            self.depth[pid] -= 1
+            stack.extend(self.children.get(pid, ()))
+
+        root = self.root.pop(mid)
+        del self.depth[mid]
+        self.members[root].discard(mid)
+        return True
@@ -0,0 +1,87 @@
+"""
+Transparent compressed file I/O, chosen by extension.
+
+    .gz   gzip (stdlib), level 6, header without a timestamp
+    .xz   lzma (stdlib), preset 6
+    .zst  zstandard (optional: pip install zstandard), level 3
+
+open_text() and open_binary() stream through the codec of the path's last
+suffix and fall back to plain open() for anything else, so every loader and
+writer takes "battles.json.gz" wherever it takes "battles.json". Compressed
+output is byte-for-byte reproducible, so pipeline.py content hashes stay
+stable across runs.
+
+resolve() lets loaders keep their fixed file names: when dataset/json/pokemon.json
+is absent it returns the first existing pokemon.json.gz / .xz / .zst.
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import lzma
+from pathlib import Path
+from typing import IO
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for .zst files
+    zstandard = None
+
+COMPRESSED_SUFFIXES = (".gz", ".xz", ".zst")
+
+GZIP_LEVEL = 6
+XZ_PRESET = 6
+ZSTD_LEVEL = 3
+
+
+def compression(path: Path) -> str | None:
+    """"gz", "xz", "zst" or None, from the path's last suffix."""
+    suffix = Path(path).suffix.lower()
+    return suffix[1:] if suffix in COMPRESSED_SUFFIXES else None
+
+
+def resolve(path: Path) -> Path:
+    """path if it exists, else its first existing compressed variant, else path unchanged."""
+    path = Path(path)
+    if path.exists() or compression(path):
+        return path
+    for suffix in COMPRESSED_SUFFIXES:
+        candidate = path.with_name(path.name + suffix)
+        if candidate.exists():
+            return candidate
+    return path
+
+
+def _zstd():
+    if zstandard is None:
+        raise RuntimeError("Reading or writing .zst files requires zstandard (pip install zstandard)")
+    return zstandard
+
+
+def open_binary(path: Path, mode: str = "rb") -> IO[bytes]:
+    """Open path for binary streaming ("rb", "wb" or "ab"), decompressing or compressing by extension."""
+    path = Path(path)
+    codec = compression(path)
+    mode = mode if "b" in mode else mode + "b"
+    if codec == "gz":
+        if "r" in mode:
+            return gzip.open(path, mode)
+        # mtime=0 keeps the header, and so the bytes, reproducible
+        return gzip.GzipFile(path, mode, compresslevel=GZIP_LEVEL, mtime=0)
+    if codec == "xz":
+        return lzma.open(path, mode, preset=None if "r" in mode else XZ_PRESET)
+    if codec == "zst":
+        zstd = _zstd()
+        if "r" in mode:
+            return zstd.open(path, mode)
+        return zstd.open(path, mode, cctx=zstd.ZstdCompressor(level=ZSTD_LEVEL))
+    return open(path, mode)
+
+
+def open_text(path: Path, mode: str = "r", encoding: str = "utf-8", newline: str | None = None) -> IO[str]:
+    """Text-mode counterpart of open_binary(), like Path.open(mode, encoding=..., newline=...)."""
+    path = Path(path)
+    if compression(path) is None:
+        return path.open(mode, encoding=encoding, newline=newline)
+    return io.TextIOWrapper(open_binary(path, mode.replace("t", "")), encoding=encoding, newline=newline)
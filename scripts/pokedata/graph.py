@@ -0,0 +1,301 @@
+"""
+Compressed-sparse-row (CSR) graph over the Pokémon dataset, without Neo4j.
+
+Every relationship of the Neo4j model (see neo4j_export.py) is stored as a CSR
+adjacency: for relationship R from label A to label B,
+
+    offsets: array('i') of len(A) + 1
+    targets: array('i') of the edge count
+
+so the R-neighbors of node u are targets[offsets[u]:offsets[u + 1]]. Nodes are
+indexed by their integer ID directly (IDs start at 1; slot 0 is unused), and
+both directions of every relationship are kept, so `<-[:R]-` patterns are as
+cheap as `-[:R]->` ones.
+
+Relationships (start label, type, end label), built from the Dataset tables
+that trainer_owns_pokemon.csv, pokemon_evolvesTo_pokemon.csv,
+pokemon_hasType_type.csv, trainer_leads_gym.csv and battle.csv are parsed into:
+
+    (Trainer)-[:OWNS]->(Pokemon)        (Pokemon)-[:EVOLVES_TO]->(Pokemon)
+    (Pokemon)-[:HAS_TYPE]->(Type)       (Trainer)-[:LEADS]->(Gym)
+    (Gym)-[:HOSTS]->(Battle)            (Pokemon)-[:WON]->(Battle)
+    (Trainer)-[:WON]->(Battle)          (Pokemon)-[:FIGHTS_IN]->(Battle)
+    (Trainer)-[:BEAT]->(Trainer)        one edge per battle, winner -> loser
+
+BEAT is not part of the Neo4j model; it makes "who beat whom" paths a plain
+BFS. Neighbor lists keep the input order, so results are deterministic.
+
+    from pokedata import load_dataset
+    from pokedata.graph import Graph
+
+    g = Graph.from_dataset(load_dataset("csv"))
+    wins = g.degrees("Pokemon", "WON", "Battle")           # array indexed by pokemon ID
+    path = g.shortest_path("Trainer", "BEAT", 12, 345)      # [12, ..., 345] or None
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from itertools import accumulate
+from operator import sub
+from typing import Iterable, Iterator
+
+from .dataset import Dataset
+
+LABELS = ("Pokemon", "Trainer", "Gym", "Type", "Battle")
+
+# (start label, type, end label) -> [(table, start column, end column)]
+RELATIONSHIPS: dict[tuple[str, str, str], list[tuple[str, str, str]]] = {
+    ("Trainer", "OWNS", "Pokemon"): [("ownership", "trainer_id", "pokemon_id")],
+    ("Pokemon", "EVOLVES_TO", "Pokemon"): [("evolution", "from_id", "to_id")],
+    ("Pokemon", "HAS_TYPE", "Type"): [("pokemon_type", "pokemon_id", "type_id")],
+    ("Trainer", "LEADS", "Gym"): [("trainer", "id", "leads")],
+    ("Gym", "HOSTS", "Battle"): [("battle", "gym_id", "id")],
+    ("Pokemon", "WON", "Battle"): [("battle", "winner_pokemon", "id")],
+    ("Trainer", "WON", "Battle"): [("battle", "winner_trainer", "id")],
+    ("Pokemon", "FIGHTS_IN", "Battle"): [("battle", "winner_pokemon", "id"), ("battle", "loser_pokemon", "id")],
+    ("Trainer", "BEAT", "Trainer"): [("battle", "winner_trainer", "loser_trainer")],
+}
+
+# label -> (table, column) holding the node IDs
+NODE_TABLES = {
+    "Pokemon": ("pokemon", "id"),
+    "Trainer": ("trainer", "id"),
+    "Gym": ("gym", "id"),
+    "Type": ("type", "id"),
+    "Battle": ("battle", "id"),
+}
+
+
+# ---------------------------------------------------------------------------
+# CSR
+# ---------------------------------------------------------------------------
+
+
+class CSR:
+    """One direction of one relationship: n source slots, neighbors as a flat array."""
+
+    __slots__ = ("offsets", "targets")
+
+    def __init__(self, offsets: array, targets: array) -> None:
+        if not offsets or offsets[-1] != len(targets):
+            raise ValueError("offsets must end with the number of targets")
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def from_edges(cls, n: int, sources: Iterable[int], targets: Iterable[int]) -> "CSR":
+        """Group the edges sources[i] -> targets[i] by source; 0 <= source < n."""
+        src = array("i", sources)
+        dst = array("i", targets)
+        if len(src) != len(dst):
+            raise ValueError("sources and targets differ in length")
+        if src and (min(src) < 0 or max(src) >= n):
+            raise ValueError(f"edge source out of range 0..{n - 1}")
+        counts = Counter(src)
+        offsets = array("i", accumulate(map(counts.__getitem__, range(n)), initial=0))
+        # A stable sort by source keeps each neighbor list in input order
+        order = sorted(range(len(src)), key=src.__getitem__)
+        return cls(offsets, array("i", map(dst.__getitem__, order)))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def neighbors(self, u: int) -> array:
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+    def degree(self, u: int) -> int:
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def degrees(self) -> array:
+        """Out-degree of every node, as one array."""
+        offsets = self.offsets
+        return array("i", map(sub, offsets[1:], offsets[:-1]))
+
+    def edges(self) -> Iterator[tuple[int, int]]:
+        offsets, targets = self.offsets, self.targets
+        for u in range(len(self)):
+            for v in targets[offsets[u]:offsets[u + 1]]:
+                yield u, v
+
+    def gather_sum(self, values) -> array:
+        """result[u] = sum(values[v] for v in neighbors(u)), for every u."""
+        offsets, targets, get = self.offsets, self.targets, values.__getitem__
+        return array("i", (
+            sum(map(get, targets[offsets[u]:offsets[u + 1]])) for u in range(len(self))
+        ))
+
+    def gather_max(self, values, default: int = 0) -> array:
+        """result[u] = max(values[v] for v in neighbors(u)), default for no neighbors."""
+        offsets, targets, get = self.offsets, self.targets, values.__getitem__
+        return array("i", (
+            max(map(get, targets[offsets[u]:offsets[u + 1]]), default=default) for u in range(len(self))
+        ))
+
+    def two_hop(self, then: "CSR", u: int) -> set[int]:
+        """Distinct w with u -self-> v -then-> w."""
+        out: set[int] = set()
+        offsets, targets = then.offsets, then.targets
+        for v in self.neighbors(u):
+            out.update(targets[offsets[v]:offsets[v + 1]])
+        return out
+
+    def bfs(self, sources: Iterable[int], max_depth: int | None = None) -> array:
+        """Hop distance from the nearest source to every node; -1 if unreachable."""
+        dist = array("i", [-1]) * len(self)
+        frontier = []
+        for s in sources:
+            if dist[s] < 0:
+                dist[s] = 0
+                frontier.append(s)
+        offsets, targets = self.offsets, self.targets
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            nxt = []
+            for u in frontier:
+                for v in targets[offsets[u]:offsets[u + 1]]:
+                    if dist[v] < 0:
+                        dist[v] = depth
+                        nxt.append(v)
+            frontier = nxt
+        return dist
+
+    def reachable(self, source: int) -> list[int]:
+        """Nodes reachable from source in 0 or more hops (`-[:R*0..]->`), in BFS order."""
+        seen = {source}
+        order = [source]
+        offsets, targets = self.offsets, self.targets
+        for u in order:
+            for v in targets[offsets[u]:offsets[u + 1]]:
+                if v not in seen:
+                    seen.add(v)
+                    order.append(v)
+        return order
+
+    def shortest_path(self, source: int, target: int) -> list[int] | None:
+        """Fewest-hop path [source, ..., target], or None; stops as soon as target is reached."""
+        if source == target:
+            return [source]
+        parent = {source: source}
+        frontier = [source]
+        offsets, targets = self.offsets, self.targets
+        while frontier:
+            nxt = []
+            for u in frontier:
+                for v in targets[offsets[u]:offsets[u + 1]]:
+                    if v in parent:
+                        continue
+                    parent[v] = u
+                    if v == target:
+                        path = [v]
+                        while v != source:
+                            v = parent[v]
+                            path.append(v)
+                        return path[::-1]
+                    nxt.append(v)
+            frontier = nxt
+        return None
+
+
+# ---------------------------------------------------------------------------
+# GRAPH
+# ---------------------------------------------------------------------------
+
+
+class Graph:
+    """Typed multigraph: one CSR pair (forward, reverse) per relationship."""
+
+    __slots__ = ("sizes", "present", "forward", "reverse")
+
+    def __init__(
+        self,
+        node_ids: dict[str, Iterable[int]],
+        edges: dict[tuple[str, str, str], tuple[Iterable[int], Iterable[int]]],
+    ) -> None:
+        node_ids = {label: array("i", node_ids.get(label, ())) for label in LABELS}
+        edges = {key: (array("i", s), array("i", t)) for key, (s, t) in edges.items()}
+
+        top = {label: max(ids, default=0) for label, ids in node_ids.items()}
+        for (start, _rel, end), (src, dst) in edges.items():
+            top[start] = max(top[start], max(src, default=0))
+            top[end] = max(top[end], max(dst, default=0))
+        self.sizes = {label: top[label] + 1 for label in LABELS}
+
+        # present[label][id] is 1 for IDs that have a node row
+        self.present: dict[str, bytearray] = {}
+        for label, ids in node_ids.items():
+            flags = bytearray(self.sizes[label])
+            for nid in ids:
+                flags[nid] = 1
+            self.present[label] = flags
+
+        self.forward: dict[tuple[str, str, str], CSR] = {}
+        self.reverse: dict[tuple[str, str, str], CSR] = {}
+        for key, (src, dst) in edges.items():
+            start, _rel, end = key
+            self.forward[key] = CSR.from_edges(self.sizes[start], src, dst)
+            self.reverse[key] = CSR.from_edges(self.sizes[end], dst, src)
+
+    @classmethod
+    def from_dataset(cls, ds: Dataset) -> "Graph":
+        node_ids = {}
+        for label, (table_name, column) in NODE_TABLES.items():
+            table = getattr(ds, table_name)
+            if table is not None:
+                node_ids[label] = table[column]
+
+        edges = {}
+        for key, sources in RELATIONSHIPS.items():
+            src, dst = array("i"), array("i")
+            for table_name, start_col, end_col in sources:
+                table = getattr(ds, table_name)
+                if table is None:
+                    break
+                # 0 is "missing" (no leader, unknown loser trainer, ...): no edge
+                for s, t in zip(table[start_col], table[end_col]):
+                    if s and t:
+                        src.append(s)
+                        dst.append(t)
+            else:
+                edges[key] = (src, dst)
+        return cls(node_ids, edges)
+
+    def __repr__(self) -> str:
+        nodes = {label: sum(flags) for label, flags in self.present.items()}
+        edges = {f"{s}-{r}->{e}": csr.edge_count for (s, r, e), csr in self.forward.items()}
+        return f"<Graph nodes={nodes} edges={edges}>"
+
+    def rel(self, start: str, rel_type: str, end: str, reverse: bool = False) -> CSR:
+        """CSR of (start)-[:rel_type]->(end), or of its reverse (end)<-(start)."""
+        key = (start, rel_type, end)
+        table = self.reverse if reverse else self.forward
+        if key not in table:
+            raise KeyError(f"no relationship ({start})-[:{rel_type}]->({end}) in this graph")
+        return table[key]
+
+    def nodes(self, label: str) -> list[int]:
+        """IDs of every node of label, ascending."""
+        return [nid for nid, flag in enumerate(self.present[label]) if flag]
+
+    def neighbors(self, start: str, rel_type: str, end: str, u: int, reverse: bool = False) -> array:
+        csr = self.rel(start, rel_type, end, reverse)
+        return csr.neighbors(u) if 0 <= u < len(csr) else array("i")
+
+    def degrees(self, start: str, rel_type: str, end: str, reverse: bool = False) -> array:
+        return self.rel(start, rel_type, end, reverse).degrees()
+
+    def bfs(self, label: str, rel_type: str, sources: Iterable[int], max_depth: int | None = None) -> array:
+        """Hop distances over a label -> same-label relationship (EVOLVES_TO, BEAT)."""
+        return self.rel(label, rel_type, label).bfs(sources, max_depth)
+
+    def shortest_path(self, label: str, rel_type: str, source: int, target: int) -> list[int] | None:
+        csr = self.rel(label, rel_type, label)
+        if not (0 <= source < len(csr) and 0 <= target < len(csr)):
+            return None
+        return csr.shortest_path(source, target)
@@ -0,0 +1,271 @@
+"""
+The dataset/cypher/pokemon_neo4j_queries.cypher query pack, on the CSR graph.
+
+Each query takes a Graph (pokedata/graph.py) and the Dataset it was built from,
+for the node properties, and returns a list of dicts with the Cypher RETURN
+aliases as field names. Pattern matches are walks over the CSR adjacencies and
+count(...) aggregations are degree arrays, so the whole pack runs in
+milliseconds on the shipped data.
+
+The graph semantics differ from the Mongo pack (pokedata/queries.py) where the
+Cypher does: query 1 ranks the Pokémon a trainer OWNS (wins may be 0), query 6
+lists every Pokémon with the wins of its EVOLVES_TO*0.. descendants, and query
+10 counts DISTINCT battles per type, so a battle between two Water Pokémon is
+one Water fight. Ties that Cypher leaves to ORDER BY are broken by lowest ID.
+The commented-out gym specialization query is skipped.
+
+    from pokedata import load_dataset
+    from pokedata.graph import Graph
+    from pokedata.graph_queries import GRAPH_QUERIES
+
+    ds = load_dataset("csv")
+    g = Graph.from_dataset(ds)
+    rows = GRAPH_QUERIES[3](g, ds)   # [{"trainer": ..., "wins": ...}]
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+from .dataset import Dataset
+from .graph import Graph
+
+OWNS = ("Trainer", "OWNS", "Pokemon")
+EVOLVES_TO = ("Pokemon", "EVOLVES_TO", "Pokemon")
+HAS_TYPE = ("Pokemon", "HAS_TYPE", "Type")
+HOSTS = ("Gym", "HOSTS", "Battle")
+POKEMON_WON = ("Pokemon", "WON", "Battle")
+TRAINER_WON = ("Trainer", "WON", "Battle")
+FIGHTS_IN = ("Pokemon", "FIGHTS_IN", "Battle")
+
+# ---------------------------------------------------------------------------
+# HELPERS
+# ---------------------------------------------------------------------------
+
+
+def _names(table) -> dict[int, str]:
+    return dict(zip(table["id"], table["name"]))
+
+
+def _top(degrees, candidates) -> tuple[int, int] | None:
+    """(node, degree) with the highest degree among candidates, lowest ID on ties."""
+    best = None
+    for u in candidates:
+        d = degrees[u]
+        if best is None or d > best[1]:
+            best = (u, d)
+    return best
+
+
+def _totals(g: Graph, ds: Dataset) -> list[int]:
+    """Pokémon total indexed by ID (0 for IDs without a node)."""
+    totals = [0] * g.sizes["Pokemon"]
+    for pid, total in zip(ds.pokemon["id"], ds.pokemon["total"]):
+        totals[pid] = total
+    return totals
+
+
+# ---------------------------------------------------------------------------
+# QUERIES
+# ---------------------------------------------------------------------------
+
+
+def q01_top_pokemon_per_trainer(g: Graph, ds: Dataset) -> list[dict]:
+    """1. For each trainer, their most successful Pokémon (among those it OWNS)."""
+    owns = g.rel(*OWNS)
+    wins = g.degrees(*POKEMON_WON)
+    trainers, pokemon = _names(ds.trainer), _names(ds.pokemon)
+    out = []
+    for tid in g.nodes("Trainer"):
+        owned = sorted(pid for pid in owns.neighbors(tid) if g.present["Pokemon"][pid])
+        top = _top(wins, owned)
+        if top is not None:
+            out.append({"trainer": trainers[tid], "pokemon": pokemon[top[0]], "wins": top[1]})
+    return sorted(out, key=lambda r: r["trainer"])
+
+
+def q02_top_gym_per_trainer(g: Graph, ds: Dataset) -> list[dict]:
+    """2. For each trainer, the gym where they won the most battles."""
+    won = g.rel(*TRAINER_WON)
+    host_of = g.rel(*HOSTS, reverse=True)
+    trainers, gyms = _names(ds.trainer), _names(ds.gym)
+    out = []
+    for tid in g.nodes("Trainer"):
+        counts: dict[int, int] = {}
+        for bid in won.neighbors(tid):
+            for gid in host_of.neighbors(bid):
+                counts[gid] = counts.get(gid, 0) + 1
+        top = _top(counts, sorted(gid for gid in counts if gid in gyms))
+        if top is not None:
+            out.append({"trainer": trainers[tid], "gym": gyms[top[0]], "wins": top[1]})
+    return sorted(out, key=lambda r: r["trainer"])
+
+
+def q03_most_winning_trainer(g: Graph, ds: Dataset) -> list[dict]:
+    """3. Most winning trainer."""
+    top = _top(g.degrees(*TRAINER_WON), g.nodes("Trainer"))
+    if top is None or top[1] == 0:
+        return []
+    return [{"trainer": _names(ds.trainer)[top[0]], "wins": top[1]}]
+
+
+def q04_most_winning_pokemon(g: Graph, ds: Dataset) -> list[dict]:
+    """4. Most winning Pokémon."""
+    top = _top(g.degrees(*POKEMON_WON), g.nodes("Pokemon"))
+    if top is None or top[1] == 0:
+        return []
+    return [{"pokemon": _names(ds.pokemon)[top[0]], "wins": top[1]}]
+
+
+def q05_most_winning_union(g: Graph, ds: Dataset) -> list[dict]:
+    """5. Most winning trainer UNION ALL most winning Pokémon."""
+    out = [{"kind": "trainer", "name": r["trainer"], "wins": r["wins"]} for r in q03_most_winning_trainer(g, ds)]
+    out += [{"kind": "pokemon", "name": r["pokemon"], "wins": r["wins"]} for r in q04_most_winning_pokemon(g, ds)]
+    return out
+
+
+def q06_wins_per_evolution_chain(g: Graph, ds: Dataset) -> list[dict]:
+    """6. Wins for each Pokémon and its evolutions (EVOLVES_TO*0..)."""
+    evolves = g.rel(*EVOLVES_TO)
+    wins = g.degrees(*POKEMON_WON)
+    pokemon = _names(ds.pokemon)
+    # Every battle has one winner, so summing degrees over distinct nodes counts distinct battles
+    out = [
+        {"rootPokemon": pokemon[pid], "wins_in_chain": sum(wins[v] for v in evolves.reachable(pid))}
+        for pid in g.nodes("Pokemon")
+    ]
+    return sorted(out, key=lambda r: (-r["wins_in_chain"], r["rootPokemon"]))
+
+
+def q07_busiest_gym(g: Graph, ds: Dataset) -> list[dict]:
+    """7. Gym that hosted the highest number of battles."""
+    top = _top(g.degrees(*HOSTS), g.nodes("Gym"))
+    if top is None or top[1] == 0:
+        return []
+    return [{"gym": _names(ds.gym)[top[0]], "hosted": top[1]}]
+
+
+def q08_distinct_fighters_per_gym(g: Graph, ds: Dataset) -> list[dict]:
+    """8. For each gym, the number of distinct Pokémon that fought there."""
+    hosts = g.rel(*HOSTS)
+    fighters_of = g.rel(*FIGHTS_IN, reverse=True)
+    gyms = _names(ds.gym)
+    out = []
+    for gid in g.nodes("Gym"):
+        fighters = hosts.two_hop(fighters_of, gid)
+        if fighters:
+            out.append({"gym": gyms[gid], "fighters": len(fighters)})
+    return sorted(out, key=lambda r: (-r["fighters"], r["gym"]))
+
+
+def q09_pokemon_most_gyms(g: Graph, ds: Dataset) -> list[dict]:
+    """9. Pokémon that fought in the most different gyms (top 10)."""
+    fights = g.rel(*FIGHTS_IN)
+    host_of = g.rel(*HOSTS, reverse=True)
+    counts = [(len(fights.two_hop(host_of, pid)), pid) for pid in g.nodes("Pokemon") if fights.degree(pid)]
+    ranked = sorted(counts, key=lambda x: (-x[0], x[1]))[:10]
+    pokemon = _names(ds.pokemon)
+    return [{"pokemon": pokemon[pid], "gymCount": n} for n, pid in ranked]
+
+
+def q10_best_type_win_ratio(g: Graph, ds: Dataset) -> list[dict]:
+    """10. Pokémon type with the best winning ratio (top 5)."""
+    members = g.rel(*HAS_TYPE, reverse=True)
+    fights, won = g.rel(*FIGHTS_IN), g.rel(*POKEMON_WON)
+    rows = []
+    for tid in g.nodes("Type"):
+        fought = members.two_hop(fights, tid)
+        if fought:
+            wins = len(members.two_hop(won, tid))
+            rows.append((wins / len(fought), tid, wins, len(fought)))
+    rows.sort(key=lambda r: (-r[0], r[1]))
+    types = _names(ds.type)
+    return [
+        {"type": types[tid], "winRatio": round(ratio, 3), "wins": wins, "fights": n}
+        for ratio, tid, wins, n in rows[:5]
+    ]
+
+
+def q11_max_evolution_count(g: Graph, ds: Dataset) -> list[dict]:
+    """11. Number of Pokémon that are at maximum evolution (no outgoing EVOLVES_TO)."""
+    evolves = g.degrees(*EVOLVES_TO)
+    return [{"numMaxEvolution": sum(1 for pid in g.nodes("Pokemon") if evolves[pid] == 0)}]
+
+
+def q12_most_powerful(g: Graph, ds: Dataset) -> list[dict]:
+    """12. Most powerful Pokémon (by total), top 10."""
+    totals = _totals(g, ds)
+    ranked = sorted(g.nodes("Pokemon"), key=lambda pid: -totals[pid])[:10]
+    pokemon = _names(ds.pokemon)
+    return [{"pokemon": pokemon[pid], "totalScore": totals[pid]} for pid in ranked]
+
+
+def q13_most_powerful_per_type(g: Graph, ds: Dataset) -> list[dict]:
+    """13. Most powerful Pokémon for each type."""
+    members = g.rel(*HAS_TYPE, reverse=True)
+    totals = _totals(g, ds)
+    present = g.present["Pokemon"]
+    types, pokemon = _names(ds.type), _names(ds.pokemon)
+    out = []
+    for tid in g.nodes("Type"):
+        top = _top(totals, sorted(pid for pid in members.neighbors(tid) if present[pid]))
+        if top is not None:
+            out.append({"type": types[tid], "pokemon": pokemon[top[0]], "total": top[1]})
+    return sorted(out, key=lambda r: r["type"])
+
+
+def q14_water_pokemon(g: Graph, ds: Dataset, type_name: str = "Water") -> list[dict]:
+    """14. Group all Pokémon of type Water."""
+    members = g.rel(*HAS_TYPE, reverse=True)
+    present = g.present["Pokemon"]
+    pokemon = _names(ds.pokemon)
+    out = [
+        {"pokemon": pokemon[pid]}
+        for tid, name in zip(ds.type["id"], ds.type["name"])
+        if name == type_name
+        for pid in members.neighbors(tid)
+        if present[pid]
+    ]
+    return sorted(out, key=lambda r: r["pokemon"])
+
+
+def q15_best_evolution_improvement(g: Graph, ds: Dataset) -> list[dict]:
+    """15. Highest improvement (Total) from base → max evolution, top 20."""
+    evolves = g.rel(*EVOLVES_TO)
+    parents = g.degrees(*EVOLVES_TO, reverse=True)
+    totals = _totals(g, ds)
+    rows = []
+    for pid in g.nodes("Pokemon"):
+        if parents[pid]:
+            continue
+        best = max(totals[v] for v in evolves.reachable(pid))
+        rows.append((best - totals[pid], pid, best))
+    rows.sort(key=lambda r: (-r[0], r[1]))
+    pokemon = _names(ds.pokemon)
+    return [
+        {"basePokemon": pokemon[pid], "baseTotal": totals[pid], "maxDescTotal": best, "improvement": imp}
+        for imp, pid, best in rows[:20]
+    ]
+
+
+GRAPH_QUERIES: dict[int, Callable[[Graph, Dataset], list[dict]]] = {
+    1: q01_top_pokemon_per_trainer,
+    2: q02_top_gym_per_trainer,
+    3: q03_most_winning_trainer,
+    4: q04_most_winning_pokemon,
+    5: q05_most_winning_union,
+    6: q06_wins_per_evolution_chain,
+    7: q07_busiest_gym,
+    8: q08_distinct_fighters_per_gym,
+    9: q09_pokemon_most_gyms,
+    10: q10_best_type_win_ratio,
+    11: q11_max_evolution_count,
+    12: q12_most_powerful,
+    13: q13_most_powerful_per_type,
+    14: q14_water_pokemon,
+    15: q15_best_evolution_improvement,
+}
+
+
+def run_all(g: Graph, ds: Dataset) -> dict[int, list[dict]]:
+    return {number: query(g, ds) for number, query in GRAPH_QUERIES.items()}
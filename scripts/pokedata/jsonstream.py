@@ -0,0 +1,133 @@
+"""
+Incremental reader for files holding one large JSON array (or NDJSON).
+
+json.load() builds the whole document tree before a loader can keep the two
+fields it needs from each element. iter_json_array() reads the file in chunks
+and decodes one top-level element at a time with JSONDecoder.raw_decode, so
+only the current element (plus one read buffer) is alive at any moment:
+
+    with path.open(encoding="utf-8") as f:
+        for doc in iter_json_array(f, fields=("_id", "owns")):
+            ...
+
+fields projects every object element onto those keys (absent keys are left
+out), so the rest of each document is dropped as soon as it is decoded.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+
+from .fileio import open_text, resolve
+
+CHUNK_SIZE = 1 << 16
+
+_SPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = frozenset(" \t\n\r,]")
+_NEXT = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+
+
+def _project(doc, fields: tuple[str, ...] | None):
+    if fields is None or not isinstance(doc, dict):
+        return doc
+    return {k: doc[k] for k in fields if k in doc}
+
+
+def iter_json_array(
+    f: IO[str],
+    fields: Iterable[str] | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator:
+    """Yield the elements of the JSON array in text file f, one at a time."""
+    fields = tuple(fields) if fields is not None else None
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def more(size: int) -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = f.read(size)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_space() -> None:
+        nonlocal pos
+        while True:
+            pos = _SPACE.match(buf, pos).end()
+            if pos < len(buf) or not more(chunk_size):
+                return
+
+    skip_space()
+    if buf[pos:pos + 1] != "[":
+        raise ValueError("Expected a JSON array")
+    pos += 1
+    skip_space()
+    if buf[pos:pos + 1] == "]":
+        return
+
+    while True:
+        # Decode one element. One cut by the end of the buffer either fails or,
+        # for a number ("12" of "12.5"), is not followed by a delimiter: read more.
+        size = chunk_size
+        while True:
+            try:
+                doc, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if not more(size):
+                    raise
+                size *= 2
+                continue
+            if (end == len(buf) or buf[end] not in _DELIMITERS) and more(size):
+                size *= 2
+                continue
+            break
+        pos = end
+        yield doc if fields is None else _project(doc, fields)
+
+        # Fast path: separator and following blanks are all in the buffer
+        m = _NEXT.match(buf, pos)
+        if m is not None and m.end() < len(buf):
+            if m.group(1) == "]":
+                return
+            pos = m.end()
+            continue
+
+        skip_space()
+        sep = buf[pos:pos + 1]
+        pos += 1
+        if sep == "]":
+            return
+        if sep != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, got {sep!r}")
+        skip_space()
+
+
+def iter_ndjson(f: IO[str], fields: Iterable[str] | None = None) -> Iterator:
+    """Yield one document per non-blank line."""
+    fields = tuple(fields) if fields is not None else None
+    for line in f:
+        if line.strip():
+            yield _project(json.loads(line), fields)
+
+
+def iter_documents(path: Path, fields: Iterable[str] | None = None) -> Iterator:
+    """
+    Stream the documents of a .json array or .ndjson / .jsonl file, optionally
+    compressed (.gz, .xz, .zst; see fileio.py). A missing path is looked up
+    with those extensions appended.
+    """
+    path = resolve(path)
+    suffixes = {s.lower() for s in path.suffixes}
+    with open_text(path) as f:
+        if suffixes & {".ndjson", ".jsonl"}:
+            yield from iter_ndjson(f, fields)
+        else:
+            yield from iter_json_array(f, fields)
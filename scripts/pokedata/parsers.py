@@ -0,0 +1,279 @@
+"""
+Parsers that turn the JSON and CSV source files into Tables.
+
+Both formats produce the same tables with the same integer keys, so consumers
+never need to care which one the data came from. Work is grouped into "units":
+one unit reads a fixed set of source files and fills one or more tables, and
+is the granularity at which snapshots are cached.
+"""
+
+from __future__ import annotations
+
+import csv
+from datetime import date
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .columns import INT, TEXT, Table
+from .fileio import open_text, resolve
+from .jsonstream import iter_documents
+
+# ---------------------------------------------------------------------------
+# SCHEMAS
+# ---------------------------------------------------------------------------
+
+SCHEMAS: dict[str, dict[str, str | None]] = {
+    "pokemon": {
+        "id": INT, "pokedex": INT, "name": TEXT,
+        "hp": INT, "atk": INT, "def": INT, "sp_atk": INT, "sp_def": INT, "total": INT,
+        "evolves_to": INT, "form": TEXT,
+    },
+    "pokemon_type": {"pokemon_id": INT, "type_id": INT},
+    "evolution": {"from_id": INT, "to_id": INT},
+    "trainer": {"id": INT, "name": TEXT, "leads": INT},
+    "ownership": {"pokemon_id": INT, "trainer_id": INT},
+    "gym": {
+        "id": INT, "name": TEXT, "region": TEXT, "type_id": INT,
+        "location": TEXT, "badge_name": TEXT,
+    },
+    "type": {"id": INT, "name": TEXT},
+    # day = date.toordinal() of the battle date
+    "battle": {
+        "id": INT, "day": INT, "gym_id": INT,
+        "winner_pokemon": INT, "winner_trainer": INT,
+        "loser_pokemon": INT, "loser_trainer": INT,
+    },
+}
+
+
+def new_table(name: str) -> Table:
+    return Table(name, SCHEMAS[name])
+
+
+def to_int(value, default: int = 0) -> int:
+    """Parse "318", 318, " 42 " or "b12" (battle IDs) to int; default when missing/malformed."""
+    if value is None:
+        return default
+    text = str(value).strip().lstrip("b")
+    try:
+        return int(text)
+    except ValueError:
+        return default
+
+
+def to_day(value) -> int:
+    """Parse "2025-10-02" or "2025-10-02T10:00:00Z" to a date ordinal (0 when missing)."""
+    if not value:
+        return 0
+    try:
+        return date.fromisoformat(str(value).strip()[:10]).toordinal()
+    except ValueError:
+        return 0
+
+
+def _read_json(path: Path) -> Iterator[dict]:
+    """Stream the elements of a JSON array file (see jsonstream.py); .gz/.xz/.zst variants are found too."""
+    return iter_documents(path)
+
+
+def _read_csv(path: Path) -> list[dict]:
+    with open_text(resolve(path), newline="") as f:
+        return list(csv.DictReader(f))
+
+
+# ---------------------------------------------------------------------------
+# JSON UNITS
+# ---------------------------------------------------------------------------
+
+def parse_json_pokemon(data_dir: Path) -> dict[str, Table]:
+    pokemon, pokemon_type, evolution = (
+        new_table("pokemon"), new_table("pokemon_type"), new_table("evolution")
+    )
+    for entry in _read_json(data_dir / "pokemon.json"):
+        pid = to_int(entry.get("_id"))
+        if not pid:
+            continue
+        stats = entry.get("stats") or {}
+        evolves_to = to_int(entry.get("evolves_to"))
+        pokemon.append(
+            pid, to_int(entry.get("pokedex")), entry.get("name") or "",
+            to_int(stats.get("hp")), to_int(stats.get("atk")), to_int(stats.get("def")),
+            to_int(stats.get("sp_atk")), to_int(stats.get("sp_def")), to_int(stats.get("tot")),
+            evolves_to, entry.get("has_form") or "",
+        )
+        for tid in entry.get("types") or ():
+            pokemon_type.append(pid, to_int(tid))
+        if evolves_to:
+            evolution.append(pid, evolves_to)
+    return {"pokemon": pokemon, "pokemon_type": pokemon_type, "evolution": evolution}
+
+
+def parse_json_trainer(data_dir: Path) -> dict[str, Table]:
+    trainer, ownership = new_table("trainer"), new_table("ownership")
+    for entry in _read_json(data_dir / "trainer.json"):
+        tid = to_int(entry.get("_id"))
+        if not tid:
+            continue
+        trainer.append(tid, entry.get("name") or "", to_int(entry.get("leads")))
+        for pid in entry.get("owns") or ():
+            ownership.append(to_int(pid), tid)
+    return {"trainer": trainer, "ownership": ownership}
+
+
+def parse_json_gym(data_dir: Path) -> dict[str, Table]:
+    gym = new_table("gym")
+    for entry in _read_json(data_dir / "gym.json"):
+        gid = to_int(entry.get("_id"))
+        if not gid:
+            continue
+        gym.append(
+            gid, entry.get("name") or "", entry.get("region") or "", to_int(entry.get("type")),
+            entry.get("location") or "", entry.get("badge_name") or "",
+        )
+    return {"gym": gym}
+
+
+def parse_json_type(data_dir: Path) -> dict[str, Table]:
+    types = new_table("type")
+    for entry in _read_json(data_dir / "type.json"):
+        tid = to_int(entry.get("_id"))
+        if tid:
+            types.append(tid, (entry.get("name") or "").strip())
+    return {"type": types}
+
+
+def parse_json_battle(data_dir: Path) -> dict[str, Table]:
+    battle = new_table("battle")
+    for entry in _read_json(data_dir / "battles.json"):
+        parts = entry.get("participants") or {}
+        winner, loser = parts.get("winner") or {}, parts.get("loser") or {}
+        battle.append(
+            to_int(entry.get("_id")), to_day(entry.get("date")), to_int(entry.get("gym_id")),
+            to_int(winner.get("pokemon_id")), to_int(winner.get("trainer_id")),
+            to_int(loser.get("pokemon_id")), to_int(loser.get("trainer_id")),
+        )
+    return {"battle": battle}
+
+
+# ---------------------------------------------------------------------------
+# CSV UNITS
+# ---------------------------------------------------------------------------
+
+def parse_csv_pokemon(data_dir: Path) -> dict[str, Table]:
+    pokemon, pokemon_type, evolution = (
+        new_table("pokemon"), new_table("pokemon_type"), new_table("evolution")
+    )
+    form_names = {row["id"].strip(): row["form"] for row in _read_csv(data_dir / "form.csv")}
+    forms = {
+        to_int(row["pokemonID"]): form_names.get(row["formID"].strip(), "")
+        for row in _read_csv(data_dir / "pokemon_hasForm_form.csv")
+    }
+    evolves: dict[int, int] = {}
+    for row in _read_csv(data_dir / "pokemon_evolvesTo_pokemon.csv"):
+        src, dst = to_int(row["primitiveID"]), to_int(row["evolvedID"])
+        if src and dst:
+            evolution.append(src, dst)
+            evolves[src] = dst
+
+    for row in _read_csv(data_dir / "pokemon.csv"):
+        pid = to_int(row.get("id"))
+        if not pid:
+            continue
+        pokemon.append(
+            pid, to_int(row.get("number")), row.get("pokename") or "",
+            to_int(row.get("hp")), to_int(row.get("attack")), to_int(row.get("defense")),
+            to_int(row.get("sp_atk")), to_int(row.get("sp_def")), to_int(row.get("total")),
+            evolves.get(pid, 0), forms.get(pid, ""),
+        )
+
+    for row in _read_csv(data_dir / "pokemon_hasType_type.csv"):
+        pokemon_type.append(to_int(row["pokemonID"]), to_int(row["typeID"]))
+    return {"pokemon": pokemon, "pokemon_type": pokemon_type, "evolution": evolution}
+
+
+def parse_csv_trainer(data_dir: Path) -> dict[str, Table]:
+    trainer, ownership = new_table("trainer"), new_table("ownership")
+    leads = {
+        to_int(row["trainer_id"]): to_int(row["gym_id"])
+        for row in _read_csv(data_dir / "trainer_leads_gym.csv")
+    }
+    for row in _read_csv(data_dir / "trainer.csv"):
+        tid = to_int(row.get("trainerID"))
+        if tid:
+            trainer.append(tid, row.get("trainername") or "", leads.get(tid, 0))
+    for row in _read_csv(data_dir / "trainer_owns_pokemon.csv"):
+        tid, pid = to_int(row.get("trainerID")), to_int(row.get("pokename"))
+        if tid and pid:
+            ownership.append(pid, tid)
+    return {"trainer": trainer, "ownership": ownership}
+
+
+def parse_csv_gym(data_dir: Path) -> dict[str, Table]:
+    gym = new_table("gym")
+    for row in _read_csv(data_dir / "gym.csv"):
+        gid = to_int(row.get("gym_id"))
+        if not gid:
+            continue
+        gym.append(
+            gid, row.get("gym_name") or "", row.get("region") or "",
+            to_int(row.get("specialty_type_id")),
+            row.get("location") or "", row.get("badge_name") or "",
+        )
+    return {"gym": gym}
+
+
+def parse_csv_type(data_dir: Path) -> dict[str, Table]:
+    types = new_table("type")
+    for row in _read_csv(data_dir / "type.csv"):
+        tid = to_int(row.get("id"))
+        if tid:
+            types.append(tid, (row.get("name") or "").strip())
+    return {"type": types}
+
+
+def parse_csv_battle(data_dir: Path) -> dict[str, Table]:
+    battle = new_table("battle")
+    # battle.csv has no loser trainer column; recover it from ownership
+    owner = {
+        to_int(row.get("pokename")): to_int(row.get("trainerID"))
+        for row in _read_csv(data_dir / "trainer_owns_pokemon.csv")
+    }
+    for row in _read_csv(data_dir / "battle.csv"):
+        pok1, pok2 = to_int(row.get("pok1_id")), to_int(row.get("pok2_id"))
+        winner = to_int(row.get("pokemon_winner_id"))
+        loser = pok2 if winner == pok1 else pok1
+        battle.append(
+            to_int(row.get("battle_id")), to_day(row.get("date")), to_int(row.get("gym_id")),
+            winner, to_int(row.get("trainer_winner_id")), loser, owner.get(loser, 0),
+        )
+    return {"battle": battle}
+
+
+# ---------------------------------------------------------------------------
+# UNIT REGISTRY
+# ---------------------------------------------------------------------------
+
+# source -> unit -> (source file names, parser)
+UNITS: dict[str, dict[str, tuple[tuple[str, ...], Callable[[Path], dict[str, Table]]]]] = {
+    "json": {
+        "pokemon": (("pokemon.json",), parse_json_pokemon),
+        "trainer": (("trainer.json",), parse_json_trainer),
+        "gym": (("gym.json",), parse_json_gym),
+        "type": (("type.json",), parse_json_type),
+        "battle": (("battles.json",), parse_json_battle),
+    },
+    "csv": {
+        "pokemon": (
+            ("pokemon.csv", "pokemon_hasType_type.csv", "pokemon_evolvesTo_pokemon.csv",
+             "pokemon_hasForm_form.csv", "form.csv"),
+            parse_csv_pokemon,
+        ),
+        "trainer": (
+            ("trainer.csv", "trainer_owns_pokemon.csv", "trainer_leads_gym.csv"),
+            parse_csv_trainer,
+        ),
+        "gym": (("gym.csv",), parse_csv_gym),
+        "type": (("type.csv",), parse_csv_type),
+        "battle": (("battle.csv", "trainer_owns_pokemon.csv"), parse_csv_battle),
+    },
+}
@@ -0,0 +1,283 @@
+"""
+The dataset/mongodb_queries.js query pack, evaluated in-process.
+
+Each query takes a Dataset and returns a list of dicts with the same field
+names the corresponding Mongo pipeline projects. Joins are hash joins on the
+integer keys (dicts built once per query), and group-bys are single passes over
+the battle columns. Stats are compared as integers, so "most powerful" sorts
+numerically rather than lexically as the string-typed Mongo documents do.
+
+Ties that Mongo leaves to $sort/$first order are broken by the lowest ID.
+Queries 6 and 15 are commented out in the .js file because the collections
+have no evolution_line; here they, and query 11, use the EvolutionIndex
+built from the evolves_to links.
+
+    from pokedata import load_dataset
+    from pokedata.queries import QUERIES
+
+    ds = load_dataset("json")
+    rows = QUERIES[3](ds)   # [{"trainer": ..., "wins": ...}]
+"""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from typing import Callable
+
+from .dataset import Dataset
+from .evolution import EvolutionIndex
+
+# ---------------------------------------------------------------------------
+# HELPERS
+# ---------------------------------------------------------------------------
+
+
+def _names(table) -> dict[int, str]:
+    return dict(zip(table["id"], table["name"]))
+
+
+def _top_per_group(counts: Counter) -> dict[int, tuple[int, int]]:
+    """{(group, item): n} -> {group: (item, n)} keeping max n, lowest item on ties."""
+    best: dict[int, tuple[int, int]] = {}
+    for (group, item), n in counts.items():
+        cur = best.get(group)
+        if cur is None or n > cur[1] or (n == cur[1] and item < cur[0]):
+            best[group] = (item, n)
+    return best
+
+
+def _argmax(counts: Counter) -> tuple[int, int] | None:
+    if not counts:
+        return None
+    return min(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+
+
+# ---------------------------------------------------------------------------
+# QUERIES
+# ---------------------------------------------------------------------------
+
+
+def q01_top_pokemon_per_trainer(ds: Dataset) -> list[dict]:
+    """1. For each trainer, their most successful Pokémon."""
+    b = ds.battle
+    counts = Counter(zip(b["winner_trainer"], b["winner_pokemon"]))
+    trainers, pokemon = _names(ds.trainer), _names(ds.pokemon)
+    out = [
+        {"trainer": trainers[tid], "pokemon": pokemon[pid], "wins": wins}
+        for tid, (pid, wins) in _top_per_group(counts).items()
+        if tid in trainers and pid in pokemon
+    ]
+    return sorted(out, key=lambda r: r["trainer"])
+
+
+def q02_top_gym_per_trainer(ds: Dataset) -> list[dict]:
+    """2. For each trainer, the gym where they won the most battles."""
+    b = ds.battle
+    counts = Counter(zip(b["winner_trainer"], b["gym_id"]))
+    trainers, gyms = _names(ds.trainer), _names(ds.gym)
+    out = [
+        {"trainer": trainers[tid], "gym": gyms[gid], "wins": wins}
+        for tid, (gid, wins) in _top_per_group(counts).items()
+        if tid in trainers and gid in gyms
+    ]
+    return sorted(out, key=lambda r: r["trainer"])
+
+
+def q03_most_winning_trainer(ds: Dataset) -> list[dict]:
+    """3. Most winning trainer."""
+    top = _argmax(Counter(ds.battle["winner_trainer"]))
+    trainers = _names(ds.trainer)
+    if top is None or top[0] not in trainers:
+        return []
+    return [{"trainer": trainers[top[0]], "wins": top[1]}]
+
+
+def q04_most_winning_pokemon(ds: Dataset) -> list[dict]:
+    """4. Most winning Pokémon."""
+    top = _argmax(Counter(ds.battle["winner_pokemon"]))
+    pokemon = _names(ds.pokemon)
+    if top is None or top[0] not in pokemon:
+        return []
+    return [{"pokemon_name": pokemon[top[0]], "wins": top[1]}]
+
+
+def q05_most_winning_union(ds: Dataset) -> list[dict]:
+    """5. Most winning trainer + most winning Pokémon (UNION-style)."""
+    out = [{"kind": "trainer", "name": r["trainer"], "wins": r["wins"]}
+           for r in q03_most_winning_trainer(ds)]
+    out += [{"kind": "pokemon", "name": r["pokemon_name"], "wins": r["wins"]}
+            for r in q04_most_winning_pokemon(ds)]
+    return out
+
+
+def q06_wins_per_evolution_chain(ds: Dataset) -> list[dict]:
+    """6. Wins for each Pokémon and its evolutions (sum over evolution chain)."""
+    chain_wins = EvolutionIndex.from_dataset(ds).sum_by_chain(Counter(ds.battle["winner_pokemon"]))
+    pokemon = _names(ds.pokemon)
+    out = [{"rootPokemon": pokemon[root], "wins_in_chain": wins} for root, wins in chain_wins.items()]
+    return sorted(out, key=lambda r: (-r["wins_in_chain"], r["rootPokemon"]))
+
+
+def q07_busiest_gym(ds: Dataset) -> list[dict]:
+    """7. Gym that hosted the highest number of battles."""
+    top = _argmax(Counter(ds.battle["gym_id"]))
+    gyms = _names(ds.gym)
+    if top is None or top[0] not in gyms:
+        return []
+    return [{"gym": gyms[top[0]], "hosted": top[1]}]
+
+
+def q08_distinct_fighters_per_gym(ds: Dataset) -> list[dict]:
+    """8. For each gym, total number of distinct Pokémon that fought there."""
+    b = ds.battle
+    seen: dict[int, set] = defaultdict(set)
+    for gid, w, l in zip(b["gym_id"], b["winner_pokemon"], b["loser_pokemon"]):
+        s = seen[gid]
+        s.add(w)
+        s.add(l)
+    gyms = _names(ds.gym)
+    out = [{"gym": gyms[gid], "fighters": len(s)} for gid, s in seen.items() if gid in gyms]
+    return sorted(out, key=lambda r: (-r["fighters"], r["gym"]))
+
+
+def q09_pokemon_most_gyms(ds: Dataset) -> list[dict]:
+    """9. Pokémon that fought in the most different gyms (top 10)."""
+    b = ds.battle
+    seen: dict[int, set] = defaultdict(set)
+    for gid, w, l in zip(b["gym_id"], b["winner_pokemon"], b["loser_pokemon"]):
+        seen[w].add(gid)
+        seen[l].add(gid)
+    ranked = sorted(((len(s), pid) for pid, s in seen.items()), key=lambda x: (-x[0], x[1]))[:10]
+    pokemon = _names(ds.pokemon)
+    return [{"pokemon": pokemon[pid], "gymCount": n} for n, pid in ranked if pid in pokemon]
+
+
+def q10_best_type_win_ratio(ds: Dataset) -> list[dict]:
+    """10. Pokémon type with the best winning ratio (top 5)."""
+    b = ds.battle
+    wins = Counter(b["winner_pokemon"])
+    fights = Counter(b["loser_pokemon"])
+    fights.update(wins)
+
+    type_wins: Counter = Counter()
+    type_fights: Counter = Counter()
+    pt = ds.pokemon_type
+    for pid, tid in zip(pt["pokemon_id"], pt["type_id"]):
+        if pid in fights:
+            type_wins[tid] += wins[pid]
+            type_fights[tid] += fights[pid]
+
+    ranked = sorted(
+        ((type_wins[t] / n, t) for t, n in type_fights.items() if n > 0),
+        key=lambda x: (-x[0], x[1]),
+    )[:5]
+    types = _names(ds.type)
+    return [
+        {"type": types[t], "winRatio": round(ratio, 3), "wins": type_wins[t], "fights": type_fights[t]}
+        for ratio, t in ranked
+        if t in types
+    ]
+
+
+def q11_max_evolution_count(ds: Dataset) -> list[dict]:
+    """11. Number of Pokémon that are at maximum evolution."""
+    return [{"numMaxEvolution": EvolutionIndex.from_dataset(ds).count_max_evolution()}]
+
+
+def q12_most_powerful(ds: Dataset) -> list[dict]:
+    """12. Most powerful Pokémon (by total), top 10."""
+    p = ds.pokemon
+    rows = sorted(zip(p["total"], p["id"], p["name"], p["form"]), key=lambda r: (-r[0], r[1]))[:10]
+    return [{"name": name, "tot": tot, "form": form or None} for tot, _pid, name, form in rows]
+
+
+def q13_most_powerful_per_type(ds: Dataset) -> list[dict]:
+    """13. Most powerful Pokémon for each type."""
+    p = ds.pokemon
+    row_of = p.index("id")
+    totals, names = p["total"], p["name"]
+    best: dict[int, tuple[int, int]] = {}
+    pt = ds.pokemon_type
+    for pid, tid in zip(pt["pokemon_id"], pt["type_id"]):
+        row = row_of.get(pid)
+        if row is None:
+            continue
+        cur = best.get(tid)
+        if cur is None or totals[row] > totals[cur[0]] or (totals[row] == totals[cur[0]] and pid < cur[1]):
+            best[tid] = (row, pid)
+    types = _names(ds.type)
+    out = [
+        {"type": types[tid], "pokemon": names[row], "total": totals[row]}
+        for tid, (row, _pid) in best.items()
+        if tid in types
+    ]
+    return sorted(out, key=lambda r: r["type"])
+
+
+def q14_water_pokemon(ds: Dataset, type_name: str = "Water") -> list[dict]:
+    """14. Group all Pokémon of type Water."""
+    type_ids = {tid for tid, name in zip(ds.type["id"], ds.type["name"]) if name == type_name}
+    pokemon = _names(ds.pokemon)
+    pt = ds.pokemon_type
+    out = [
+        {"pokemon": pokemon[pid]}
+        for pid, tid in zip(pt["pokemon_id"], pt["type_id"])
+        if tid in type_ids and pid in pokemon
+    ]
+    return sorted(out, key=lambda r: r["pokemon"])
+
+
+def q15_best_evolution_improvement(ds: Dataset) -> list[dict]:
+    """15. Highest improvement (Total) from base → max evolution, top 20."""
+    p = ds.pokemon
+    totals = dict(zip(p["id"], p["total"]))
+    chain_max = EvolutionIndex.from_dataset(ds).max_by_chain(totals)
+
+    names = _names(ds.pokemon)
+    rows = [(chain_max[pid] - totals[pid], pid) for pid in chain_max if pid in totals]
+    rows.sort(key=lambda r: (-r[0], r[1]))
+    return [
+        {
+            "basePokemon": names[pid],
+            "baseTotal": totals[pid],
+            "maxDescTotal": chain_max[pid],
+            "improvement": imp,
+        }
+        for imp, pid in rows[:20]
+    ]
+
+
+def q16_gym_specialization(ds: Dataset) -> list[dict]:
+    """16. Gyms and their type specialization."""
+    types = _names(ds.type)
+    g = ds.gym
+    out = [
+        {"gym": name, "specializesIn": types[tid]}
+        for name, tid in zip(g["name"], g["type_id"])
+        if tid in types
+    ]
+    return sorted(out, key=lambda r: (r["gym"], r["specializesIn"]))
+
+
+QUERIES: dict[int, Callable[[Dataset], list[dict]]] = {
+    1: q01_top_pokemon_per_trainer,
+    2: q02_top_gym_per_trainer,
+    3: q03_most_winning_trainer,
+    4: q04_most_winning_pokemon,
+    5: q05_most_winning_union,
+    6: q06_wins_per_evolution_chain,
+    7: q07_busiest_gym,
+    8: q08_distinct_fighters_per_gym,
+    9: q09_pokemon_most_gyms,
+    10: q10_best_type_win_ratio,
+    11: q11_max_evolution_count,
+    12: q12_most_powerful,
+    13: q13_most_powerful_per_type,
+    14: q14_water_pokemon,
+    15: q15_best_evolution_improvement,
+    16: q16_gym_specialization,
+}
+
+
+def run_all(ds: Dataset) -> dict[int, list[dict]]:
+    return {number: query(ds) for number, query in QUERIES.items()}
@@ -0,0 +1,305 @@
+"""
+Streaming Elo / Glicko ratings for trainers and Pokémon.
+
+Ratings replace raw win counts as the ranking behind queries 3 and 4 of
+mongodb_queries.js and the weakest gym leader of commands.cypher section 4.
+Each battle is applied once, in date order, in O(1):
+
+- elo:    r += K * (score - expected)
+- glicko: Glicko-1 with every battle as its own rating period; a player's
+          rating deviation (RD) first grows with the days since their last
+          battle (RD = min(sqrt(RD^2 + c^2 * days), 350)) and then shrinks
+          with the result
+
+Both populations are kept in preallocated arrays indexed by integer ID
+(array('d') ratings and RDs, array('i') games, wins and last battle day),
+grown geometrically when a larger ID arrives. The loser's trainer is the
+loser Pokémon's owner for battle.csv rows, as in pokedata/stats.py.
+
+The engine can be checkpointed to disk and loaded back, so new battles (an
+NDJSON batch) are applied on top of the saved state instead of replaying the
+history. Every input batch is sorted by day before it is applied; battles
+older than the latest day already applied are still rated, at the current
+point of the stream, and counted in `late`. The checkpoint also records which
+battle IDs were applied (a bytearray indexed by ID), so a battle seen again,
+e.g. the same batch applied twice, is skipped and counted in `duplicates`.
+A regenerated battles.json restarts its IDs at b1 and needs a fresh engine;
+a batch meant to be appended is generated from next_id on (--start-id of
+create_battles_json.py and generate_battles.py).
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import pickle
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .dataset import Dataset
+from .fileio import open_text
+from .parsers import to_day, to_int
+
+RATINGS_VERSION = 2
+
+SYSTEMS = ("elo", "glicko")
+INITIAL_RATING = 1500.0
+INITIAL_RD = 350.0
+MIN_RD = 30.0
+DEFAULT_K = 24.0
+# RD growth per idle day: an unrated-looking RD of 350 is reached again after ~1 year
+DEFAULT_C = 17.0
+
+_Q = math.log(10) / 400
+
+
+def _g(rd: float) -> float:
+    return 1.0 / math.sqrt(1.0 + 3.0 * _Q * _Q * rd * rd / (math.pi * math.pi))
+
+
+class RatingTable:
+    """Ratings of one population (trainers or Pokémon), indexed by ID."""
+
+    __slots__ = ("rating", "rd", "games", "wins", "last_day")
+
+    def __init__(self, size: int = 0) -> None:
+        self.rating = array("d")
+        self.rd = array("d")
+        self.games = array("i")
+        self.wins = array("i")
+        self.last_day = array("i")
+        self.reserve(size)
+
+    def __len__(self) -> int:
+        return len(self.rating)
+
+    def reserve(self, size: int) -> None:
+        """Make IDs 0..size-1 addressable, doubling the capacity when it grows."""
+        have = len(self.rating)
+        if size <= have:
+            return
+        grow = max(size, 2 * have) - have
+        self.rating.extend(array("d", [INITIAL_RATING]) * grow)
+        self.rd.extend(array("d", [INITIAL_RD]) * grow)
+        self.games.extend(array("i", bytes(4 * grow)))
+        self.wins.extend(array("i", bytes(4 * grow)))
+        self.last_day.extend(array("i", bytes(4 * grow)))
+
+    def rated(self) -> Iterator[int]:
+        """IDs with at least one battle."""
+        return (i for i, n in enumerate(self.games) if n)
+
+    def top(self, n: int = 10, reverse: bool = False) -> list[tuple[int, float, float, int, int]]:
+        """[(id, rating, rd, games, wins)] best first (worst first with reverse), lowest ID on ties."""
+        sign = 1 if reverse else -1
+        ids = sorted(self.rated(), key=lambda i: (sign * self.rating[i], i))[:n]
+        return [(i, self.rating[i], self.rd[i], self.games[i], self.wins[i]) for i in ids]
+
+
+class Ratings:
+    """Trainer and Pokémon ratings over every battle applied so far."""
+
+    def __init__(
+        self,
+        system: str = "glicko",
+        k: float = DEFAULT_K,
+        c: float = DEFAULT_C,
+        trainers: int = 0,
+        pokemon: int = 0,
+    ) -> None:
+        if system not in SYSTEMS:
+            raise ValueError(f"Unknown rating system {system!r} (expected one of {SYSTEMS})")
+        self.system = system
+        self.k = k
+        self.c = c
+        self.trainers = RatingTable(trainers)
+        self.pokemon = RatingTable(pokemon)
+        self.battles = 0
+        self.late = 0
+        self.duplicates = 0
+        self.day = 0
+        # seen[battle_id] is 1 once that battle has been applied
+        self.seen = bytearray()
+
+    @classmethod
+    def for_dataset(cls, ds: Dataset, **options) -> "Ratings":
+        """Empty engine with arrays sized for ds's trainer and Pokémon IDs."""
+        trainers = max(ds.trainer["id"], default=0) + 1 if ds.trainer is not None else 0
+        pokemon = max(ds.pokemon["id"], default=0) + 1 if ds.pokemon is not None else 0
+        return cls(trainers=trainers, pokemon=pokemon, **options)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def _rate(self, table: RatingTable, winner: int, loser: int, day: int) -> None:
+        table.reserve(max(winner, loser) + 1)
+        rating, rd = table.rating, table.rd
+        rw, rl = rating[winner], rating[loser]
+
+        if self.system == "elo":
+            expected = 1.0 / (1.0 + 10.0 ** ((rl - rw) / 400.0))
+            rating[winner] = rw + self.k * (1.0 - expected)
+            rating[loser] = rl - self.k * (1.0 - expected)
+        else:
+            last = table.last_day
+            dw, dl = rd[winner], rd[loser]
+            if table.games[winner] and day > last[winner]:
+                dw = min(math.sqrt(dw * dw + self.c * self.c * (day - last[winner])), INITIAL_RD)
+            if table.games[loser] and day > last[loser]:
+                dl = min(math.sqrt(dl * dl + self.c * self.c * (day - last[loser])), INITIAL_RD)
+            for pid, r, d, r_opp, d_opp, score in (
+                (winner, rw, dw, rl, dl, 1.0),
+                (loser, rl, dl, rw, dw, 0.0),
+            ):
+                g = _g(d_opp)
+                expected = 1.0 / (1.0 + 10.0 ** (-g * (r - r_opp) / 400.0))
+                inv_d2 = _Q * _Q * g * g * expected * (1.0 - expected)
+                denom = 1.0 / (d * d) + inv_d2
+                rating[pid] = r + _Q / denom * g * (score - expected)
+                rd[pid] = max(math.sqrt(1.0 / denom), MIN_RD)
+
+        table.games[winner] += 1
+        table.games[loser] += 1
+        table.wins[winner] += 1
+        if day:
+            table.last_day[winner] = max(table.last_day[winner], day)
+            table.last_day[loser] = max(table.last_day[loser], day)
+
+    @property
+    def next_id(self) -> int:
+        """Lowest battle ID above every one applied: where an appendable batch starts (--start-id)."""
+        return max(self.seen.rfind(1), 0) + 1
+
+    def _first_seen(self, battle_id: int) -> bool:
+        """Mark battle_id as applied; False if it already was (ID 0, unknown, is always new)."""
+        if battle_id <= 0:
+            return True
+        seen = self.seen
+        if battle_id >= len(seen):
+            seen.extend(bytes(max(battle_id + 1, 2 * len(seen)) - len(seen)))
+        if seen[battle_id]:
+            return False
+        seen[battle_id] = 1
+        return True
+
+    def add(
+        self,
+        day: int,
+        winner_trainer: int,
+        winner_pokemon: int,
+        loser_trainer: int,
+        loser_pokemon: int,
+        battle_id: int = 0,
+    ) -> bool:
+        """
+        Apply one battle (day is a date ordinal, see parsers.to_day; 0 when unknown).
+
+        Return False, without rating it, when battle_id was already applied.
+        """
+        if not self._first_seen(battle_id):
+            self.duplicates += 1
+            return False
+        if day and day < self.day:
+            self.late += 1
+        self.day = max(self.day, day)
+        self.battles += 1
+        if winner_pokemon and loser_pokemon and winner_pokemon != loser_pokemon:
+            self._rate(self.pokemon, winner_pokemon, loser_pokemon, day)
+        if winner_trainer and loser_trainer and winner_trainer != loser_trainer:
+            self._rate(self.trainers, winner_trainer, loser_trainer, day)
+        return True
+
+    def add_many(self, battles: Iterable[tuple[int, int, int, int, int, int]]) -> int:
+        """
+        Apply (day, winner_trainer, winner_pokemon, loser_trainer, loser_pokemon,
+        battle_id) tuples by day; return how many were new.
+        """
+        count = 0
+        # sorted() is stable: same-day battles keep their input order
+        for battle in sorted(battles, key=lambda b: b[0]):
+            count += self.add(*battle)
+        return count
+
+    def add_table(self, battle) -> int:
+        """Apply every row of a pokedata battle Table, in date order."""
+        return self.add_many(zip(
+            battle["day"], battle["winner_trainer"], battle["winner_pokemon"],
+            battle["loser_trainer"], battle["loser_pokemon"], battle["id"],
+        ))
+
+    @staticmethod
+    def document_battle(doc: dict) -> tuple[int, int, int, int, int, int]:
+        parts = doc["participants"]
+        winner, loser = parts["winner"], parts["loser"]
+        return (
+            to_day(doc.get("date")),
+            to_int(winner["trainer_id"]), to_int(winner["pokemon_id"]),
+            to_int(loser["trainer_id"]), to_int(loser["pokemon_id"]),
+            to_int(doc.get("_id")),
+        )
+
+    @staticmethod
+    def csv_battle(row: dict, ownership: dict[int, int]) -> tuple[int, int, int, int, int, int]:
+        pok1, pok2 = to_int(row["pok1_id"]), to_int(row["pok2_id"])
+        winner = to_int(row["pokemon_winner_id"])
+        loser = pok2 if winner == pok1 else pok1
+        return (
+            to_day(row.get("date")), to_int(row["trainer_winner_id"]), winner, ownership.get(loser, 0), loser,
+            to_int(row.get("battle_id")),
+        )
+
+    def add_documents(self, docs: Iterable[dict]) -> int:
+        """Apply a batch of battles.json documents (string or integer IDs); return how many were new."""
+        return self.add_many(self.document_battle(doc) for doc in docs)
+
+    def add_ndjson(self, path: Path) -> int:
+        """Apply every document of an NDJSON batch; return how many were new."""
+        with open_text(path) as f:
+            return self.add_documents(json.loads(line) for line in f if line.strip())
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def top_trainers(self, n: int = 10) -> list[tuple[int, float, float, int, int]]:
+        return self.trainers.top(n)
+
+    def top_pokemon(self, n: int = 10) -> list[tuple[int, float, float, int, int]]:
+        return self.pokemon.top(n)
+
+    def weakest_leaders(self, leads: dict[int, int], n: int = 5) -> list[tuple[int, int, float, int]]:
+        """
+        Gym leaders by rating, lowest first: [(trainer_id, gym_id, rating, games)].
+
+        leads maps trainer_id -> gym_id; leaders without a battle keep the initial rating.
+        """
+        table = self.trainers
+        rows = [
+            (tid, gid, table.rating[tid] if tid < len(table) else INITIAL_RATING,
+             table.games[tid] if tid < len(table) else 0)
+            for tid, gid in leads.items()
+        ]
+        return sorted(rows, key=lambda r: (r[2], r[0]))[:n]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: Path) -> None:
+        """Checkpoint atomically (written next to path, then renamed)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump((RATINGS_VERSION, self), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "Ratings":
+        with path.open("rb") as f:
+            version, ratings = pickle.load(f)
+        if version != RATINGS_VERSION:
+            raise RuntimeError(f"Unsupported ratings version {version} in {path}")
+        return ratings
@@ -0,0 +1,93 @@
+"""
+Binary snapshots of parsed units, keyed by their source files.
+
+A snapshot file holds two consecutive pickles:
+
+1. header: (SNAPSHOT_VERSION, fingerprints) where fingerprints maps each source
+   file name to (mtime_ns, size, sha256)
+2. payload: {table name: Table}
+
+A snapshot is valid when every source file still has the recorded mtime and
+size (no hashing needed), or, if only the mtime changed, the same sha256
+(e.g. after a checkout that rewrote identical bytes). In the latter case the
+header is refreshed so the next run takes the fast path again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+from .columns import Table
+
+SNAPSHOT_VERSION = 1
+
+Fingerprint = tuple[int, int, str]
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def fingerprint(path: Path) -> Fingerprint:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size, file_sha256(path)
+
+
+def _matches(path: Path, recorded: Fingerprint) -> tuple[bool, Fingerprint]:
+    """Return (still valid, current fingerprint) for one source file."""
+    st = path.stat()
+    mtime_ns, size, digest = recorded
+    if st.st_mtime_ns == mtime_ns and st.st_size == size:
+        return True, recorded
+    if st.st_size != size:
+        return False, recorded
+    current = (st.st_mtime_ns, st.st_size, file_sha256(path))
+    return current[2] == digest, current
+
+
+def read_snapshot(snapshot_path: Path, sources: dict[str, Path]) -> dict[str, Table] | None:
+    """Return the cached tables if the snapshot is valid for `sources`, else None."""
+    try:
+        with snapshot_path.open("rb") as f:
+            version, fingerprints = pickle.load(f)
+            if version != SNAPSHOT_VERSION or set(fingerprints) != set(sources):
+                return None
+
+            refreshed = dict(fingerprints)
+            for name, path in sources.items():
+                ok, current = _matches(path, fingerprints[name])
+                if not ok:
+                    return None
+                refreshed[name] = current
+            tables = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+        return None
+
+    if refreshed != fingerprints:
+        write_snapshot(snapshot_path, refreshed, tables)
+    return tables
+
+
+def fingerprint_sources(sources: dict[str, Path]) -> dict[str, Fingerprint]:
+    """Fingerprint every source file; take this *before* parsing them."""
+    return {name: fingerprint(path) for name, path in sources.items()}
+
+
+def write_snapshot(
+    snapshot_path: Path,
+    fingerprints: dict[str, Fingerprint],
+    tables: dict[str, Table],
+) -> None:
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = snapshot_path.with_suffix(snapshot_path.suffix + ".tmp")
+    with tmp.open("wb") as f:
+        pickle.dump((SNAPSHOT_VERSION, fingerprints), f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(tables, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, snapshot_path)
@@ -0,0 +1,257 @@
+"""
+Incrementally maintained battle statistics (materialized win counters).
+
+BattleStats keeps, per battle appended, O(1) updates of:
+
+- wins per trainer, per Pokémon, per (trainer, Pokémon), per (trainer, gym)
+- wins and fights per type (through the Pokémon's types, at most two)
+- fights per Pokémon and battles hosted per gym
+
+Counts only ever grow, so the current leader of every counter is updated in the
+same step and the leaderboard reads behind queries 1-5 and 7 of
+mongodb_queries.js are constant time. Type win ratios (query 10) and the
+gym-leader win ratio of commands.cypher section 4 scan 18 types / ~70 gyms.
+
+The store can be saved to and loaded from disk, so new battles (from
+generate_battles or an NDJSON batch) are applied on top of the previous state
+instead of re-aggregating every battle. The IDs of the battles applied are
+kept in a bytearray indexed by battle ID, so a battle seen again (the same
+batch applied twice) is skipped and counted in `duplicates`; new batches are
+generated from next_id on (--start-id of create_battles_json.py and
+generate_battles.py).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pickle
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .dataset import Dataset
+from .fileio import open_text
+from .parsers import to_int
+
+STATS_VERSION = 2
+
+
+class Leader:
+    """Running argmax of a monotonically growing counter (lowest key wins ties)."""
+
+    __slots__ = ("key", "count")
+
+    def __init__(self) -> None:
+        self.key = None
+        self.count = 0
+
+    def offer(self, key, count: int) -> None:
+        if count > self.count or (count == self.count and self.key is not None and key < self.key):
+            self.key, self.count = key, count
+
+    def get(self):
+        return None if self.key is None else (self.key, self.count)
+
+
+class BattleStats:
+    """Materialized aggregates over every battle applied so far."""
+
+    def __init__(self, pokemon_types: dict[int, tuple[int, ...]] | None = None) -> None:
+        self.pokemon_types = pokemon_types or {}
+        self.battles = 0
+        self.duplicates = 0
+        # seen[battle_id] is 1 once that battle has been applied
+        self.seen = bytearray()
+        self.wins_by_trainer: Counter = Counter()
+        self.wins_by_pokemon: Counter = Counter()
+        self.wins_by_trainer_pokemon: Counter = Counter()
+        self.wins_by_trainer_gym: Counter = Counter()
+        self.fights_by_pokemon: Counter = Counter()
+        self.wins_by_type: Counter = Counter()
+        self.fights_by_type: Counter = Counter()
+        self.battles_by_gym: Counter = Counter()
+
+        self.top_trainer = Leader()
+        self.top_pokemon = Leader()
+        self.top_gym = Leader()
+        self.top_pokemon_of_trainer: dict[int, Leader] = {}
+        self.top_gym_of_trainer: dict[int, Leader] = {}
+
+    @classmethod
+    def for_dataset(cls, ds: Dataset) -> "BattleStats":
+        """Empty store using ds's Pokémon types; add ds.battle with add_table()."""
+        types: dict[int, tuple[int, ...]] = {}
+        pt = ds.pokemon_type
+        for pid, tid in zip(pt["pokemon_id"], pt["type_id"]):
+            types[pid] = types.get(pid, ()) + (tid,)
+        return cls(types)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    @property
+    def next_id(self) -> int:
+        """Lowest battle ID above every one applied: where an appendable batch starts (--start-id)."""
+        return max(self.seen.rfind(1), 0) + 1
+
+    def _first_seen(self, battle_id: int) -> bool:
+        """Mark battle_id as applied; False if it already was (ID 0, unknown, is always new)."""
+        if battle_id <= 0:
+            return True
+        seen = self.seen
+        if battle_id >= len(seen):
+            seen.extend(bytes(max(battle_id + 1, 2 * len(seen)) - len(seen)))
+        if seen[battle_id]:
+            return False
+        seen[battle_id] = 1
+        return True
+
+    def add(
+        self,
+        winner_trainer: int,
+        winner_pokemon: int,
+        loser_trainer: int,
+        loser_pokemon: int,
+        gym_id: int,
+        battle_id: int = 0,
+    ) -> bool:
+        """
+        Apply one battle in O(1).
+
+        Return False, without counting it, when battle_id was already applied.
+        """
+        if not self._first_seen(battle_id):
+            self.duplicates += 1
+            return False
+        self.battles += 1
+
+        n = self.wins_by_trainer[winner_trainer] = self.wins_by_trainer[winner_trainer] + 1
+        self.top_trainer.offer(winner_trainer, n)
+        n = self.wins_by_pokemon[winner_pokemon] = self.wins_by_pokemon[winner_pokemon] + 1
+        self.top_pokemon.offer(winner_pokemon, n)
+        n = self.battles_by_gym[gym_id] = self.battles_by_gym[gym_id] + 1
+        self.top_gym.offer(gym_id, n)
+
+        key = (winner_trainer, winner_pokemon)
+        n = self.wins_by_trainer_pokemon[key] = self.wins_by_trainer_pokemon[key] + 1
+        self.top_pokemon_of_trainer.setdefault(winner_trainer, Leader()).offer(winner_pokemon, n)
+        key = (winner_trainer, gym_id)
+        n = self.wins_by_trainer_gym[key] = self.wins_by_trainer_gym[key] + 1
+        self.top_gym_of_trainer.setdefault(winner_trainer, Leader()).offer(gym_id, n)
+
+        self.fights_by_pokemon[winner_pokemon] += 1
+        self.fights_by_pokemon[loser_pokemon] += 1
+        for tid in self.pokemon_types.get(winner_pokemon, ()):
+            self.wins_by_type[tid] += 1
+            self.fights_by_type[tid] += 1
+        for tid in self.pokemon_types.get(loser_pokemon, ()):
+            self.fights_by_type[tid] += 1
+        return True
+
+    def add_table(self, battle) -> None:
+        """Apply every row of a pokedata battle Table."""
+        for wt, wp, lt, lp, gid, bid in zip(
+            battle["winner_trainer"], battle["winner_pokemon"],
+            battle["loser_trainer"], battle["loser_pokemon"], battle["gym_id"], battle["id"],
+        ):
+            self.add(wt, wp, lt, lp, gid, bid)
+
+    def add_document(self, doc: dict) -> bool:
+        """Apply one battles.json document (string or integer IDs)."""
+        parts = doc["participants"]
+        winner, loser = parts["winner"], parts["loser"]
+        return self.add(
+            to_int(winner["trainer_id"]), to_int(winner["pokemon_id"]),
+            to_int(loser["trainer_id"]), to_int(loser["pokemon_id"]),
+            to_int(doc["gym_id"]), to_int(doc.get("_id")),
+        )
+
+    def add_csv_row(self, row: dict, ownership: dict[int, int]) -> bool:
+        """Apply one battle.csv row; the loser's trainer comes from ownership."""
+        pok1, pok2 = to_int(row["pok1_id"]), to_int(row["pok2_id"])
+        winner = to_int(row["pokemon_winner_id"])
+        loser = pok2 if winner == pok1 else pok1
+        return self.add(
+            to_int(row["trainer_winner_id"]), winner,
+            ownership.get(loser, 0), loser, to_int(row["gym_id"]), to_int(row.get("battle_id")),
+        )
+
+    def add_ndjson(self, path: Path) -> int:
+        """Apply every document of an NDJSON batch; return how many were new."""
+        count = 0
+        with open_text(path) as f:
+            for line in f:
+                if line.strip():
+                    count += self.add_document(json.loads(line))
+        return count
+
+    def observe(self, docs: Iterable[dict]) -> Iterator[dict]:
+        """Pass battle documents through unchanged while applying them."""
+        for doc in docs:
+            self.add_document(doc)
+            yield doc
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def most_winning_trainer(self) -> tuple[int, int] | None:
+        return self.top_trainer.get()
+
+    def most_winning_pokemon(self) -> tuple[int, int] | None:
+        return self.top_pokemon.get()
+
+    def busiest_gym(self) -> tuple[int, int] | None:
+        return self.top_gym.get()
+
+    def top_pokemon_for(self, trainer_id: int) -> tuple[int, int] | None:
+        leader = self.top_pokemon_of_trainer.get(trainer_id)
+        return None if leader is None else leader.get()
+
+    def top_gym_for(self, trainer_id: int) -> tuple[int, int] | None:
+        leader = self.top_gym_of_trainer.get(trainer_id)
+        return None if leader is None else leader.get()
+
+    def type_win_ratios(self) -> list[tuple[int, float, int, int]]:
+        """[(type_id, ratio, wins, fights)] best ratio first."""
+        rows = [
+            (tid, self.wins_by_type[tid] / fights, self.wins_by_type[tid], fights)
+            for tid, fights in self.fights_by_type.items()
+            if fights > 0
+        ]
+        return sorted(rows, key=lambda r: (-r[1], r[0]))
+
+    def leader_win_ratios(self, leads: dict[int, int]) -> list[tuple[int, int, float, int, int]]:
+        """
+        Gym leaders' win ratio at their own gym, as in commands.cypher section 4.
+
+        leads maps trainer_id -> gym_id. Returns [(trainer_id, gym_id, ratio, wins, total)]
+        ordered by ratio ASC, total ASC (worst leader first).
+        """
+        rows = []
+        for tid, gid in leads.items():
+            total = self.battles_by_gym[gid]
+            wins = self.wins_by_trainer_gym[(tid, gid)]
+            rows.append((tid, gid, wins / total if total else 0.0, wins, total))
+        return sorted(rows, key=lambda r: (r[2], r[4], r[0]))
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump((STATS_VERSION, self), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "BattleStats":
+        with path.open("rb") as f:
+            version, stats = pickle.load(f)
+        if version != STATS_VERSION:
+            raise RuntimeError(f"Unsupported battle stats version {version} in {path}")
+        return stats
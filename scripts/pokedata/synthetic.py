@@ -0,0 +1,77 @@
+"""
+Scale a Dataset up by replication, for benchmarks.
+
+scale_dataset(ds, 10) returns a dataset with 10 disjoint copies of every
+entity table: each copy's IDs are shifted by copy * (max ID of that ID space),
+and foreign keys are shifted the same way, so joins stay consistent inside a
+copy and never cross copies. The 18 types are shared, not replicated.
+"""
+
+from __future__ import annotations
+
+from array import array
+
+from .columns import Table
+from .dataset import Dataset, TABLES
+
+# table -> column -> ID space it refers to (columns not listed are copied as-is)
+ID_SPACES: dict[str, dict[str, str]] = {
+    "pokemon": {"id": "pokemon", "evolves_to": "pokemon"},
+    "pokemon_type": {"pokemon_id": "pokemon"},
+    "evolution": {"from_id": "pokemon", "to_id": "pokemon"},
+    "trainer": {"id": "trainer", "leads": "gym"},
+    "ownership": {"pokemon_id": "pokemon", "trainer_id": "trainer"},
+    "gym": {"id": "gym"},
+    "battle": {
+        "id": "battle", "gym_id": "gym",
+        "winner_pokemon": "pokemon", "winner_trainer": "trainer",
+        "loser_pokemon": "pokemon", "loser_trainer": "trainer",
+    },
+}
+
+
+def _max_ids(ds: Dataset) -> dict[str, int]:
+    spans: dict[str, int] = {}
+    for table_name, spaces in ID_SPACES.items():
+        table = getattr(ds, table_name)
+        if table is None:
+            continue
+        for column, space in spaces.items():
+            values = table[column]
+            if len(values):
+                spans[space] = max(spans.get(space, 0), max(values))
+    return spans
+
+
+def scale_table(table: Table, factor: int, spans: dict[str, int]) -> Table:
+    spaces = ID_SPACES.get(table.name, {})
+    columns: dict = {}
+    for column, values in table.columns.items():
+        space = spaces.get(column)
+        if space is None:
+            columns[column] = values * factor
+            continue
+        span = spans[space]
+        out = array(values.typecode)
+        for copy in range(factor):
+            offset = copy * span
+            # 0 means "missing" and must stay 0
+            out.extend(v + offset if v else 0 for v in values)
+        columns[column] = out
+    return Table(table.name, table.schema, columns)
+
+
+def scale_dataset(ds: Dataset, factor: int) -> Dataset:
+    """Return `factor` disjoint copies of ds merged into one Dataset (factor 1 returns ds)."""
+    if factor < 1:
+        raise ValueError("factor must be at least 1")
+    if factor == 1:
+        return ds
+    spans = _max_ids(ds)
+    tables = {}
+    for name in TABLES:
+        table = getattr(ds, name)
+        if table is None:
+            continue
+        tables[name] = table if name == "type" else scale_table(table, factor, spans)
+    return Dataset(ds.source, tables)
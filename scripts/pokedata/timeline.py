@@ -0,0 +1,288 @@
+"""
+Date-sorted battle index for time-range and bucketed queries.
+
+BattleTimeline keeps the battles ordered by day (date ordinal, see
+parsers.to_day) in compact parallel arrays:
+
+- days:  array('i') of day numbers, ascending
+- rows:  array('i') of the battle's row in the source battle Table
+- gyms:  array('i') of the hosting gym, in the same order
+
+so the battles of any closed date range are one slice found by binary search
+(bisect over days). On top of that it keeps:
+
+- per gym, a prefix-sum table over the day span: prefix[i] is the number of
+  battles the gym hosted before day start + i, so any window count is one
+  subtraction (battles per month per gym is 12 subtractions per gym)
+- per trainer, the ascending days of its wins and of all its battles; trainers
+  have a handful of battles each, so a window count is two bisects over a
+  tiny array, instead of a per-trainer table over every day of the span
+
+Battles appended in date order (as a generator emitting in order, or a later
+batch) extend every structure in time proportional to the new battles and the
+days they add; a batch that goes back in time is merged by re-sorting. Battles
+without a date are not indexed and are counted in `undated`. The IDs of the
+battles seen so far are kept in a bytearray indexed by battle ID, so a battle
+appended again (the same NDJSON batch twice) is skipped and counted in
+`duplicates`; new batches are generated from next_id on (--start-id of
+create_battles_json.py and generate_battles.py).
+
+    from datetime import date
+    from pokedata import load_dataset
+    from pokedata.timeline import BattleTimeline
+
+    tl = BattleTimeline.from_table(load_dataset("json", units=("battle",)).battle)
+    tl.trainer_wins(2171, date(2025, 7, 1), date(2025, 9, 30))     # wins in Q3
+    tl.monthly_by_gym()                                            # {gym: {"2025-01": n, ...}}
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from pathlib import Path
+from typing import Iterable
+
+from .parsers import to_day, to_int
+
+TIMELINE_VERSION = 2
+
+
+def _ordinal(day: date | int) -> int:
+    return day.toordinal() if isinstance(day, date) else int(day)
+
+
+def _count(days: array | None, lo: int, hi: int) -> int:
+    if not days or hi < lo:
+        return 0
+    return bisect_right(days, hi) - bisect_left(days, lo)
+
+
+class BattleTimeline:
+    """Battles sorted by day, with per-gym prefix sums and per-trainer day lists."""
+
+    def __init__(self) -> None:
+        self.undated = 0
+        self.duplicates = 0
+        # seen[battle_id] is 1 once that battle has been indexed (or counted as undated)
+        self.seen = bytearray()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.days = array("i")
+        self.rows = array("i")
+        self.gyms = array("i")
+        self.start = 0
+        self.gym_prefix: dict[int, array] = {}
+        self.trainer_win_days: dict[int, array] = {}
+        self.trainer_days: dict[int, array] = {}
+        # Winner and loser trainer per indexed battle, kept for re-sorting merges
+        self._winners = array("i")
+        self._losers = array("i")
+
+    @classmethod
+    def from_table(cls, battle) -> "BattleTimeline":
+        """Index every row of a pokedata battle Table."""
+        timeline = cls()
+        timeline.extend_table(battle)
+        return timeline
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def __repr__(self) -> str:
+        span = f"{date.fromordinal(self.days[0])}..{date.fromordinal(self.days[-1])}" if self.days else "empty"
+        return f"<BattleTimeline battles={len(self)} {span} gyms={len(self.gym_prefix)}>"
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def extend_table(self, battle, first_row: int = 0) -> int:
+        """Index rows first_row.. of a battle Table (e.g. the rows a generator just appended)."""
+        return self.extend(
+            zip(
+                battle["day"][first_row:], range(first_row, len(battle)), battle["gym_id"][first_row:],
+                battle["winner_trainer"][first_row:], battle["loser_trainer"][first_row:],
+                battle["id"][first_row:],
+            )
+        )
+
+    def extend_documents(self, docs: Iterable[dict], first_row: int = 0) -> int:
+        """Index battles.json documents; rows are numbered from first_row in input order."""
+        def battles():
+            for row, doc in enumerate(docs, first_row):
+                parts = doc.get("participants") or {}
+                winner, loser = parts.get("winner") or {}, parts.get("loser") or {}
+                yield (to_day(doc.get("date")), row, to_int(doc.get("gym_id")),
+                       to_int(winner.get("trainer_id")), to_int(loser.get("trainer_id")),
+                       to_int(doc.get("_id")))
+
+        return self.extend(battles())
+
+    @property
+    def next_id(self) -> int:
+        """Lowest battle ID above every one applied: where an appendable batch starts (--start-id)."""
+        return max(self.seen.rfind(1), 0) + 1
+
+    def _first_seen(self, battle_id: int) -> bool:
+        """Mark battle_id as seen; False if it already was (ID 0, unknown, is always new)."""
+        if battle_id <= 0:
+            return True
+        seen = self.seen
+        if battle_id >= len(seen):
+            seen.extend(bytes(max(battle_id + 1, 2 * len(seen)) - len(seen)))
+        if seen[battle_id]:
+            return False
+        seen[battle_id] = 1
+        return True
+
+    def extend(self, battles: Iterable[tuple[int, int, int, int, int, int]]) -> int:
+        """
+        Index (day, row, gym_id, winner_trainer, loser_trainer, battle_id) tuples;
+        return how many were indexed.
+
+        A batch whose first day is not before the last indexed day is appended;
+        otherwise the whole index is re-sorted with the batch merged in.
+        """
+        batch = []
+        for *battle, battle_id in battles:
+            if not self._first_seen(battle_id):
+                self.duplicates += 1
+            elif battle[0] > 0:
+                batch.append(tuple(battle))
+            else:
+                self.undated += 1
+        if not batch:
+            return 0
+        batch.sort(key=lambda b: b[0])
+
+        if self.days and batch[0][0] < self.days[-1]:
+            batch = sorted(
+                list(zip(self.days, self.rows, self.gyms, self._winners, self._losers)) + batch,
+                key=lambda b: b[0],
+            )
+            self._reset()
+
+        first = len(self.days)
+        if not self.days:
+            self.start = batch[0][0]
+        for day, row, gym, winner, loser in batch:
+            self.days.append(day)
+            self.rows.append(row)
+            self.gyms.append(gym)
+            self._winners.append(winner)
+            self._losers.append(loser)
+            if winner:
+                self.trainer_win_days.setdefault(winner, array("i")).append(day)
+                self.trainer_days.setdefault(winner, array("i")).append(day)
+            if loser and loser != winner:
+                self.trainer_days.setdefault(loser, array("i")).append(day)
+        self._extend_prefix(first)
+        return len(batch)
+
+    def _extend_prefix(self, first: int) -> None:
+        """Recompute the gym prefix sums from the day of position `first` on."""
+        span = self.days[-1] - self.start + 1
+        lo = self.days[first] - self.start
+        # Battles already indexed on day start + lo are recounted with the new ones
+        pos = bisect_left(self.days, self.start + lo)
+
+        daily: dict[int, dict[int, int]] = {}
+        for i in range(pos, len(self.days)):
+            per_day = daily.setdefault(self.gyms[i], {})
+            slot = self.days[i] - self.start
+            per_day[slot] = per_day.get(slot, 0) + 1
+
+        for gym in set(self.gym_prefix) | set(daily):
+            prefix = self.gym_prefix.get(gym)
+            if prefix is None:
+                prefix = self.gym_prefix[gym] = array("i", bytes(4 * (lo + 1)))
+            del prefix[lo + 1:]
+            if len(prefix) < lo + 1:
+                prefix.extend(array("i", [prefix[-1]]) * (lo + 1 - len(prefix)))
+            per_day = daily.get(gym, {})
+            total = prefix[lo]
+            for slot in range(lo, span):
+                total += per_day.get(slot, 0)
+                prefix.append(total)
+
+    # ------------------------------------------------------------------
+    # Queries (day bounds are dates or ordinals, both inclusive)
+    # ------------------------------------------------------------------
+
+    def span(self, lo: date | int, hi: date | int) -> tuple[int, int]:
+        """Positions [i, j) of the battles with lo <= day <= hi."""
+        i = bisect_left(self.days, _ordinal(lo))
+        return i, max(i, bisect_right(self.days, _ordinal(hi)))
+
+    def rows_between(self, lo: date | int, hi: date | int) -> array:
+        """Source rows of the battles in the range, in day order."""
+        i, j = self.span(lo, hi)
+        return self.rows[i:j]
+
+    def count(self, lo: date | int, hi: date | int) -> int:
+        i, j = self.span(lo, hi)
+        return j - i
+
+    def gym_battles(self, gym_id: int, lo: date | int, hi: date | int) -> int:
+        """Battles hosted by gym_id in the range, in O(1)."""
+        prefix = self.gym_prefix.get(gym_id)
+        if prefix is None:
+            return 0
+        last = len(prefix) - 1
+        a = min(max(_ordinal(lo) - self.start, 0), last)
+        b = min(max(_ordinal(hi) - self.start + 1, 0), last)
+        return max(prefix[b] - prefix[a], 0)
+
+    def trainer_wins(self, trainer_id: int, lo: date | int, hi: date | int) -> int:
+        return _count(self.trainer_win_days.get(trainer_id), _ordinal(lo), _ordinal(hi))
+
+    def trainer_battles(self, trainer_id: int, lo: date | int, hi: date | int) -> int:
+        return _count(self.trainer_days.get(trainer_id), _ordinal(lo), _ordinal(hi))
+
+    def months(self) -> list[tuple[str, int, int]]:
+        """[("YYYY-MM", first day, last day)] covering the indexed days."""
+        if not self.days:
+            return []
+        first, last = date.fromordinal(self.days[0]), date.fromordinal(self.days[-1])
+        out = []
+        year, month = first.year, first.month
+        while (year, month) <= (last.year, last.month):
+            nxt = date(year + month // 12, month % 12 + 1, 1)
+            out.append((f"{year:04d}-{month:02d}", date(year, month, 1).toordinal(), nxt.toordinal() - 1))
+            year, month = nxt.year, nxt.month
+        return out
+
+    def monthly(self) -> dict[str, int]:
+        return {label: self.count(lo, hi) for label, lo, hi in self.months()}
+
+    def monthly_by_gym(self) -> dict[int, dict[str, int]]:
+        """{gym_id: {"YYYY-MM": battles}} from the prefix sums."""
+        months = self.months()
+        return {
+            gym: {label: self.gym_battles(gym, lo, hi) for label, lo, hi in months}
+            for gym in sorted(self.gym_prefix)
+        }
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump((TIMELINE_VERSION, self), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "BattleTimeline":
+        with path.open("rb") as f:
+            version, timeline = pickle.load(f)
+        if version != TIMELINE_VERSION:
+            raise RuntimeError(f"Unsupported timeline version {version} in {path}")
+        return timeline
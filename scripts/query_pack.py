@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Run the dataset/mongodb_queries.js query pack offline, without MongoDB.
+
+The 16 queries are evaluated in-process on the local JSON or CSV data (see
+pokedata/queries.py) and printed as JSON, keyed by query number, with the same
+field names the Mongo pipelines project. That output can be diffed against
+mongosh results.
+
+Benchmark mode times every query on the dataset replicated 1x, 10x and 100x
+(pokedata/synthetic.py) and prints the best-of-N time in milliseconds.
+
+Usage:
+    python query_pack.py                      # all queries, JSON data
+    python query_pack.py --source csv -q 3 -q 10
+    python query_pack.py --bench --scales 1 10 100 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+
+from pokedata import load_dataset
+from pokedata.queries import QUERIES
+from pokedata.synthetic import scale_dataset
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the MongoDB query pack offline")
+    parser.add_argument("--source", choices=("json", "csv"), default="json")
+    parser.add_argument(
+        "-q", "--query",
+        type=int,
+        action="append",
+        choices=sorted(QUERIES),
+        help="query number to run (repeatable; default: all)",
+    )
+    parser.add_argument("--bench", action="store_true", help="time each query instead of printing results")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per query in --bench (best is kept)")
+    return parser.parse_args(argv)
+
+
+def benchmark(dataset, numbers: list[int], scales: list[int], repeat: int) -> dict:
+    """Return {scale: {"battles": n, "queries": {number: best ms}}}."""
+    results: dict = {}
+    for scale in scales:
+        scaled = scale_dataset(dataset, scale)
+        timings: dict[int, float] = {}
+        for number in numbers:
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                QUERIES[number](scaled)
+                best = min(best, time.perf_counter() - start)
+            timings[number] = round(best * 1000, 3)
+        results[scale] = {"battles": len(scaled.battle), "queries": timings}
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    numbers = args.query or sorted(QUERIES)
+    dataset = load_dataset(args.source)
+
+    if args.bench:
+        output = benchmark(dataset, numbers, args.scales, args.repeat)
+    else:
+        output = {number: QUERIES[number](dataset) for number in numbers}
+
+    json.dump(output, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
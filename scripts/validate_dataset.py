@@ -0,0 +1,727 @@
+#!/usr/bin/env python3
+"""
+Referential-integrity validator for the CSV, JSON and Cypher copies of the dataset.
+
+The same data lives in dataset/csv, dataset/json and dataset/cypher, and the
+loaders hide drift between them: ownership is a "last one wins" dict in both
+loaders, so a Pokémon with two owners silently keeps one, and
+convert_gym_type.py drops type names it cannot resolve. This script reports
+those problems instead of absorbing them. It works in two phases:
+
+1. index: every reference file (pokemon, trainer, type, gym, form, the relation
+   CSVs, the JSON documents and the Cypher node script) is read once into hash
+   indexes. Problems visible within one file are reported here: duplicate
+   keys, a Pokémon with several owners, a Cypher variable declared twice.
+2. check: one check per table against the shared indexes. Foreign keys of
+   every relation and gym resolve; each battle's Pokémon exist and are owned
+   by the trainers the battle names; CSV and JSON agree row by row; Cypher
+   nodes and relationships match the CSVs. The battle files and
+   relations.cypher are streamed, in a single pass each.
+
+Both phases run their tasks in a process pool (--jobs). Every lookup is a hash
+probe, so a run is linear in the size of the dataset. Missing files are
+skipped along with the checks that need them, so a scaled dataset
+(generate_scaled_dataset.py, which has no Cypher) validates too.
+
+The battle files are generated separately per format (generate_battles.py,
+create_battles_json.py). Each is checked against its own format's ownership,
+but the two are not compared with each other.
+
+Each violation is counted under a check name such as csv.battle.wrong_trainer
+or agree.trainer.differs, and the first few examples are kept. The exit status
+is 1 when any violation is found.
+
+Usage:
+    python validate_dataset.py
+    python validate_dataset.py --jobs 4 --json validation.json
+    python validate_dataset.py --data-dir ../dataset/scaled-x10
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from collections import Counter
+from datetime import date
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterator
+
+from pokedata.fileio import open_text, resolve
+from pokedata.jsonstream import iter_documents
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROJROOT = SCRIPTS_DIR.parent
+DATA_DIR = PROJROOT / "dataset"
+
+DEFAULT_EXAMPLES = 5
+
+# Per-process state set once by the pool initializer
+_WORKER_STATE: dict = {}
+
+
+# ---------------------------------------------------------------------------
+# VIOLATIONS
+# ---------------------------------------------------------------------------
+
+class Violations:
+    """Violation counts per check name, with the first few examples of each."""
+
+    def __init__(self, limit: int = DEFAULT_EXAMPLES) -> None:
+        self.limit = limit
+        self.counts: Counter[str] = Counter()
+        self.examples: dict[str, list] = {}
+
+    def add(self, check: str, example) -> None:
+        self.counts[check] += 1
+        kept = self.examples.setdefault(check, [])
+        if len(kept) < self.limit:
+            kept.append(example)
+
+    def update(self, other: "Violations") -> None:
+        for check, n in other.counts.items():
+            self.counts[check] += n
+            kept = self.examples.setdefault(check, [])
+            kept.extend(other.examples.get(check, [])[:max(0, self.limit - len(kept))])
+
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def as_dict(self) -> dict:
+        return {
+            check: {"count": self.counts[check], "examples": self.examples.get(check, [])}
+            for check in sorted(self.counts)
+        }
+
+
+# ---------------------------------------------------------------------------
+# READING
+# ---------------------------------------------------------------------------
+
+def _int(value) -> int | None:
+    """Parse an ID or number ("42", 42, " 42 "); None when missing or malformed."""
+    if value is None:
+        return None
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
+
+
+def _battle_id(value) -> int | None:
+    """Battle IDs are "12" in CSV and "b12" in JSON."""
+    return _int(str(value).strip().lstrip("b")) if value is not None else None
+
+
+def _csv_rows(path: Path) -> Iterator[dict]:
+    with open_text(resolve(path), newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def _keyed(name: str, records, key_of: Callable, value_of: Callable, out: Violations) -> dict:
+    """Index records by key; bad and repeated keys are violations (the first row is kept)."""
+    index: dict = {}
+    for n, record in enumerate(records, 1):
+        key = key_of(record)
+        if key is None:
+            out.add(f"{name}.bad_key", {"record": n})
+        elif key in index:
+            out.add(f"{name}.duplicate_key", {"record": n, "key": key})
+        else:
+            index[key] = value_of(record)
+    return index
+
+
+def _pairs(name: str, records, left: str, right: str, out: Violations) -> set:
+    """Index a relation file as a set of (left, right) ID pairs."""
+    index: set = set()
+    for n, record in enumerate(records, 1):
+        pair = (_int(record.get(left)), _int(record.get(right)))
+        if None in pair:
+            out.add(f"{name}.bad_key", {"record": n, "row": [record.get(left), record.get(right)]})
+        elif pair in index:
+            out.add(f"{name}.duplicate_key", {"record": n, "key": pair})
+        else:
+            index.add(pair)
+    return index
+
+
+def _add_owner(name: str, owner: dict, pokemon_id: int, trainer_id: int, out: Violations) -> None:
+    # Same rule as the loaders (last one wins), but every repeat is reported
+    previous = owner.get(pokemon_id)
+    if previous == trainer_id:
+        out.add(f"{name}.duplicate_key", {"key": [pokemon_id, trainer_id]})
+    elif previous is not None:
+        out.add(f"{name}.multiple_owners", {"pokemon": pokemon_id, "trainers": [previous, trainer_id]})
+    owner[pokemon_id] = trainer_id
+
+
+# ---------------------------------------------------------------------------
+# PHASE 1: INDEXES (one pass per file)
+# ---------------------------------------------------------------------------
+
+# Pokémon rows are compared as (pokedex, name, total, hp, atk, def, sp_atk, sp_def)
+
+def index_csv_pokemon(path: Path, out: Violations) -> dict:
+    columns = ("number", "pokename", "total", "hp", "attack", "defense", "sp_atk", "sp_def")
+    return {"csv.pokemon": _keyed(
+        "csv.pokemon", _csv_rows(path), lambda r: _int(r.get("id")),
+        lambda r: tuple(r.get(c) if c == "pokename" else _int(r.get(c)) for c in columns), out,
+    )}
+
+
+def index_csv_trainer(path: Path, out: Violations) -> dict:
+    return {"csv.trainer": _keyed(
+        "csv.trainer", _csv_rows(path), lambda r: _int(r.get("trainerID")),
+        lambda r: r.get("trainername"), out,
+    )}
+
+
+def index_csv_type(path: Path, out: Violations) -> dict:
+    # type.csv pads some names ("Fire "); every loader strips them
+    return {"csv.type": _keyed(
+        "csv.type", _csv_rows(path), lambda r: _int(r.get("id")),
+        lambda r: (r.get("name") or "").strip(), out,
+    )}
+
+
+def index_csv_form(path: Path, out: Violations) -> dict:
+    return {"csv.form": _keyed(
+        "csv.form", _csv_rows(path), lambda r: _int(r.get("id")), lambda r: r.get("form"), out,
+    )}
+
+
+def _csv_gym_type(row: dict):
+    # gym.csv holds type IDs; before convert_gym_type.py it held type names
+    if "specialty_type_id" in row:
+        return _int(row["specialty_type_id"])
+    return row.get("specialty_type")
+
+
+def index_csv_gym(path: Path, out: Violations) -> dict:
+    return {"csv.gym": _keyed(
+        "csv.gym", _csv_rows(path), lambda r: _int(r.get("gym_id")),
+        lambda r: (r.get("gym_name"), r.get("region"), _csv_gym_type(r),
+                   r.get("location"), r.get("badge_name")), out,
+    )}
+
+
+def index_csv_ownership(path: Path, out: Violations) -> dict:
+    owner: dict[int, int] = {}
+    for n, row in enumerate(_csv_rows(path), 1):
+        # The pokename column holds the Pokémon ID
+        pid, tid = _int(row.get("pokename")), _int(row.get("trainerID"))
+        if pid is None or tid is None:
+            out.add("csv.ownership.bad_key", {"record": n, "row": [row.get("trainerID"), row.get("pokename")]})
+            continue
+        _add_owner("csv.ownership", owner, pid, tid, out)
+    return {"csv.ownership": owner}
+
+
+def index_csv_relation(name: str, left: str, right: str, path: Path, out: Violations) -> dict:
+    return {name: _pairs(name, _csv_rows(path), left, right, out)}
+
+
+def index_json_pokemon(path: Path, out: Violations) -> dict:
+    pokemon: dict = {}
+    pokemon_type: set = set()
+    evolution: set = set()
+    has_form: set = set()
+    fields = ("_id", "pokedex", "name", "stats", "types", "evolves_to", "has_form")
+    for n, doc in enumerate(iter_documents(path, fields), 1):
+        pid = _int(doc.get("_id"))
+        if pid is None:
+            out.add("json.pokemon.bad_key", {"record": n})
+            continue
+        if pid in pokemon:
+            out.add("json.pokemon.duplicate_key", {"record": n, "key": pid})
+            continue
+        stats = doc.get("stats") or {}
+        pokemon[pid] = (
+            _int(doc.get("pokedex")), doc.get("name"), _int(stats.get("tot")),
+            _int(stats.get("hp")), _int(stats.get("atk")), _int(stats.get("def")),
+            _int(stats.get("sp_atk")), _int(stats.get("sp_def")),
+        )
+        for tid in doc.get("types") or ():
+            pokemon_type.add((pid, _int(tid)))
+        if doc.get("evolves_to") is not None:
+            evolution.add((pid, _int(doc["evolves_to"])))
+        if doc.get("has_form"):
+            has_form.add((pid, doc["has_form"]))
+    return {
+        "json.pokemon": pokemon, "json.pokemon_type": pokemon_type,
+        "json.evolution": evolution, "json.has_form": has_form,
+    }
+
+
+def index_json_trainer(path: Path, out: Violations) -> dict:
+    trainer: dict = {}
+    owner: dict[int, int] = {}
+    leads: set = set()
+    for n, doc in enumerate(iter_documents(path, ("_id", "name", "owns", "leads")), 1):
+        tid = _int(doc.get("_id"))
+        if tid is None:
+            out.add("json.trainer.bad_key", {"record": n})
+            continue
+        if tid in trainer:
+            out.add("json.trainer.duplicate_key", {"record": n, "key": tid})
+            continue
+        trainer[tid] = doc.get("name")
+        for value in doc.get("owns") or ():
+            pid = _int(value)
+            if pid is None:
+                out.add("json.ownership.bad_key", {"trainer": tid, "value": value})
+            else:
+                _add_owner("json.ownership", owner, pid, tid, out)
+        if doc.get("leads") is not None:
+            leads.add((tid, _int(doc["leads"])))
+    return {"json.trainer": trainer, "json.ownership": owner, "json.leads": leads}
+
+
+def index_json_gym(path: Path, out: Violations) -> dict:
+    fields = ("_id", "name", "region", "type", "location", "badge_name")
+    return {"json.gym": _keyed(
+        "json.gym", iter_documents(path, fields), lambda d: _int(d.get("_id")),
+        lambda d: (d.get("name"), d.get("region"), _int(d.get("type")),
+                   d.get("location"), d.get("badge_name")), out,
+    )}
+
+
+def index_json_type(path: Path, out: Violations) -> dict:
+    return {"json.type": _keyed(
+        "json.type", iter_documents(path, ("_id", "name")), lambda d: _int(d.get("_id")),
+        lambda d: (d.get("name") or "").strip(), out,
+    )}
+
+
+_CYPHER_NODE = re.compile(r"^\((?P<var>.*?):(?P<label>\w+) \{(?P<props>.*)\}\)$")
+_CYPHER_REL = re.compile(r"^\((?P<start>.*)\)-\[:(?P<type>\w+)\]->\((?P<end>.*)\)$")
+_CYPHER_PROP = re.compile(r'(\w+):\s*(?:"([^"]*)"|(-?\d+))')
+
+# Cypher label -> (index name, properties compared with the CSV row)
+CYPHER_NODES = {
+    "Pokemon": ("cypher.pokemon", (
+        "number", "name", "total", "hp", "attack", "defense", "special_attack", "special_defense",
+    )),
+    "Trainer": ("cypher.trainer", ("name",)),
+    "Type": ("cypher.type", ("name",)),
+    "Form": ("cypher.form", ("name",)),
+}
+
+
+def _cypher_lines(path: Path) -> Iterator[tuple[int, str]]:
+    """Yield (line number, pattern) for each element of the CREATE scripts."""
+    with open_text(resolve(path)) as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip().rstrip(";").rstrip(",")
+            if line and line != "CREATE" and not line.startswith("//"):
+                yield n, line
+
+
+def _cypher_props(text: str) -> dict:
+    props = {}
+    for m in _CYPHER_PROP.finditer(text):
+        key, string, number = m.groups()
+        props[key] = string if string is not None else int(number)
+    return props
+
+
+def index_cypher_nodes(path: Path, out: Violations) -> dict:
+    nodes: dict[str, dict] = {name: {} for name, _ in CYPHER_NODES.values()}
+    variables: dict[str, tuple[str, int]] = {}
+    # (label, id) of nodes behind a variable declared more than once
+    ambiguous: set = set()
+    for n, line in _cypher_lines(path):
+        m = _CYPHER_NODE.match(line)
+        if m is None:
+            out.add("cypher.nodes.unparsed_line", {"line": n, "text": line[:80]})
+            continue
+        label, props = m["label"], _cypher_props(m["props"])
+        nid = props.get("id")
+        if label not in CYPHER_NODES or not isinstance(nid, int):
+            out.add("cypher.nodes.unknown_node", {"line": n, "label": label})
+            continue
+        name, keys = CYPHER_NODES[label]
+        if nid in nodes[name]:
+            out.add(f"{name}.duplicate_key", {"line": n, "key": nid})
+            continue
+        values = tuple(_int(props.get(k)) if k == "number" else props.get(k) for k in keys)
+        nodes[name][nid] = values[0] if len(values) == 1 else values
+        var = m["var"]
+        if not var:
+            continue
+        if var in variables:
+            out.add("cypher.nodes.duplicate_variable", {"line": n, "variable": var})
+            ambiguous.add(variables[var])
+            ambiguous.add((label, nid))
+        else:
+            variables[var] = (label, nid)
+    if "cypher.type" in nodes:
+        nodes["cypher.type"] = {k: (v or "").strip() for k, v in nodes["cypher.type"].items()}
+    return {**nodes, "cypher.variables": variables, "cypher.ambiguous": ambiguous}
+
+
+# relative path -> index builder(path, out) returning {index name: index}
+SOURCES: dict[str, Callable[[Path, Violations], dict]] = {
+    "csv/pokemon.csv": index_csv_pokemon,
+    "csv/trainer.csv": index_csv_trainer,
+    "csv/type.csv": index_csv_type,
+    "csv/form.csv": index_csv_form,
+    "csv/gym.csv": index_csv_gym,
+    "csv/trainer_owns_pokemon.csv": index_csv_ownership,
+    "csv/pokemon_hasType_type.csv": partial(index_csv_relation, "csv.pokemon_type", "pokemonID", "typeID"),
+    "csv/pokemon_evolvesTo_pokemon.csv": partial(index_csv_relation, "csv.evolution", "primitiveID", "evolvedID"),
+    "csv/pokemon_hasForm_form.csv": partial(index_csv_relation, "csv.has_form", "pokemonID", "formID"),
+    "csv/trainer_leads_gym.csv": partial(index_csv_relation, "csv.leads", "trainer_id", "gym_id"),
+    "json/pokemon.json": index_json_pokemon,
+    "json/trainer.json": index_json_trainer,
+    "json/gym.json": index_json_gym,
+    "json/type.json": index_json_type,
+    "cypher/pokemon.cypher": index_cypher_nodes,
+}
+
+
+# ---------------------------------------------------------------------------
+# PHASE 2: CHECKS (one per table)
+# ---------------------------------------------------------------------------
+
+def _check_battle(
+    prefix: str,
+    battle_id: int,
+    sides: list[tuple[int | None, int | None]],
+    gym_id: int | None,
+    pokemon: dict,
+    owner: dict,
+    gyms: dict,
+    out: Violations,
+) -> None:
+    """sides holds (pokemon, trainer) per fighter; trainer is None when not recorded."""
+    owners = []
+    for pid, tid in sides:
+        if pid not in pokemon:
+            out.add(f"{prefix}.unknown_pokemon", {"battle": battle_id, "pokemon": pid})
+            continue
+        if pid not in owner:
+            out.add(f"{prefix}.unowned_pokemon", {"battle": battle_id, "pokemon": pid})
+            continue
+        owners.append(owner[pid])
+        if tid is not None and owner[pid] != tid:
+            out.add(f"{prefix}.wrong_trainer",
+                    {"battle": battle_id, "pokemon": pid, "trainer": tid, "owner": owner[pid]})
+    if len(owners) == 2 and owners[0] == owners[1]:
+        out.add(f"{prefix}.same_trainer", {"battle": battle_id, "trainer": owners[0]})
+    if gym_id not in gyms:
+        out.add(f"{prefix}.unknown_gym", {"battle": battle_id, "gym": gym_id})
+
+
+def _check_date(prefix: str, battle_id: int, value, out: Violations) -> None:
+    try:
+        date.fromisoformat(str(value or "").strip()[:10])
+    except ValueError:
+        out.add(f"{prefix}.bad_date", {"battle": battle_id, "date": value})
+
+
+def check_csv_battles(idx: dict, data_dir: Path, out: Violations) -> None:
+    pokemon, owner, gyms = idx["csv.pokemon"], idx["csv.ownership"], idx["csv.gym"]
+    seen: set[int] = set()
+    for n, row in enumerate(_csv_rows(data_dir / "csv" / "battle.csv"), 1):
+        bid = _battle_id(row.get("battle_id"))
+        if bid is None:
+            out.add("csv.battle.bad_key", {"record": n})
+            continue
+        if bid in seen:
+            out.add("csv.battle.duplicate_key", {"record": n, "key": bid})
+        seen.add(bid)
+        _check_date("csv.battle", bid, row.get("date"), out)
+        fighters = (_int(row.get("pok1_id")), _int(row.get("pok2_id")))
+        winner, trainer = _int(row.get("pokemon_winner_id")), _int(row.get("trainer_winner_id"))
+        if winner not in fighters:
+            out.add("csv.battle.winner_not_fighter", {"battle": bid, "winner": winner})
+        # Only the winner's trainer is recorded
+        sides = [(pid, trainer if pid == winner else None) for pid in fighters]
+        _check_battle("csv.battle", bid, sides, _int(row.get("gym_id")), pokemon, owner, gyms, out)
+
+
+def check_json_battles(idx: dict, data_dir: Path, out: Violations) -> None:
+    pokemon, owner, gyms = idx["json.pokemon"], idx["json.ownership"], idx["json.gym"]
+    seen: set[int] = set()
+    fields = ("_id", "date", "gym_id", "participants")
+    for n, doc in enumerate(iter_documents(data_dir / "json" / "battles.json", fields), 1):
+        bid = _battle_id(doc.get("_id"))
+        if bid is None:
+            out.add("json.battles.bad_key", {"record": n})
+            continue
+        if bid in seen:
+            out.add("json.battles.duplicate_key", {"record": n, "key": bid})
+        seen.add(bid)
+        _check_date("json.battles", bid, doc.get("date"), out)
+        parts = doc.get("participants") or {}
+        sides = [
+            (_int(side.get("pokemon_id")), _int(side.get("trainer_id")))
+            for side in (parts.get("winner") or {}, parts.get("loser") or {})
+        ]
+        _check_battle("json.battles", bid, sides, _int(doc.get("gym_id")), pokemon, owner, gyms, out)
+
+
+def check_foreign_keys(name: str, references: tuple, idx: dict, data_dir: Path, out: Violations) -> None:
+    """Every (left, right) pair of a relation index resolves in the referenced indexes."""
+    relation = idx[name]
+    pairs = relation.items() if isinstance(relation, dict) else relation
+    targets = [(pos, ref, idx[ref]) for pos, ref in references]
+    for pair in pairs:
+        for pos, ref, target in targets:
+            if pair[pos] not in target:
+                out.add(f"{name}.unknown_{ref.split('.', 1)[1]}", {"key": list(pair)})
+
+
+def check_gym_types(source: str, idx: dict, data_dir: Path, out: Violations) -> None:
+    """Gym specialty types resolve, by ID or (as convert_gym_type.py reads them) by name."""
+    types = idx[f"{source}.type"]
+    names = {name.lower() for name in types.values()}
+    for gid, row in idx[f"{source}.gym"].items():
+        ref = row[2]
+        if ref is None or ref == "":
+            out.add(f"{source}.gym.missing_type", {"gym": gid})
+        elif isinstance(ref, int):
+            if ref not in types:
+                out.add(f"{source}.gym.unknown_type", {"gym": gid, "type": ref})
+        else:
+            # convert_gym_type.py drops these without a word
+            for part in ref.split("/"):
+                if part.strip().lower() not in names:
+                    out.add(f"{source}.gym.unknown_type_name", {"gym": gid, "type": part.strip()})
+
+
+def _compare(prefix: str, left_name: str, left, right_name: str, right, out: Violations) -> None:
+    """Report keys (dicts) or pairs (sets) only on one side, and differing dict values."""
+    for key in left.keys() - right.keys() if isinstance(left, dict) else left - right:
+        out.add(f"{prefix}.missing_in_{right_name}", {"key": key})
+    for key in right.keys() - left.keys() if isinstance(right, dict) else right - left:
+        out.add(f"{prefix}.missing_in_{left_name}", {"key": key})
+    if isinstance(left, dict):
+        for key, value in left.items():
+            other = right.get(key, value)
+            if other != value:
+                out.add(f"{prefix}.differs", {"key": key, left_name: value, right_name: other})
+
+
+def check_agreement(table: str, idx: dict, data_dir: Path, out: Violations) -> None:
+    """CSV and JSON hold the same rows for one table."""
+    left, right = idx[f"csv.{table}"], idx[f"json.{table}"]
+    if table == "has_form":
+        # JSON names the form; CSV references form.csv
+        forms = idx["csv.form"]
+        left = {(pid, forms.get(fid)) for pid, fid in left}
+    _compare(f"agree.{table}", "csv", left, "json", right, out)
+
+
+def check_cypher_nodes(table: str, idx: dict, data_dir: Path, out: Violations) -> None:
+    """The Cypher nodes of one label match the CSV rows."""
+    _compare(f"cypher.{table}", "csv", idx[f"csv.{table}"], "cypher", idx[f"cypher.{table}"], out)
+
+
+# relationship type -> (start label, end label, CSV pairs as (start ID, end ID))
+CYPHER_RELATIONSHIPS: dict[str, tuple[str, str, Callable[[dict], set]]] = {
+    "OWNS": ("Trainer", "Pokemon", lambda idx: {(t, p) for p, t in idx["csv.ownership"].items()}),
+    "HAS_TYPE": ("Pokemon", "Type", lambda idx: idx["csv.pokemon_type"]),
+    "HAS_FORM": ("Pokemon", "Form", lambda idx: idx["csv.has_form"]),
+    "EVOLVES_TO": ("Pokemon", "Pokemon", lambda idx: idx["csv.evolution"]),
+}
+
+
+def check_cypher_relationships(idx: dict, data_dir: Path, out: Violations) -> None:
+    """relations.cypher endpoints resolve to declared nodes and match the relation CSVs."""
+    variables, ambiguous = idx["cypher.variables"], idx["cypher.ambiguous"]
+    found: dict[str, set] = {rel: set() for rel in CYPHER_RELATIONSHIPS}
+    for n, line in _cypher_lines(data_dir / "cypher" / "relations.cypher"):
+        m = _CYPHER_REL.match(line)
+        if m is None:
+            out.add("cypher.relations.unparsed_line", {"line": n, "text": line[:80]})
+            continue
+        rel = m["type"]
+        if rel not in CYPHER_RELATIONSHIPS:
+            out.add("cypher.relations.unknown_type", {"line": n, "type": rel})
+            continue
+        start_label, end_label, _ = CYPHER_RELATIONSHIPS[rel]
+        ends = []
+        for var, label in ((m["start"], start_label), (m["end"], end_label)):
+            node = variables.get(var)
+            if node is None:
+                out.add("cypher.relations.unknown_variable", {"line": n, "variable": var})
+            elif node in ambiguous:
+                out.add("cypher.relations.ambiguous_variable", {"line": n, "variable": var})
+            elif node[0] != label:
+                out.add("cypher.relations.wrong_label", {"line": n, "variable": var, "label": node[0]})
+            else:
+                ends.append(node[1])
+        if len(ends) == 2:
+            found[rel].add(tuple(ends))
+
+    owner: dict[int, int] = {}
+    for tid, pid in sorted(found["OWNS"]):
+        if pid in owner:
+            out.add("cypher.OWNS.multiple_owners", {"pokemon": pid, "trainers": [owner[pid], tid]})
+        owner[pid] = tid
+
+    for rel, (start_label, end_label, csv_pairs) in CYPHER_RELATIONSHIPS.items():
+        # Rows behind an ambiguous variable cannot be told apart; leave them out
+        expected = {
+            pair for pair in csv_pairs(idx)
+            if (start_label, pair[0]) not in ambiguous and (end_label, pair[1]) not in ambiguous
+        }
+        _compare(f"cypher.{rel}", "csv", expected, "cypher", found[rel], out)
+
+
+# check name -> (required indexes, required files, check(idx, data_dir, out))
+CHECKS: dict[str, tuple[tuple[str, ...], tuple[str, ...], Callable]] = {
+    "csv.battle": (("csv.pokemon", "csv.ownership", "csv.gym"), ("csv/battle.csv",), check_csv_battles),
+    "json.battles": (("json.pokemon", "json.ownership", "json.gym"), ("json/battles.json",), check_json_battles),
+    "csv.gym": (("csv.gym", "csv.type"), (), partial(check_gym_types, "csv")),
+    "json.gym": (("json.gym", "json.type"), (), partial(check_gym_types, "json")),
+    "cypher.relations": (
+        ("cypher.variables", "csv.ownership", "csv.pokemon_type", "csv.has_form", "csv.evolution"),
+        ("cypher/relations.cypher",), check_cypher_relationships,
+    ),
+}
+
+# relation index -> ((position in the pair, referenced index), ...)
+FOREIGN_KEYS: dict[str, tuple[tuple[int, str], ...]] = {
+    "csv.ownership": ((0, "csv.pokemon"), (1, "csv.trainer")),
+    "csv.pokemon_type": ((0, "csv.pokemon"), (1, "csv.type")),
+    "csv.evolution": ((0, "csv.pokemon"), (1, "csv.pokemon")),
+    "csv.has_form": ((0, "csv.pokemon"), (1, "csv.form")),
+    "csv.leads": ((0, "csv.trainer"), (1, "csv.gym")),
+    "json.ownership": ((0, "json.pokemon"), (1, "json.trainer")),
+    "json.pokemon_type": ((0, "json.pokemon"), (1, "json.type")),
+    "json.evolution": ((0, "json.pokemon"), (1, "json.pokemon")),
+    "json.leads": ((0, "json.trainer"), (1, "json.gym")),
+}
+for _name, _refs in FOREIGN_KEYS.items():
+    CHECKS[f"{_name}.fk"] = (
+        (_name,) + tuple(ref for _, ref in _refs), (), partial(check_foreign_keys, _name, _refs),
+    )
+
+for _table in ("pokemon", "trainer", "type", "gym", "ownership", "pokemon_type", "evolution", "leads"):
+    CHECKS[f"agree.{_table}"] = ((f"csv.{_table}", f"json.{_table}"), (), partial(check_agreement, _table))
+CHECKS["agree.has_form"] = (("csv.has_form", "csv.form", "json.has_form"), (), partial(check_agreement, "has_form"))
+
+for _table in ("pokemon", "trainer", "type", "form"):
+    CHECKS[f"cypher.{_table}"] = ((f"csv.{_table}", f"cypher.{_table}"), (), partial(check_cypher_nodes, _table))
+
+
+# ---------------------------------------------------------------------------
+# RUNNING
+# ---------------------------------------------------------------------------
+
+def _init_worker(data_dir: Path, limit: int, idx: dict | None) -> None:
+    _WORKER_STATE["data_dir"] = data_dir
+    _WORKER_STATE["limit"] = limit
+    _WORKER_STATE["idx"] = idx
+
+
+def _run_index(source: str) -> tuple[dict, Violations]:
+    out = Violations(_WORKER_STATE["limit"])
+    return SOURCES[source](_WORKER_STATE["data_dir"] / source, out), out
+
+
+def _run_check(name: str) -> Violations:
+    out = Violations(_WORKER_STATE["limit"])
+    CHECKS[name][2](_WORKER_STATE["idx"], _WORKER_STATE["data_dir"], out)
+    return out
+
+
+def _map(fn: Callable, tasks: list[str], jobs: int, initargs: tuple) -> list:
+    """Run fn over tasks in a pool of up to jobs processes (inline for jobs <= 1)."""
+    jobs = min(jobs, len(tasks))
+    if jobs <= 1:
+        _init_worker(*initargs)
+        try:
+            return [fn(task) for task in tasks]
+        finally:
+            _WORKER_STATE.clear()
+    with multiprocessing.Pool(jobs, initializer=_init_worker, initargs=initargs) as pool:
+        return pool.map(fn, tasks, chunksize=1)
+
+
+def validate(data_dir: Path, jobs: int = 1, limit: int = DEFAULT_EXAMPLES) -> dict:
+    """Index and check the dataset under data_dir; return the report."""
+    out = Violations(limit)
+    started = time.perf_counter()
+    sources = [s for s in SOURCES if resolve(data_dir / s).exists()]
+    if not sources:
+        raise RuntimeError(f"No dataset files found under {data_dir}")
+    idx: dict = {}
+    for built, found in _map(_run_index, sources, jobs, (data_dir, limit, None)):
+        idx.update(built)
+        out.update(found)
+    indexed = time.perf_counter()
+
+    runnable, skipped = [], []
+    for name, (needs, files, _) in CHECKS.items():
+        ready = all(n in idx for n in needs) and all(resolve(data_dir / f).exists() for f in files)
+        (runnable if ready else skipped).append(name)
+    for found in _map(_run_check, runnable, jobs, (data_dir, limit, idx)):
+        out.update(found)
+    checked = time.perf_counter()
+
+    return {
+        "data_dir": str(data_dir),
+        "files": sources,
+        "checks": runnable,
+        "skipped": skipped,
+        "index_s": round(indexed - started, 3),
+        "check_s": round(checked - indexed, 3),
+        "total": out.total(),
+        "violations": out.as_dict(),
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"Indexed {len(report['files'])} files in {report['index_s']}s, "
+          f"ran {len(report['checks'])} checks in {report['check_s']}s")
+    if report["skipped"]:
+        print(f"Skipped (missing files): {', '.join(report['skipped'])}")
+    if not report["violations"]:
+        print("No violations")
+        return
+    width = max(len(check) for check in report["violations"])
+    for check, found in report["violations"].items():
+        example = json.dumps(found["examples"][0], ensure_ascii=False) if found["examples"] else ""
+        print(f"  {check:<{width}}  {found['count']:>7}  {example}")
+    print(f"{report['total']} violations")
+
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check referential integrity across the CSV, JSON and Cypher data")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="directory holding csv/, json/ and cypher/")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (1 runs everything in-process)")
+    parser.add_argument("--examples", type=int, default=DEFAULT_EXAMPLES,
+                        help="examples kept per check")
+    parser.add_argument("--json", type=Path, default=None, help="also write the full report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    report = validate(args.data_dir, jobs=args.jobs, limit=args.examples)
+    print_report(report)
+    if args.json is not None:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return 1 if report["total"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())